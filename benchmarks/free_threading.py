@@ -0,0 +1,63 @@
+"""
+Scaling of CPU-bound sync nodes over the thread pool.
+
+On a regular build the GIL serializes the calls, so adding workers barely helps.
+On a free-threaded build (python3.13t+) the calls run in parallel.
+
+Usage: python benchmarks/free_threading.py [--calls 32] [--work 200000]
+"""
+
+import argparse
+import os
+import time
+
+from deppy import Deppy
+from deppy.executor import SyncExecutor
+from deppy.executor.sync_executor import gil_disabled
+
+
+def burn(x, work):
+    total = 0
+    for i in range(work):
+        total += (i * x) % 7
+    return total
+
+
+def run(workers: int, calls: int, work: int) -> float:
+    deppy = Deppy()
+    executor = SyncExecutor(deppy, max_thread_workers=workers, sync_to_thread=True)
+    deppy.executor = executor
+
+    items = deppy.add_const(list(range(calls)), name="items")
+    amount = deppy.add_const(work, name="work")
+    burn_node = deppy.add_node(func=burn)
+    deppy.add_edge(items, burn_node, "x", loop=True)
+    deppy.add_edge(amount, burn_node, "work")
+
+    start = time.perf_counter()
+    executor.execute_sync()
+    elapsed = time.perf_counter() - start
+    executor.shutdown()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=32)
+    parser.add_argument("--work", type=int, default=200_000)
+    args = parser.parse_args()
+
+    print(f"GIL disabled: {gil_disabled()}, cpus: {os.cpu_count()}")
+    baseline = None
+    workers = 1
+    while workers <= (os.cpu_count() or 1) * 2:
+        elapsed = run(workers, args.calls, args.work)
+        baseline = baseline or elapsed
+        print(
+            f"{workers:>3} workers: {elapsed:.3f}s  speedup x{baseline / elapsed:.2f}"
+        )
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
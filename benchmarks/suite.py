@@ -0,0 +1,357 @@
+"""
+Synthetic workloads measuring the hot path of the executors, the scopes and the graph builder.
+
+Every workload is run with the SyncExecutor, the AsyncExecutor (async node functions)
+and the HybridExecutor (sync and async node functions alternating), reporting:
+
+- time: the best wall time over the repeats,
+- peak: the peak memory traced by tracemalloc during a separate run,
+- blocks: the memory blocks still allocated after that run, mostly results held by the scopes,
+- gc: the generation 0 collections during that run, which grows with the number of allocated objects.
+
+Save a run with --json and pass it to --compare on a later run to fail on regressions.
+
+Usage: python benchmarks/suite.py [--scale 1.0] [--repeat 5] [--only chain,zip]
+       [--executors sync,async,hybrid] [--json out.json] [--compare baseline.json] [--threshold 1.25]
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+from deppy import Deppy, IgnoreResult
+from deppy.graph_builder import GraphBuilder
+from deppy.node import product
+from deppy.executor import SyncExecutor, AsyncExecutor, HybridExecutor
+
+EXECUTORS = {
+    "sync": SyncExecutor,
+    "async": AsyncExecutor,
+    "hybrid": HybridExecutor,
+}
+
+
+def double(x):
+    return x * 2
+
+
+def increment(x):
+    return x + 1
+
+
+def add(a, b):
+    return a + b
+
+
+def keep_tenth(x):
+    if x % 10:
+        return IgnoreResult(reason="filtered", data=x)
+    return x
+
+
+def parse(x):
+    return {"id": x, "name": str(x)}
+
+
+async def fetch(x):
+    await asyncio.sleep(0)
+    return x
+
+
+async def save(record):
+    await asyncio.sleep(0)
+    return record["id"]
+
+
+def asynced(func: Callable[..., Any]) -> Callable[..., Any]:
+    async def call(**kwargs):
+        return func(**kwargs)
+
+    call.__name__ = func.__name__
+    return call
+
+
+class Workload:
+    """
+    A graph built on a fresh Deppy for every executor.
+
+    Parameters
+    ----------
+    build : Callable[[Deppy, Callable], None]
+        Builds the graph, adding its nodes through the given `add(func, **kwargs)` function.
+    executors : Optional[List[str]], optional
+        The executors running the workload (default is None, meaning all of them).
+    query : Optional[bool], optional
+        Flag to time exporting the results of a finished execution, rather than the execution itself.
+    """
+
+    def __init__(
+        self,
+        build: Callable[[Deppy, Callable], None],
+        executors: Optional[List[str]] = None,
+        query: Optional[bool] = False,
+    ) -> None:
+        self.build = build
+        self.executors = executors or list(EXECUTORS)
+        self.query = query
+
+
+def node_adder(deppy: Deppy, executor: str) -> Callable[..., Any]:
+    """Returns a function adding nodes as sync, async or alternating functions, as the executor requires."""
+    count = 0
+
+    def add_node(func, **kwargs):
+        nonlocal count
+        count += 1
+        is_async = asyncio.iscoroutinefunction(func)
+        if executor == "async" or (executor == "hybrid" and count % 2):
+            if not is_async:
+                func = asynced(func)
+        elif executor == "sync" and is_async:
+            raise ValueError(f"{func.__name__} is async")
+        name = kwargs.pop("name", func.__name__)
+        return deppy.add_node(func, name=f"{name}_{count}", **kwargs)
+
+    return add_node
+
+
+def build_fanout(scale: float) -> Callable[[Deppy, Callable], None]:
+    def build(deppy, add_node):
+        items = add_node(lambda: list(range(int(5000 * scale))), name="items")
+        doubled = add_node(double)
+        incremented = add_node(increment)
+        deppy.add_edge(items, doubled, "x", loop=True)
+        deppy.add_edge(doubled, incremented, "x")
+
+    return build
+
+
+def build_chain(scale: float) -> Callable[[Deppy, Callable], None]:
+    def build(deppy, add_node):
+        previous = add_node(lambda: 0, name="start")
+        for _ in range(int(300 * scale)):
+            current = add_node(increment)
+            deppy.add_edge(previous, current, "x")
+            previous = current
+
+    return build
+
+
+def build_nested(scale: float, loop_strategy) -> Callable[[Deppy, Callable], None]:
+    # Both strategies make the same number of calls.
+    size = int(60 * scale) if loop_strategy is not zip else int(60 * scale) ** 2
+
+    def build(deppy, add_node):
+        first = add_node(lambda: list(range(size)), name="first")
+        second = add_node(lambda: list(range(size)), name="second")
+        total = add_node(add, loop_strategy=loop_strategy)
+        deppy.add_edge(first, total, "a", loop=True)
+        deppy.add_edge(second, total, "b", loop=True)
+
+    return build
+
+
+def build_filter(scale: float) -> Callable[[Deppy, Callable], None]:
+    def build(deppy, add_node):
+        items = add_node(lambda: list(range(int(10000 * scale))), name="items")
+        kept = add_node(keep_tenth)
+        doubled = add_node(double)
+        deppy.add_edge(items, kept, "x", loop=True)
+        deppy.add_edge(kept, doubled, "x")
+
+    return build
+
+
+def build_mixed(scale: float) -> Callable[[Deppy, Callable], None]:
+    def build(deppy, add_node):
+        items = deppy.add_const(list(range(int(2000 * scale))), name="items")
+        fetched = deppy.add_node(fetch)
+        parsed = deppy.add_node(parse)
+        saved = deppy.add_node(save)
+        threaded = deppy.add_node(double, to_thread=True)
+        deppy.add_edge(items, fetched, "x", loop=True)
+        deppy.add_edge(fetched, parsed, "x")
+        deppy.add_edge(parsed, saved, "record")
+        deppy.add_edge(fetched, threaded, "x")
+
+    return build
+
+
+def build_graph(scale: float) -> Callable[[], GraphBuilder]:
+    # Layers of 100 nodes, every node reading two nodes of the previous layer.
+    layers = int(100 * scale)
+
+    def build():
+        builder = GraphBuilder()
+        with builder.deferred_check():
+            previous = [builder.add_node(increment, name=f"n0_{i}") for i in range(100)]
+            for layer in range(1, layers):
+                current = [
+                    builder.add_node(add, name=f"n{layer}_{i}") for i in range(100)
+                ]
+                builder.add_edges(
+                    edge
+                    for i, node in enumerate(current)
+                    for edge in (
+                        (previous[i], node, "a"),
+                        (previous[(i + 1) % 100], node, "b"),
+                    )
+                )
+                previous = current
+        return builder
+
+    return build
+
+
+def workloads(scale: float) -> Dict[str, Any]:
+    return {
+        "fanout": Workload(build_fanout(scale)),
+        "chain": Workload(build_chain(scale)),
+        "product": Workload(build_nested(scale, product)),
+        "zip": Workload(build_nested(scale, zip)),
+        "filter": Workload(build_filter(scale)),
+        "mixed": Workload(build_mixed(scale), executors=["hybrid"]),
+        "query": Workload(build_fanout(scale), query=True),
+        "build": build_graph(scale),
+    }
+
+
+def prepare(workload: Workload, executor: str) -> Callable[[], Any]:
+    """Builds the workload and returns the function to time."""
+    deppy = Deppy()
+    deppy.executor = EXECUTORS[executor](deppy)
+    workload.build(deppy, node_adder(deppy, executor))
+
+    def execute():
+        if executor == "sync":
+            return deppy.executor.execute_sync()
+        if executor == "async":
+            return asyncio.run(deppy.executor.execute_async())
+        return asyncio.run(deppy.executor.execute_hybrid())
+
+    if not workload.query:
+        return execute
+
+    root = execute()
+    nodes = list(deppy.graph.nodes)
+
+    def export():
+        for node in nodes:
+            root.query(node)
+            root.query(node, ignored_results=False)
+        return root.dump()
+
+    return export
+
+
+def measure(run: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Times a function, then runs it once more under tracemalloc."""
+    run()
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = run()
+        best = min(best, time.perf_counter() - start)
+        del result
+
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+    collections = gc.get_stats()[0]["collections"]
+    tracemalloc.start()
+    try:
+        result = run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    collections = gc.get_stats()[0]["collections"] - collections
+    gc.collect()
+    blocks = sys.getallocatedblocks() - blocks
+    del result
+    return {"time": best, "peak": peak, "blocks": blocks, "gc": collections}
+
+
+def run_suite(
+    scale: float, repeat: int, only: Optional[List[str]], executors: List[str]
+) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for name, workload in workloads(scale).items():
+        if only and name not in only:
+            continue
+        if not isinstance(workload, Workload):
+            results[f"{name}/builder"] = measure(workload, repeat)
+            report(f"{name}/builder", results[f"{name}/builder"])
+            continue
+        for executor in executors:
+            if executor not in workload.executors:
+                continue
+            key = f"{name}/{executor}"
+            results[key] = measure(prepare(workload, executor), repeat)
+            report(key, results[key])
+    return results
+
+
+def report(key: str, result: Dict[str, float]) -> None:
+    print(
+        f"{key:<18} {result['time'] * 1000:>10.2f} ms {result['peak'] / 2**20:>9.2f} MiB "
+        f"{result['blocks']:>9} blocks {result['gc']:>6} gc"
+    )
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float,
+) -> List[str]:
+    """Returns the regressions of time or peak memory larger than the threshold ratio."""
+    regressions = []
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        for metric in ("time", "peak"):
+            before, after = baseline[key][metric], result[metric]
+            if before and after / before > threshold:
+                regressions.append(
+                    f"{key} {metric}: {before:.4g} -> {after:.4g} (x{after / before:.2f})"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", type=lambda value: value.split(","))
+    parser.add_argument(
+        "--executors",
+        type=lambda value: value.split(","),
+        default=list(EXECUTORS),
+    )
+    parser.add_argument("--json")
+    parser.add_argument("--compare")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    args = parser.parse_args()
+
+    print(f"python {sys.version.split()[0]}, scale {args.scale}, best of {args.repeat}")
+    results = run_suite(args.scale, args.repeat, args.only, args.executors)
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        for regression in regressions:
+            print(f"regression: {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
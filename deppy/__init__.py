@@ -1,4 +1,7 @@
 from .deppy import Deppy  # noqa: F401
 from .scope import Scope  # noqa: F401
 from .ignore_result import IgnoreResult  # noqa: F401
+from .node import RateLimit  # noqa: F401
+from .cache import ResultCache, MemoryCache, SQLiteCache  # noqa: F401
+from .store import ResultStore, SpillStore  # noqa: F401
 from deppy.executor import AsyncExecutor, SyncExecutor  # noqa: F401
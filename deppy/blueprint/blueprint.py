@@ -1,4 +1,4 @@
-from typing import Union
+from typing import Optional, Union
 
 from .meta import BlueprintMeta
 from .components import (
@@ -15,7 +15,7 @@ from ..deppy import Deppy
 
 
 class Blueprint(Deppy, metaclass=BlueprintMeta):
-    """Blueprint definition."""
+    """Blueprint definition, set `sync_to_thread` to run every sync node on the thread pool."""
 
     _objects: dict[str, ObjectAccessor]
     _nodes: dict[str, Node]
@@ -23,6 +23,7 @@ class Blueprint(Deppy, metaclass=BlueprintMeta):
     _consts: dict[str, Const]
     _secrets: dict[str, Secret]
     _edges: list[tuple[BlueprintObject, BlueprintObject, str]]
+    sync_to_thread: Optional[bool] = None
 
     def resolve_node(self, node: BlueprintObject) -> DeppyNode:
         """Resolve a blueprint object to its corresponding DeppyNode."""
@@ -32,14 +33,17 @@ class Blueprint(Deppy, metaclass=BlueprintMeta):
         return actual_node
 
     def __init__(self, **kwargs):
-        super().__init__(name=self.__class__.__name__)
+        super().__init__(
+            name=self.__class__.__name__, sync_to_thread=self.sync_to_thread
+        )
         self.bp_to_node_map = {}
         object_map = self._initialize_objects(kwargs)
-        self._initialize_nodes(object_map)
-        self._initialize_outputs()
-        self._initialize_consts(kwargs)
-        self._initialize_secrets(kwargs)
-        self._initialize_edges()
+        with self.deferred_check():
+            self._initialize_nodes(object_map)
+            self._initialize_outputs()
+            self._initialize_consts(kwargs)
+            self._initialize_secrets(kwargs)
+            self._initialize_edges()
         self._setup_context_managers(object_map)
 
     def _initialize_objects(self, kwargs: dict) -> dict:
@@ -67,16 +71,21 @@ class Blueprint(Deppy, metaclass=BlueprintMeta):
                     obj = getattr(obj, access)
                 func = obj
 
-            node = DeppyNode(
+            node = self.add_node(
                 func=func,
                 loop_strategy=bp_node.loop_strategy,
                 to_thread=bp_node.to_thread,
                 name=name,
                 secret=bp_node.secret,
+                max_concurrency=bp_node.max_concurrency,
+                rate_limit=bp_node.rate_limit,
+                to_process=bp_node.to_process,
+                cache=bp_node.cache,
+                coalesce=bp_node.coalesce,
+                cache_namespace=bp_node.cache_namespace,
             )
 
             self.bp_to_node_map[bp_node] = node
-            self.graph.add_node(node)
             setattr(self, name, node)
 
     def _initialize_outputs(self):
@@ -163,6 +172,7 @@ class Blueprint(Deppy, metaclass=BlueprintMeta):
                         await obj.__aexit__(exc_type, exc_value, traceback)
                     elif hasattr(obj, "__exit__"):
                         obj.__exit__(exc_type, exc_value, traceback)
+                self.close()
 
             setattr(self.__class__, "__aenter__", __aenter__)
             setattr(self.__class__, "__aexit__", __aexit__)
@@ -179,6 +189,7 @@ class Blueprint(Deppy, metaclass=BlueprintMeta):
                 for obj in object_map.values():
                     if hasattr(obj, "__exit__"):
                         obj.__exit__(exc_type, exc_value, traceback)
+                self.close()
 
             setattr(self.__class__, "__enter__", __enter__)
             setattr(self.__class__, "__exit__", __exit__)
@@ -1,5 +1,15 @@
-from typing import Any, Optional, Iterable, Callable, TypeVar, Type, ParamSpec
-from ..node import LoopStrategy, product
+from typing import (
+    Any,
+    Optional,
+    Iterable,
+    Callable,
+    TypeVar,
+    Type,
+    ParamSpec,
+    Union,
+)
+from ..node import LoopStrategy, RateLimit, product
+from ..cache import ResultCache
 
 
 T = TypeVar("T")
@@ -57,6 +67,12 @@ class Node(BlueprintObject):
         name: Optional[str] = None,
         secret: bool = False,
         inputs: Optional[Iterable[Any]] = None,
+        max_concurrency: Optional[int] = None,
+        rate_limit: Optional[Union[RateLimit, float]] = None,
+        to_process: bool = False,
+        cache: Optional[ResultCache] = None,
+        coalesce: bool = False,
+        cache_namespace: Optional[str] = None,
     ):
         if isinstance(func, ObjectAccessor):
             self.accesses = func.__prune__()
@@ -69,6 +85,12 @@ class Node(BlueprintObject):
         self.name = name or func.__name__
         self.secret = secret
         self.inputs = inputs or []
+        self.max_concurrency = max_concurrency
+        self.rate_limit = rate_limit
+        self.to_process = to_process
+        self.cache = cache
+        self.coalesce = coalesce
+        self.cache_namespace = cache_namespace
 
     def __repr__(self):  # pragma: no cover
         return f"<Node {self.name}>"
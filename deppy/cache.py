@@ -0,0 +1,687 @@
+import hashlib
+import inspect
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+import weakref
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import partial
+from types import ModuleType
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from .store import estimate_size
+
+_tokens: "weakref.WeakKeyDictionary[Any, str]" = weakref.WeakKeyDictionary()
+
+
+def _feed(value: Any, hasher) -> None:
+    """
+    Feeds a canonical encoding of a value to a hasher.
+    Dicts and sets are encoded independent of their iteration order. Objects defining `__deppy_hash__`
+    are encoded as the value it returns, other objects are pickled. Their pickle is not canonical:
+    equal objects holding e.g. sets of strings may pickle differently, and so get different keys, in
+    another process, so their results may only be found again by the process which stored them.
+
+    Parameters
+    ----------
+    value : Any
+        The value to encode.
+    hasher : hashlib._Hash
+        The hasher to update.
+    """
+    kind = type(value).__qualname__
+    if value is None or isinstance(value, (bool, int, float, complex, str, bytes)):
+        hasher.update(f"{kind}:{value!r};".encode())
+    elif isinstance(value, (list, tuple)):
+        hasher.update(f"{kind}[{len(value)}:".encode())
+        for item in value:
+            _feed(item, hasher)
+        hasher.update(b"]")
+    elif isinstance(value, dict):
+        hasher.update(f"{kind}{{{len(value)}:".encode())
+        for key_digest, item in sorted(
+            ((stable_hash(key), item) for key, item in value.items()),
+            key=lambda pair: pair[0],
+        ):
+            hasher.update(key_digest.encode())
+            _feed(item, hasher)
+        hasher.update(b"}")
+    elif isinstance(value, (set, frozenset)):
+        hasher.update(f"{kind}{{{len(value)}:".encode())
+        for item_digest in sorted(stable_hash(item) for item in value):
+            hasher.update(item_digest.encode())
+        hasher.update(b"}")
+    elif hasattr(type(value), "__deppy_hash__"):
+        hasher.update(f"{type(value).__module__}.{kind}(".encode())
+        _feed(value.__deppy_hash__(), hasher)
+        hasher.update(b")")
+    else:
+        hasher.update(f"{kind}<".encode())
+        hasher.update(pickle.dumps(value, protocol=4))
+        hasher.update(b">")
+
+
+def stable_hash(value: Any) -> str:
+    """
+    Computes a hash of a value which is the same across runs of the interpreter.
+
+    Parameters
+    ----------
+    value : Any
+        The value to hash.
+
+    Returns
+    -------
+    str
+        The hex digest of the value.
+
+    Raises
+    ------
+    TypeError
+        If the value contains an object which cannot be pickled.
+    """
+    hasher = hashlib.sha256()
+    try:
+        _feed(value, hasher)
+    except (pickle.PicklingError, TypeError, AttributeError) as e:
+        raise TypeError(f"Cannot hash {value!r}: {e}") from e
+    return hasher.hexdigest()
+
+
+def _token(obj: Any) -> str:
+    """
+    Returns a token identifying an object for as long as it lives, in this process only.
+
+    Parameters
+    ----------
+    obj : Any
+        The object to identify.
+
+    Returns
+    -------
+    str
+        The token of the object.
+    """
+    try:
+        return _tokens.setdefault(obj, uuid.uuid4().hex)
+    except TypeError:
+        return f"id:{id(obj)}"
+
+
+def _value_identity(value: Any, owner: Any) -> str:
+    """
+    Identifies a value by its hash, or by the token of its owner if it cannot be hashed.
+
+    Parameters
+    ----------
+    value : Any
+        The value to identify.
+    owner : Any
+        The object whose token is used if the value cannot be hashed.
+
+    Returns
+    -------
+    str
+        The identity of the value.
+    """
+    try:
+        return stable_hash(value)
+    except Exception:
+        return _token(owner)
+
+
+def function_identity(func: Callable[..., Any]) -> str:
+    """
+    Identifies a function together with the state it is bound to.
+    Besides its qualified name, this covers the arguments of a partial, the instance of a bound method
+    or callable object, and the variables a closure captures. They are identified by value when they
+    can be hashed, so the identity is stable across runs, and by object otherwise.
+
+    Parameters
+    ----------
+    func : Callable[..., Any]
+        The function to identify.
+
+    Returns
+    -------
+    str
+        The identity of the function.
+    """
+    if isinstance(func, partial):
+        arguments = (func.args, func.keywords)
+        return f"{function_identity(func.func)}({_value_identity(arguments, func)})"
+
+    identity = (
+        f"{getattr(func, '__module__', None)}."
+        f"{getattr(func, '__qualname__', type(func).__qualname__)}"
+    )
+    owner = getattr(func, "__self__", None)
+    if owner is not None and not isinstance(owner, ModuleType):
+        identity += f"@{_value_identity(owner, owner)}"
+    elif not inspect.isroutine(func):
+        identity += f"@{_value_identity(func, func)}"
+    closure = getattr(func, "__closure__", None)
+    if closure:
+        try:
+            captured = tuple(cell.cell_contents for cell in closure)
+        except ValueError:
+            identity += f"[{_token(func)}]"
+        else:
+            identity += f"[{_value_identity(captured, func)}]"
+    return identity
+
+
+def bound_to_instance(func: Callable[..., Any]) -> bool:
+    """
+    Determines whether a function is bound to an instance, whose attributes are part of its identity.
+
+    Parameters
+    ----------
+    func : Callable[..., Any]
+        The function to check.
+
+    Returns
+    -------
+    bool
+        True for bound methods and callable objects, also when wrapped in a partial.
+    """
+    if isinstance(func, partial):
+        return bound_to_instance(func.func)
+    owner = getattr(func, "__self__", None)
+    if owner is not None and not isinstance(owner, ModuleType):
+        return True
+    return not inspect.isroutine(func)
+
+
+def cache_key(node, args: Sequence[Any], kwargs: Dict[str, Any]) -> str:
+    """
+    Computes the cache key of a call of a node.
+    The node is identified by its name and its cache namespace, or else the identity of its function.
+    The identity of a function bound to an instance is computed on every call, as its attributes may
+    have changed, that of other functions once per function of the node. Keys are stable across runs as long as the
+    function and the state it is bound to can be hashed.
+
+    Parameters
+    ----------
+    node : Node
+        The node being called.
+    args : Sequence[Any]
+        Positional arguments of the call.
+    kwargs : Dict[str, Any]
+        Keyword arguments of the call.
+
+    Returns
+    -------
+    str
+        The cache key.
+
+    Raises
+    ------
+    ValueError
+        If an argument cannot be hashed.
+    """
+    identity = node.cache_namespace
+    if identity is None:
+        func, identity = node.func_identity or (None, None)
+        if func is not node.func:
+            identity = function_identity(node.func)
+            if not bound_to_instance(node.func):
+                node.func_identity = (node.func, identity)
+    try:
+        return stable_hash((node.name, identity, tuple(args), kwargs))
+    except TypeError as e:
+        raise ValueError(
+            f"Node '{node}' caches or coalesces its calls, but its arguments cannot be hashed: {e}"
+        ) from e
+
+
+class ResultCache(ABC):
+    """
+    Base class of the caches memoizing node results.
+    Subclasses implement `load`, `store`, `clear` and `__len__`, the lookups are counted here.
+    A cache can be shared by several nodes and is safe to use from several threads.
+
+    Attributes
+    ----------
+    ttl : Optional[float]
+        Number of seconds a result is kept, or None to keep results until they are evicted.
+    max_size : Optional[int]
+        Maximum number of results kept, or None if unbounded. The least recently used results are evicted first.
+    max_bytes : Optional[int]
+        Maximum total size in bytes of the results kept, or None if unbounded. The least recently used results are evicted first.
+    hits : int
+        Number of lookups which found a result.
+    misses : int
+        Number of lookups which did not find a result.
+    """
+
+    def __init__(
+        self,
+        max_size: Optional[int] = None,
+        ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+    ) -> None:
+        """
+        Constructs a ResultCache.
+
+        Parameters
+        ----------
+        max_size : Optional[int], optional
+            Maximum number of results kept (default is None, meaning unbounded).
+        ttl : Optional[float], optional
+            Number of seconds a result is kept (default is None, meaning until evicted).
+        max_bytes : Optional[int], optional
+            Maximum total size in bytes of the results kept (default is None, meaning unbounded).
+
+        Raises
+        ------
+        ValueError
+            If max_size, ttl or max_bytes is not positive.
+        """
+        if (
+            (max_size is not None and max_size < 1)
+            or (ttl is not None and ttl <= 0)
+            or (max_bytes is not None and max_bytes < 1)
+        ):
+            raise ValueError("Cache max_size, ttl and max_bytes must be positive")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Looks up a result.
+
+        Parameters
+        ----------
+        key : str
+            The cache key.
+
+        Returns
+        -------
+        Tuple[bool, Any]
+            Whether the result was found, and the result itself.
+        """
+        with self.lock:
+            found, value = self.load(key)
+            if found:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return found, value
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Stores a result, evicting the least recently used results if the cache is full.
+
+        Parameters
+        ----------
+        key : str
+            The cache key.
+        value : Any
+            The result to store.
+        """
+        with self.lock:
+            self.store(key, value)
+
+    @abstractmethod
+    def load(self, key: str) -> Tuple[bool, Any]:  # pragma: no cover
+        """
+        Looks up a result which has not expired, called with the lock held.
+
+        Parameters
+        ----------
+        key : str
+            The cache key.
+
+        Returns
+        -------
+        Tuple[bool, Any]
+            Whether the result was found, and the result itself.
+        """
+        ...
+
+    @abstractmethod
+    def store(self, key: str, value: Any) -> None:  # pragma: no cover
+        """
+        Stores a result and evicts the least recently used results beyond `max_size` or `max_bytes`,
+        called with the lock held.
+
+        Parameters
+        ----------
+        key : str
+            The cache key.
+        value : Any
+            The result to store.
+        """
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:  # pragma: no cover
+        """
+        Removes every result.
+        """
+        ...
+
+    @abstractmethod
+    def __len__(self) -> int:  # pragma: no cover
+        """
+        Counts the results kept, including expired results which were not looked up since.
+
+        Returns
+        -------
+        int
+            The number of results.
+        """
+        ...
+
+
+class MemoryCache(ResultCache):
+    """
+    An in-memory LRU cache of node results, optionally expiring them after `ttl` seconds.
+    The size of the results is estimated with `estimate_size`, only when `max_bytes` is set.
+
+    Attributes
+    ----------
+    entries : OrderedDict[str, Tuple[Optional[float], Any, int]]
+        The expiry time, result and estimated size per key, from the least to the most recently used.
+    nbytes : int
+        The estimated total size of the results kept.
+    """
+
+    def __init__(
+        self,
+        max_size: Optional[int] = None,
+        ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+    ) -> None:
+        """
+        Constructs a MemoryCache.
+
+        Parameters
+        ----------
+        max_size : Optional[int], optional
+            Maximum number of results kept (default is None, meaning unbounded).
+        ttl : Optional[float], optional
+            Number of seconds a result is kept (default is None, meaning until evicted).
+        max_bytes : Optional[int], optional
+            Maximum estimated total size in bytes of the results kept (default is None, meaning unbounded).
+        """
+        super().__init__(max_size=max_size, ttl=ttl, max_bytes=max_bytes)
+        self.entries: "OrderedDict[str, Tuple[Optional[float], Any, int]]" = (
+            OrderedDict()
+        )
+        self.nbytes = 0
+
+    def load(self, key: str) -> Tuple[bool, Any]:
+        """
+        Looks up a result, dropping it if it expired and marking it as most recently used otherwise.
+
+        Parameters
+        ----------
+        key : str
+            The cache key.
+
+        Returns
+        -------
+        Tuple[bool, Any]
+            Whether the result was found, and the result itself.
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            return False, None
+        expires, value, nbytes = entry
+        if expires is not None and expires <= time.monotonic():
+            del self.entries[key]
+            self.nbytes -= nbytes
+            return False, None
+        self.entries.move_to_end(key)
+        return True, value
+
+    def store(self, key: str, value: Any) -> None:
+        """
+        Stores a result as most recently used, evicting the least recently used results
+        beyond `max_size` or `max_bytes`. A result larger than `max_bytes` is not kept.
+
+        Parameters
+        ----------
+        key : str
+            The cache key.
+        value : Any
+            The result to store.
+        """
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        nbytes = 0 if self.max_bytes is None else estimate_size(value, self.max_bytes)
+        if self.max_bytes is not None and nbytes > self.max_bytes:
+            return
+        previous = self.entries.pop(key, None)
+        if previous is not None:
+            self.nbytes -= previous[2]
+        self.entries[key] = (expires, value, nbytes)
+        self.nbytes += nbytes
+        while self.entries and (
+            (self.max_size is not None and len(self.entries) > self.max_size)
+            or (self.max_bytes is not None and self.nbytes > self.max_bytes)
+        ):
+            self.nbytes -= self.entries.popitem(last=False)[1][2]
+
+    def clear(self) -> None:
+        """
+        Removes every result.
+        """
+        with self.lock:
+            self.entries.clear()
+            self.nbytes = 0
+
+    def __len__(self) -> int:
+        """
+        Counts the results kept.
+
+        Returns
+        -------
+        int
+            The number of results.
+        """
+        return len(self.entries)
+
+
+class SQLiteCache(ResultCache):
+    """
+    An on-disk cache of node results in a sqlite database, so results survive the process.
+    Results are pickled, expire after `ttl` seconds of wall-clock time and are evicted least recently used first.
+    Their size is the length of their pickle.
+
+    Attributes
+    ----------
+    path : str
+        The path of the database file.
+    connection : sqlite3.Connection
+        The connection to the database.
+    size : int
+        The number of results stored, counted again whenever results are evicted
+        so results stored by other processes are taken into account.
+    nbytes : int
+        The total length of the pickled results stored, counted again along with `size`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_size: Optional[int] = None,
+        ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+    ) -> None:
+        """
+        Constructs a SQLiteCache, creating the database file if needed.
+
+        Parameters
+        ----------
+        path : str
+            The path of the database file.
+        max_size : Optional[int], optional
+            Maximum number of results kept (default is None, meaning unbounded).
+        ttl : Optional[float], optional
+            Number of seconds a result is kept (default is None, meaning until evicted).
+        max_bytes : Optional[int], optional
+            Maximum total length in bytes of the pickled results kept (default is None, meaning unbounded).
+        """
+        super().__init__(max_size=max_size, ttl=ttl, max_bytes=max_bytes)
+        self.path = path
+        self.connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS results "
+            "(key TEXT PRIMARY KEY, value BLOB NOT NULL, stored REAL NOT NULL, used REAL NOT NULL)"
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS results_used ON results (used)"
+        )
+        self.size, self.nbytes = self.totals()
+
+    def count(self) -> int:
+        """
+        Counts the results in the database.
+
+        Returns
+        -------
+        int
+            The number of results.
+        """
+        return self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def totals(self) -> Tuple[int, int]:
+        """
+        Counts the results in the database and their total size.
+
+        Returns
+        -------
+        Tuple[int, int]
+            The number of results and the total length of their pickles.
+        """
+        return self.connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM results"
+        ).fetchone()
+
+    def load(self, key: str) -> Tuple[bool, Any]:
+        """
+        Looks up a result, deleting it if it expired and updating its last use otherwise.
+
+        Parameters
+        ----------
+        key : str
+            The cache key.
+
+        Returns
+        -------
+        Tuple[bool, Any]
+            Whether the result was found, and the unpickled result.
+        """
+        row = self.connection.execute(
+            "SELECT value, stored FROM results WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return False, None
+        value, stored = row
+        now = time.time()
+        if self.ttl is not None and stored + self.ttl <= now:
+            self.connection.execute("DELETE FROM results WHERE key = ?", (key,))
+            self.size -= 1
+            self.nbytes -= len(value)
+            return False, None
+        self.connection.execute("UPDATE results SET used = ? WHERE key = ?", (now, key))
+        return True, pickle.loads(value)
+
+    def store(self, key: str, value: Any) -> None:
+        """
+        Stores a pickled result. The least recently used results are only evicted
+        once the number of results exceeds `max_size` or their total size exceeds `max_bytes`.
+        A result larger than `max_bytes` is not kept.
+
+        Parameters
+        ----------
+        key : str
+            The cache key.
+        value : Any
+            The result to store.
+        """
+        now = time.time()
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if self.max_bytes is not None and len(blob) > self.max_bytes:
+            return
+        previous = self.connection.execute(
+            "SELECT LENGTH(value) FROM results WHERE key = ?", (key,)
+        ).fetchone()
+        self.connection.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+            (key, blob, now, now),
+        )
+        if previous is None:
+            self.size += 1
+        else:
+            self.nbytes -= previous[0]
+        self.nbytes += len(blob)
+        if self.over_budget():
+            self.size, self.nbytes = self.totals()
+            if not self.over_budget():
+                return
+            if self.max_size is not None and self.size > self.max_size:
+                self.connection.execute(
+                    "DELETE FROM results WHERE key IN "
+                    "(SELECT key FROM results ORDER BY used, rowid LIMIT ?)",
+                    (self.size - self.max_size,),
+                )
+            if self.max_bytes is not None:
+                # Keeps the most recently used results fitting in the budget.
+                self.connection.execute(
+                    "DELETE FROM results WHERE key IN (SELECT key FROM "
+                    "(SELECT key, SUM(LENGTH(value)) OVER (ORDER BY used DESC, rowid DESC) AS total "
+                    "FROM results) WHERE total > ?)",
+                    (self.max_bytes,),
+                )
+            self.size, self.nbytes = self.totals()
+
+    def over_budget(self) -> bool:
+        """
+        Determines whether more results are stored than `max_size` or `max_bytes` allow.
+
+        Returns
+        -------
+        bool
+            True if results have to be evicted.
+        """
+        return (self.max_size is not None and self.size > self.max_size) or (
+            self.max_bytes is not None and self.nbytes > self.max_bytes
+        )
+
+    def clear(self) -> None:
+        """
+        Removes every result.
+        """
+        with self.lock:
+            self.connection.execute("DELETE FROM results")
+            self.size = self.nbytes = 0
+
+    def close(self) -> None:
+        """
+        Closes the connection to the database.
+        """
+        self.connection.close()
+
+    def __len__(self) -> int:
+        """
+        Counts the results in the database.
+
+        Returns
+        -------
+        int
+            The number of results.
+        """
+        with self.lock:
+            return self.count()
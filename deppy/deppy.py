@@ -1,9 +1,24 @@
-from typing import Optional
+from typing import (
+    Optional,
+    Sequence,
+    Dict,
+    FrozenSet,
+    Tuple,
+    Iterable,
+    Iterator,
+    AsyncIterator,
+    Any,
+    Union,
+)
 import asyncio
+import queue
+import threading
 
 from .node import Node
 from .graph_builder import GraphBuilder
-from .executor import HybridExecutor
+from .executor import HybridExecutor, ExecutionPlan
+from .scope import Scope
+from .store import resolve
 
 
 class Deppy:
@@ -20,9 +35,17 @@ class Deppy:
         The underlying graph structure managed by the GraphBuilder.
     executor : HybridExecutor
         Instance of HybridExecutor for executing the dependency graph.
+    _plans : Dict[FrozenSet[Node], ExecutionPlan]
+        Compiled execution plans per set of target nodes.
+    _plans_version : int
+        The graph builder version the compiled plans belong to.
+    _previous : Dict[FrozenSet[Node], Tuple[Scope, Dict[Node, Tuple]]]
+        The root scope and node fingerprints of the last incremental execution, per set of target nodes.
     """
 
-    def __init__(self, name: Optional[str] = "Deppy") -> None:
+    def __init__(
+        self, name: Optional[str] = "Deppy", sync_to_thread: Optional[bool] = None
+    ) -> None:
         """
         Constructs a Deppy instance with a dependency graph and executor.
 
@@ -30,6 +53,9 @@ class Deppy:
         ----------
         name : Optional[str], optional
             The name of the Deppy instance (default is "Deppy").
+        sync_to_thread : Optional[bool], optional
+            Flag to run every sync node on the thread pool, as if `to_thread` was set
+            (default is None, which enables it when the GIL is disabled).
         """
         self._name = name
 
@@ -38,10 +64,41 @@ class Deppy:
         self.add_node = self.graph_builder.add_node
         self.add_output = self.graph_builder.add_output
         self.add_edge = self.graph_builder.add_edge
+        self.add_edges = self.graph_builder.add_edges
+        self.deferred_check = self.graph_builder.deferred_check
         self.add_const = self.graph_builder.add_const
         self.add_secret = self.graph_builder.add_secret
+        self.set_value = self.graph_builder.set_value
 
-        self.executor = HybridExecutor(self)
+        self.executor = HybridExecutor(self, sync_to_thread=sync_to_thread)
+
+        self._plans: Dict[FrozenSet[Node], ExecutionPlan] = {}
+        self._plans_version = self.graph_builder.version
+        self._previous: Dict[FrozenSet[Node], Tuple[Scope, Dict[Node, Tuple]]] = {}
+
+    def plan(self, *target_nodes: Sequence[Node]) -> ExecutionPlan:
+        """
+        Returns the compiled execution plan for the target nodes.
+        Plans are cached per set of target nodes and recompiled once the graph builder changed the graph.
+
+        Parameters
+        ----------
+        target_nodes : Sequence[Node]
+            The target nodes to execute (default is all nodes).
+
+        Returns
+        -------
+        ExecutionPlan
+            The execution plan for the target nodes.
+        """
+        if self._plans_version != self.graph_builder.version:
+            self._plans.clear()
+            self._plans_version = self.graph_builder.version
+        key = frozenset(target_nodes)
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = self._plans[key] = ExecutionPlan(self.graph, target_nodes)
+        return plan
 
     def get_node_by_name(self, name: str) -> Optional[Node]:
         """
@@ -86,6 +143,187 @@ class Deppy:
                     dot_graph.add_edge(u, v, key=k, **d)
         write_dot(dot_graph, filename)
 
+    def execute_incremental(
+        self, *target_nodes: Sequence[Node], changed: Iterable[Node] = ()
+    ):
+        """
+        Executes the graph, reusing the results of the previous incremental execution of the same target nodes.
+        Only nodes whose function or inputs changed since, for example consts updated with `set_value`,
+        the `changed` nodes, and their descendants are executed again.
+        The first incremental execution executes every node.
+
+        Parameters
+        ----------
+        target_nodes : Sequence[Node]
+            The target nodes to execute (default is all nodes).
+        changed : Iterable[Node], optional
+            Nodes to execute again even though their function and inputs did not change,
+            for example because they fetch data that changed (default is none).
+
+        Returns
+        -------
+        Union[Scope, Coroutine[Any, Any, Scope]]
+            The root scope, or a coroutine returning it when the graph contains async nodes.
+        """
+        key = frozenset(target_nodes)
+        changed = frozenset(changed)
+        execute = self.execute
+
+        def prepare() -> None:
+            previous = self._previous.pop(key, None)
+            if previous is not None:
+                self.executor.previous = (*previous, changed)
+
+        def remember(root: Scope) -> Scope:
+            self._previous[key] = (root, self.executor.fingerprints)
+            return root
+
+        if asyncio.iscoroutinefunction(execute):
+
+            async def execute_async() -> Scope:
+                prepare()
+                return remember(await execute(*target_nodes))
+
+            return execute_async()
+        prepare()
+        return remember(execute(*target_nodes))
+
+    def stream(
+        self, *target_nodes: Sequence[Node]
+    ) -> Union[
+        Iterator[Tuple[Node, Scope, Any]], AsyncIterator[Tuple[Node, Scope, Any]]
+    ]:
+        """
+        Executes the graph, yielding every result as soon as it is saved instead of returning the root scope at the end.
+        Ignored results are not yielded. Closing the iterator early stops the execution.
+
+        Parameters
+        ----------
+        target_nodes : Sequence[Node]
+            The target nodes to execute and yield the results of (default is all nodes).
+
+        Returns
+        -------
+        Union[Iterator[Tuple[Node, Scope, Any]], AsyncIterator[Tuple[Node, Scope, Any]]]
+            The (node, scope, value) triples, from a generator running the execution in a background thread,
+            or an async generator when the graph contains async nodes.
+        """
+        if self.execute_is_async():
+            return self._stream_async(target_nodes)
+        return self._stream_sync(target_nodes)
+
+    def _stream_sync(
+        self, target_nodes: Sequence[Node]
+    ) -> Iterator[Tuple[Node, Scope, Any]]:
+        """
+        Streams the results of a synchronous execution, which runs in a background thread.
+
+        Parameters
+        ----------
+        target_nodes : Sequence[Node]
+            The target nodes to execute and yield the results of.
+
+        Returns
+        -------
+        Iterator[Tuple[Node, Scope, Any]]
+            The (node, scope, value) triples.
+        """
+        execute = self.execute
+        wanted = frozenset(target_nodes)
+        results: queue.Queue = queue.Queue()
+        closed = threading.Event()
+
+        def listener(node: Node, scope: Scope, ignored: bool) -> None:
+            if closed.is_set():
+                raise _StreamClosed()
+            if not ignored and (not wanted or node in wanted):
+                results.put((node, scope, dict.__getitem__(scope, node)))
+
+        def run() -> None:
+            try:
+                execute(*target_nodes)
+            except _StreamClosed:
+                pass
+            except BaseException as e:
+                results.put(_StreamFailed(e))
+            results.put(_stream_end)
+
+        self.executor.result_listener = listener
+        thread = threading.Thread(target=run, name="deppy-stream", daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = results.get()
+                if item is _stream_end:
+                    return
+                if isinstance(item, _StreamFailed):
+                    raise item.error
+                node, scope, value = item
+                yield node, scope, resolve(value)
+        finally:
+            closed.set()
+            thread.join()
+            self.executor.result_listener = None
+
+    async def _stream_async(
+        self, target_nodes: Sequence[Node]
+    ) -> AsyncIterator[Tuple[Node, Scope, Any]]:
+        """
+        Streams the results of an asynchronous execution, which runs in a task on the running event loop.
+        The executor runs in streaming mode, so every call is saved, and yielded, as soon as it returns.
+
+        Parameters
+        ----------
+        target_nodes : Sequence[Node]
+            The target nodes to execute and yield the results of.
+
+        Returns
+        -------
+        AsyncIterator[Tuple[Node, Scope, Any]]
+            The (node, scope, value) triples.
+        """
+        wanted = frozenset(target_nodes)
+        results: asyncio.Queue = asyncio.Queue()
+
+        def listener(node: Node, scope: Scope, ignored: bool) -> None:
+            if not ignored and (not wanted or node in wanted):
+                results.put_nowait((node, scope, dict.__getitem__(scope, node)))
+
+        streaming = self.executor.streaming
+        self.executor.result_listener = listener
+        self.executor.streaming = True
+        task = asyncio.ensure_future(self.execute(*target_nodes))
+        task.add_done_callback(lambda _: results.put_nowait(_stream_end))
+        try:
+            while True:
+                item = await results.get()
+                if item is _stream_end:
+                    break
+                node, scope, value = item
+                yield node, scope, resolve(value)
+            task.result()
+        finally:
+            if not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+            self.executor.result_listener = None
+            self.executor.streaming = streaming
+
+    def close(self) -> None:
+        """
+        Releases the thread and process pools created by the executor.
+        Shared and injected pools are left running, so closing is cheap when the default pool is used.
+        """
+        shutdown = getattr(self.executor, "shutdown", None)
+        if shutdown is not None:
+            shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def execute_is_async(self) -> bool:
         """
         Checks whether the execute method is asynchronous.
@@ -114,3 +352,17 @@ class Deppy:
         if all_async_nodes:
             return self.executor.execute_async
         return self.executor.execute_hybrid
+
+
+class _StreamClosed(Exception):
+    """Raised in the executing thread to stop an execution whose stream was closed."""
+
+
+class _StreamFailed:
+    """Carries the error of a streamed execution to the consuming thread."""
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+_stream_end = object()
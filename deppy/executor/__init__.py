@@ -1,3 +1,5 @@
 from .async_executor import AsyncExecutor  # noqa: F401
 from .sync_executor import SyncExecutor  # noqa: F401
 from .hybrid_executor import HybridExecutor  # noqa: F401
+from .plan import ExecutionPlan  # noqa: F401
+from .tracer import Tracer  # noqa: F401
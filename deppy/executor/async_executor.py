@@ -1,9 +1,25 @@
 import asyncio
-from typing import Sequence, Set, Optional, Any
+from functools import partial
+from itertools import chain, islice
+from typing import (
+    Sequence,
+    Set,
+    Optional,
+    Any,
+    Callable,
+    Awaitable,
+    Dict,
+    Iterable,
+    List,
+    Tuple,
+)
 
 from deppy.node import Node
 from deppy.scope import Scope
 from .executor import Executor
+from .limits import NodeLimiter
+from .coalesce import SingleFlight
+from deppy.cache import cache_key
 
 
 class AsyncExecutor(Executor):
@@ -12,14 +28,29 @@ class AsyncExecutor(Executor):
 
     Attributes
     ----------
+    max_concurrent_tasks : Optional[int]
+        Maximum number of concurrent tasks, or None if no limit is set.
     semaphore : Optional[asyncio.Semaphore]
         A semaphore to limit the number of concurrent tasks, or None if no limit is set.
     call_node_async : Callable
         The method used to call nodes asynchronously, adjusted based on semaphore usage.
+    streaming : bool
+        Whether every new scope is sent to the successor nodes as soon as it is produced.
+    limiters : Dict[Node, NodeLimiter]
+        The limiters of the nodes with a concurrency cap or rate limit in the current execution.
+    flights : Dict[Node, SingleFlight]
+        The running calls of the nodes coalescing equal calls, in the current execution.
+    in_flight : Dict[Node, asyncio.Semaphore]
+        The slots bounding the calls of every node across all its scopes, in the current streaming execution.
     """
 
     def __init__(
-        self, deppy, max_concurrent_tasks: Optional[int] = None, *args, **kwargs
+        self,
+        deppy,
+        max_concurrent_tasks: Optional[int] = None,
+        *args,
+        streaming: Optional[bool] = False,
+        **kwargs,
     ) -> None:
         """
         Constructs an AsyncExecutor instance.
@@ -30,8 +61,15 @@ class AsyncExecutor(Executor):
             The main dependency manager instance.
         max_concurrent_tasks : Optional[int], optional
             Maximum number of concurrent tasks (default is None, meaning unlimited).
+        streaming : Optional[bool], optional
+            Flag to execute successors per scope as soon as the scope is produced (default is False).
         """
-        super().__init__(deppy)
+        super().__init__(deppy, *args, **kwargs)
+        self.streaming = streaming
+        self.max_concurrent_tasks = max_concurrent_tasks
+        self.limiters: Dict[Node, NodeLimiter] = {}
+        self.flights: Dict[Node, SingleFlight] = {}
+        self.in_flight: Dict[Node, asyncio.Semaphore] = {}
         if max_concurrent_tasks:
             self.semaphore = asyncio.Semaphore(max_concurrent_tasks)
             self.call_node_async = self._call_with_semaphore
@@ -64,6 +102,7 @@ class AsyncExecutor(Executor):
     async def _call_without_semaphore(node, *args, **kwargs) -> Any:
         """
         Calls a node asynchronously without any concurrency limit.
+        The function is awaited directly unless the node has a result cache to consult.
 
         Parameters
         ----------
@@ -79,8 +118,258 @@ class AsyncExecutor(Executor):
         Any
             The result of the node call.
         """
+        if node.cache is not None:
+            return await node.call_async(*args, **kwargs)
         return await node.func(*args, **kwargs)
 
+    def setup(self, *target_nodes: Sequence[Node]) -> None:
+        """
+        Sets up the execution, creating the limiters of the nodes with a concurrency cap or rate limit,
+        and the single-flight groups of the nodes coalescing their calls.
+        Token buckets are reused, so rate limits also hold across executions.
+
+        Parameters
+        ----------
+        target_nodes : Sequence[Node]
+            The target nodes for the execution setup.
+        """
+        super().setup(*target_nodes)
+        self.limiters = {}
+        self.flights = {}
+        for node in self.plan.nodes:
+            if node.is_limited:
+                self.limiters[node] = NodeLimiter(
+                    node.max_concurrency, self.get_bucket(node)
+                )
+            if node.coalesce:
+                self.flights[node] = SingleFlight()
+
+    def limit_call(
+        self, node: Node, call: Callable[..., Awaitable[Any]]
+    ) -> Callable[..., Awaitable[Any]]:
+        """
+        Wraps a call of a node so it respects the concurrency cap and rate limit of the node.
+
+        Parameters
+        ----------
+        node : Node
+            The node being called.
+        call : Callable[..., Awaitable[Any]]
+            The coroutine function calling the node.
+
+        Returns
+        -------
+        Callable[..., Awaitable[Any]]
+            The limited coroutine function, or `call` itself if the node is not limited.
+        """
+        limiter = self.limiters.get(node)
+        if limiter is None:
+            return call
+
+        async def limited_call(*args, **kwargs) -> Any:
+            async with limiter:
+                return await call(*args, **kwargs)
+
+        return limited_call
+
+    def coalesce_call(
+        self, node: Node, call: Callable[..., Awaitable[Any]]
+    ) -> Callable[..., Awaitable[Any]]:
+        """
+        Wraps a call of a node so concurrent calls with equal arguments share a single call.
+        Coalesced calls are not counted against the limits of the node,
+        calls whose arguments cannot be hashed are made on their own.
+
+        Parameters
+        ----------
+        node : Node
+            The node being called.
+        call : Callable[..., Awaitable[Any]]
+            The coroutine function calling the node.
+
+        Returns
+        -------
+        Callable[..., Awaitable[Any]]
+            The coalescing coroutine function, or `call` itself if the node does not coalesce its calls.
+        """
+        flights = self.flights.get(node)
+        if flights is None:
+            return call
+
+        async def coalesced_call(**kwargs) -> Any:
+            try:
+                key = cache_key(node, (), kwargs)
+            except ValueError:
+                return await call(**kwargs)
+            return await flights.call(key, call, **kwargs)
+
+        return coalesced_call
+
+    def get_node_call(self, node: Node) -> Callable[..., Awaitable[Any]]:
+        """
+        Returns the coroutine function used to call a node with resolved arguments.
+
+        Parameters
+        ----------
+        node : Node
+            The node to call.
+
+        Returns
+        -------
+        Callable[..., Awaitable[Any]]
+            The coroutine function calling the node, respecting its limits.
+        """
+        call = partial(self.call_node_async, node)
+        if self.tracer is not None:
+            call = partial(self.tracer.run_async, None, call)
+        return self.coalesce_call(node, self.limit_call(node, call))
+
+    def trace_call(
+        self, node: Node, scope: Scope, call: Callable[..., Awaitable[Any]]
+    ) -> Callable[..., Awaitable[Any]]:
+        """
+        Wraps the calls of a node within a scope so they are recorded by the tracer.
+
+        Parameters
+        ----------
+        node : Node
+            The node being called.
+        scope : Scope
+            The scope the arguments are resolved in.
+        call : Callable[..., Awaitable[Any]]
+            The coroutine function calling the node.
+
+        Returns
+        -------
+        Callable[..., Awaitable[Any]]
+            The traced coroutine function, or `call` itself if there is no tracer.
+        """
+        if self.tracer is None:
+            return call
+        return partial(self.tracer.trace, node, scope, call)
+
+    def dispatch_width(self, node: Node) -> Optional[int]:
+        """
+        The number of workers dispatching the calls of a node.
+        Workers beyond the concurrency limit would only wait on the semaphore, so it caps the width of async nodes too.
+
+        Parameters
+        ----------
+        node : Node
+            The node whose calls are dispatched.
+
+        Returns
+        -------
+        Optional[int]
+            The number of workers, or None if every call gets its own worker.
+        """
+        if not node.is_async or not self.max_concurrent_tasks:
+            return self.max_in_flight
+        if self.max_in_flight:
+            return min(self.max_concurrent_tasks, self.max_in_flight)
+        return self.max_concurrent_tasks
+
+    async def gather_bounded(
+        self, calls: Iterable[Awaitable[Any]], width: Optional[int]
+    ) -> List[Any]:
+        """
+        Awaits lazily created awaitables using a pool of workers pulling the next call once they are done.
+        At most `width` calls exist at any time, and no more workers are started than there are calls.
+        When a call fails, the workers still running are cancelled and awaited.
+
+        Parameters
+        ----------
+        calls : Iterable[Awaitable[Any]]
+            The awaitables to run, only created when a worker pulls them.
+        width : Optional[int]
+            The number of workers, or None to run all calls at once.
+
+        Returns
+        -------
+        List[Any]
+            The results, in the order of the calls.
+        """
+        if width is None:
+            calls = list(calls)
+            width = len(calls)
+        else:
+            calls = iter(calls)
+            head = list(islice(calls, width))
+            width = len(head)
+            calls = chain(head, calls)
+        if not width:
+            return []
+        calls = iter(calls)
+        results = []
+
+        async def worker() -> None:
+            for call in calls:
+                position = len(results)
+                results.append(None)
+                results[position] = await call
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(width)]
+        try:
+            done, _ = await asyncio.wait(workers, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                task.result()
+            return results
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def execute_node_with_scopes_async(
+        self, node: Node, scopes: Iterable[Scope]
+    ) -> Set[Scope]:
+        """
+        Executes a single node asynchronously within the given scopes.
+        The calls of all scopes share the `max_in_flight` bound.
+
+        Parameters
+        ----------
+        node : Node
+            The node to execute.
+        scopes : Iterable[Scope]
+            The scopes in which the node is executed.
+
+        Returns
+        -------
+        Set[Scope]
+            A set of scopes resulting from the node's execution.
+        """
+        counts: List[Tuple[Scope, int]] = []
+        call = self.get_node_call(node)
+        if self.result_store is not None:
+            node_call = call
+
+            async def call(**kwargs):
+                return self.store_result(await node_call(**kwargs))
+
+        def iter_calls():
+            for scope in scopes:
+                count = 0
+                scope_call = self.trace_call(node, scope, call)
+                for args in self.iter_args(node, scope):
+                    count += 1
+                    yield scope_call(**args)
+                counts.append((scope, count))
+
+        results = await self.gather_bounded(iter_calls(), self.dispatch_width(node))
+        new_scopes = set()
+        start = 0
+        for scope, count in counts:
+            new_scopes.update(
+                self.save_results(
+                    node,
+                    results[start : start + count],
+                    scope,
+                    self.root.results,
+                )
+            )
+            start += count
+        return new_scopes
+
     async def execute_node_with_scope_async(
         self, node: Node, scope: Scope
     ) -> Set[Scope]:
@@ -99,11 +388,7 @@ class AsyncExecutor(Executor):
         Set[Scope]
             A set of scopes resulting from the node's execution.
         """
-        call_args = self.resolve_args(node, scope)
-        results = await asyncio.gather(
-            *[self.call_node_async(node, **args) for args in call_args]
-        )
-        return self.save_results(node, list(results), scope)
+        return await self.execute_node_with_scopes_async(node, [scope])
 
     async def execute_node_async(self, node: Node) -> None:
         """
@@ -115,12 +400,227 @@ class AsyncExecutor(Executor):
             The node to execute.
         """
         scopes = self.get_call_scopes(node)
-        if len(scopes) == 0:
-            return
-        new_scopes = await asyncio.gather(
-            *[self.execute_node_with_scope_async(node, scope) for scope in scopes]
+        self.scope_map[node] = (
+            await self.execute_node_with_scopes_async(node, scopes) if scopes else set()
         )
-        self.scope_map[node] = set.union(*new_scopes)
+
+    async def execute_dataflow_async(
+        self, execute_node: Callable[[Node], Awaitable[None]]
+    ) -> None:
+        """
+        Executes the flow graph, starting every node as soon as its own predecessors have finished.
+
+        Parameters
+        ----------
+        execute_node : Callable[[Node], Awaitable[None]]
+            The coroutine function used to execute a single node.
+        """
+        counts = self.predecessor_counts()
+        running = {
+            asyncio.ensure_future(execute_node(node)): node
+            for node, count in zip(self.plan.nodes, counts)
+            if count == 0
+        }
+        try:
+            while running:
+                done, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    node = running.pop(task)
+                    task.result()
+                    for successor in self.release_successors(node, counts):
+                        running[asyncio.ensure_future(execute_node(successor))] = (
+                            successor
+                        )
+        finally:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+
+    async def stream_node_with_scope(
+        self,
+        node: Node,
+        scope: Scope,
+        call: Callable[..., Awaitable[Any]],
+        emit: Callable[[Scope], None],
+    ) -> None:
+        """
+        Executes a single node within a given scope, emitting every resulting scope as soon as it is produced.
+        The child scopes of a looped node are created when their call is dispatched so they keep the loop order.
+        Every call takes one of the `in_flight` slots of the node, shared by all its scopes,
+        before its arguments are created. When a call fails, the calls still running are cancelled and awaited.
+
+        Parameters
+        ----------
+        node : Node
+            The node to execute.
+        scope : Scope
+            The scope in which the node is executed.
+        call : Callable[..., Awaitable[Any]]
+            The coroutine function used to call the node with resolved arguments.
+        emit : Callable[[Scope], None]
+            Callback receiving every scope which holds a (not ignored) result of the node.
+        """
+        call = self.trace_call(node, scope, call)
+        call_args = self.iter_args(node, scope)
+        slots = self.in_flight.get(node)
+        if not node.loop_vars:
+            if slots is None:
+                result = await call(**next(call_args))
+            else:
+                async with slots:
+                    result = await call(**next(call_args))
+            for new_scope in self.save_results(
+                node, [result], scope, self.root.results, self.result_store
+            ):
+                emit(new_scope)
+            return
+
+        async def call_in_child(child: Scope, args: Dict[str, Any]) -> None:
+            try:
+                result = await call(**args)
+            finally:
+                if slots is not None:
+                    slots.release()
+            if self.save_result(
+                node, result, child, self.root.results, self.result_store
+            ):
+                emit(child)
+
+        running: Set[asyncio.Future] = set()
+        failed: List[asyncio.Future] = []
+
+        def finished(task: asyncio.Future) -> None:
+            running.discard(task)
+            if not task.cancelled() and task.exception() is not None:
+                failed.append(task)
+
+        sub = scope.birth()
+        try:
+            while not failed:
+                if slots is not None:
+                    await slots.acquire()
+                args = next(call_args, None)
+                if args is None or failed:
+                    if slots is not None:
+                        slots.release()
+                    break
+                task = asyncio.ensure_future(call_in_child(sub.birth(), args))
+                running.add(task)
+                task.add_done_callback(finished)
+            if running and not failed:
+                done, _ = await asyncio.wait(
+                    set(running), return_when=asyncio.FIRST_EXCEPTION
+                )
+                for task in done:
+                    task.result()
+            for task in failed:
+                task.result()
+        finally:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+
+    async def stream_node_with_scope_async(
+        self, node: Node, scope: Scope, emit: Callable[[Scope], None]
+    ) -> None:
+        """
+        Executes a single asynchronous node within a given scope in streaming mode.
+
+        Parameters
+        ----------
+        node : Node
+            The node to execute.
+        scope : Scope
+            The scope in which the node is executed.
+        emit : Callable[[Scope], None]
+            Callback receiving every scope which holds a (not ignored) result of the node.
+        """
+        await self.stream_node_with_scope(node, scope, self.get_node_call(node), emit)
+
+    async def execute_streaming_async(
+        self,
+        stream_node_with_scope: Callable[
+            [Node, Scope, Callable[[Scope], None]], Awaitable[None]
+        ],
+    ) -> None:
+        """
+        Executes the flow graph scope by scope.
+        A node is called in a scope as soon as the values of all its predecessors
+        are available to that scope, so looped children flow downstream without
+        waiting for their siblings. Scopes reused from a previous execution are emitted upfront.
+        The calls of every node are bounded by its dispatch width across all scopes at once.
+
+        Parameters
+        ----------
+        stream_node_with_scope : Callable[[Node, Scope, Callable[[Scope], None]], Awaitable[None]]
+            The coroutine function used to execute a single node within a scope.
+        """
+        depths = self.plan.depths
+        preds = self.plan.predecessors
+        drivers = self.plan.drivers
+        successors = self.flow_graph.succ
+        waiting: Dict[Node, Set[Scope]] = {node: set() for node in self.plan.nodes}
+        self.in_flight = {}
+        for node in self.plan.nodes:
+            width = self.dispatch_width(node)
+            if width is not None:
+                self.in_flight[node] = asyncio.Semaphore(width)
+        running: Set[asyncio.Future] = set()
+        reused = self.scope_map
+        self.scope_map = {node: set() for node in [*reused, *self.plan.nodes]}
+
+        def resolvable(node: Node, scope: Scope) -> bool:
+            call_depth = depths[drivers[node]]
+            for pred in preds[node]:
+                ancestor = scope
+                for _ in range(call_depth - depths[pred]):
+                    ancestor = ancestor.parent
+                if ancestor not in self.scope_map[pred]:
+                    return False
+            return True
+
+        def start(node: Node, scope: Scope) -> None:
+            emit_node = partial(emit, node)
+            running.add(
+                asyncio.ensure_future(stream_node_with_scope(node, scope, emit_node))
+            )
+
+        def emit(node: Node, scope: Scope) -> None:
+            self.scope_map[node].add(scope)
+            for successor in successors[node]:
+                if successor not in waiting:
+                    continue
+                if drivers[successor] is node:
+                    candidates = {scope}
+                    waiting[successor].add(scope)
+                else:
+                    candidates = set(waiting[successor])
+                for candidate in candidates:
+                    if resolvable(successor, candidate):
+                        waiting[successor].discard(candidate)
+                        start(successor, candidate)
+
+        for node in self.plan.nodes:
+            if not preds[node]:
+                start(node, self.root)
+        for node, scopes in reused.items():
+            for scope in scopes:
+                emit(node, scope)
+
+        try:
+            while running:
+                done, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    running.discard(task)
+                    task.result()
+        finally:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
 
     async def execute_async(self, *target_nodes: Sequence[Node]) -> Scope:
         """
@@ -138,7 +638,12 @@ class AsyncExecutor(Executor):
         """
         self.setup(*target_nodes)
 
-        for tasks in self.batched_topological_order():
-            await asyncio.gather(*[self.execute_node_async(node) for node in tasks])
+        if self.streaming:
+            await self.execute_streaming_async(self.stream_node_with_scope_async)
+        elif self.dataflow:
+            await self.execute_dataflow_async(self.execute_node_async)
+        else:
+            for tasks in self.batched_topological_order():
+                await asyncio.gather(*[self.execute_node_async(node) for node in tasks])
 
         return self.root
@@ -0,0 +1,75 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into a single call, whose result is shared by every caller.
+
+    Once the call finished, the next call with the same key starts a new one, so only calls
+    overlapping in time are deduplicated. The shared call is cancelled when every caller is.
+
+    Attributes
+    ----------
+    flights : Dict[Hashable, List]
+        The running calls per key, with the number of callers waiting on them.
+    """
+
+    def __init__(self) -> None:
+        """
+        Constructs a SingleFlight without running calls.
+        """
+        self.flights: Dict[Hashable, List] = {}
+
+    async def call(
+        self, key: Hashable, call: Callable[..., Awaitable[Any]], **kwargs
+    ) -> Any:
+        """
+        Awaits the running call for a key, or starts it if there is none.
+
+        Parameters
+        ----------
+        key : Hashable
+            The key identifying equal calls.
+        call : Callable[..., Awaitable[Any]]
+            The coroutine function to call.
+        **kwargs : Any
+            Keyword arguments for the call.
+
+        Returns
+        -------
+        Any
+            The result of the shared call.
+        """
+        flight = self.flights.get(key)
+        if flight is None:
+            flight = [asyncio.ensure_future(call(**kwargs)), 0]
+            self.flights[key] = flight
+
+            def land(_: asyncio.Future) -> None:
+                if self.flights.get(key) is flight:
+                    del self.flights[key]
+
+            flight[0].add_done_callback(land)
+
+        task = flight[0]
+        flight[1] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done() and flight[1] == 1:
+                task.cancel()
+            raise
+        finally:
+            flight[1] -= 1
+
+    def __len__(self) -> int:
+        """
+        Returns the number of running calls.
+
+        Returns
+        -------
+        int
+            The number of distinct keys being called.
+        """
+        return len(self.flights)
@@ -1,9 +1,25 @@
-from typing import Dict, Any, List, Sequence, Set, Iterator
+from typing import (
+    Dict,
+    Any,
+    List,
+    Sequence,
+    Set,
+    Iterator,
+    Optional,
+    FrozenSet,
+    Tuple,
+    Iterable,
+    Callable,
+)
 from networkx import MultiDiGraph
 
 from deppy.node import Node
-from deppy.scope import Scope
+from deppy.scope import Scope, ResultIndex
 from deppy.ignore_result import IgnoreResult
+from deppy.store import ResultStore, resolve
+from .plan import ExecutionPlan
+from .limits import TokenBucket
+from .tracer import Tracer
 
 
 class Executor:
@@ -18,11 +34,49 @@ class Executor:
         Maps nodes to their corresponding scopes.
     root : Scope
         The root scope for the execution.
+    plan : ExecutionPlan
+        The compiled plan of the current execution.
     flow_graph : MultiDiGraph
         The directed acyclic graph representing the dependency flow of execution.
+        Assigning a graph replaces the plan by one compiled for it when it is first used.
+    dataflow : bool
+        Whether nodes are started as soon as their own predecessors have finished,
+        instead of waiting for the whole topological level.
+    max_in_flight : Optional[int]
+        Maximum number of calls dispatched at once, or None if no limit is set.
+        Loop combinations are only expanded when they are dispatched.
+    evict_results : bool
+        Whether the results of a node are dropped once every node consuming them has finished.
+        Target nodes, or nodes without successors when executing all nodes, are kept.
+    result_store : Optional[ResultStore]
+        The store deciding how results are kept in the scopes, or None to keep them as live objects.
+    tracer : Optional[Tracer]
+        Records the timing of every call of an execution, or None if calls are not traced.
+    consumers : Dict[Node, int]
+        The number of unfinished successors of every node in the current execution, when evicting results.
+    keep : FrozenSet[Node]
+        The nodes whose results are never evicted in the current execution:
+        the target nodes, or else the nodes without successors, and the output nodes.
+    buckets : Dict[Node, TokenBucket]
+        The token buckets of rate limited nodes, kept across executions.
+    fingerprints : Dict[Node, Tuple]
+        The function and inputs of every node of the current plan, to detect changed nodes between executions.
+    result_listener : Optional[Callable[[Node, Scope, bool], None]]
+        Called with the node, the scope and whether the result is ignored for every saved result.
+    previous : Optional[Tuple[Scope, Dict[Node, Tuple], FrozenSet[Node]]]
+        The root scope and fingerprints of a completed execution whose results the next execution reuses,
+        together with the nodes to recompute regardless. Consumed by `setup`.
     """
 
-    def __init__(self, deppy) -> None:
+    def __init__(
+        self,
+        deppy,
+        dataflow: Optional[bool] = False,
+        max_in_flight: Optional[int] = 1024,
+        evict_results: Optional[bool] = False,
+        result_store: Optional[ResultStore] = None,
+        tracer: Optional[Tracer] = None,
+    ) -> None:
         """
         Constructs an Executor instance.
 
@@ -30,35 +84,255 @@ class Executor:
         ----------
         deppy : Any
             The deppy instance.
+        dataflow : Optional[bool], optional
+            Flag to schedule every node as soon as its own predecessors have finished (default is False).
+        max_in_flight : Optional[int], optional
+            Maximum number of calls dispatched at once (default is 1024, None means unlimited).
+        evict_results : Optional[bool], optional
+            Flag to drop the results of intermediate nodes once all their successors have finished (default is False).
+        result_store : Optional[ResultStore], optional
+            Store keeping the results, e.g. a `SpillStore` writing large results to disk (default is None).
+        tracer : Optional[Tracer], optional
+            Tracer recording the timing of every call (default is None).
         """
         self.deppy = deppy
         self.scope_map: Dict[Node, Set[Scope]] = {}
         self.root: Scope = Scope()
-        self.flow_graph: MultiDiGraph = MultiDiGraph()
+        self._flow_graph: MultiDiGraph = MultiDiGraph()
+        self._plan: Optional[ExecutionPlan] = None
+        self.dataflow = dataflow
+        self.max_in_flight = max_in_flight
+        self.evict_results = evict_results
+        self.result_store = result_store
+        self.tracer = tracer
+        self.consumers: Dict[Node, int] = {}
+        self.keep: FrozenSet[Node] = frozenset()
+        self.buckets: Dict[Node, TokenBucket] = {}
+        self.fingerprints: Dict[Node, Tuple] = {}
+        self.result_listener: Optional[Callable[[Node, Scope, bool], None]] = None
+        self.previous: Optional[Tuple[Scope, Dict[Node, Tuple], FrozenSet[Node]]] = None
 
-    def batched_topological_order(self) -> Iterator[Set[Node]]:
+    @property
+    def plan(self) -> ExecutionPlan:
+        """
+        The compiled plan of the current execution.
+        A plan for an assigned flow graph is only compiled once it is used,
+        so the nodes of the graph can still be changed after assigning it.
+
+        Returns
+        -------
+        ExecutionPlan
+            The plan of the current execution.
+        """
+        if self._plan is None:
+            self._plan = ExecutionPlan(self._flow_graph)
+        return self._plan
+
+    @plan.setter
+    def plan(self, plan: ExecutionPlan) -> None:
+        """
+        Sets the plan of the current execution.
+
+        Parameters
+        ----------
+        plan : ExecutionPlan
+            The plan to execute.
+        """
+        self._plan = plan
+        self._flow_graph = plan.flow_graph
+
+    @property
+    def flow_graph(self) -> MultiDiGraph:
+        """
+        The directed acyclic graph representing the dependency flow of execution.
+
+        Returns
+        -------
+        MultiDiGraph
+            The flow graph of the current plan.
+        """
+        return self._flow_graph
+
+    @flow_graph.setter
+    def flow_graph(self, graph: MultiDiGraph) -> None:
+        """
+        Sets a graph to execute as a whole, its plan is compiled when it is first used.
+
+        Parameters
+        ----------
+        graph : MultiDiGraph
+            The flow graph to execute.
+        """
+        self._flow_graph = graph
+        self._plan = None
+
+    def batched_topological_order(self) -> Iterator[FrozenSet[Node]]:
         """
         Yields sets of nodes in topological order for parallel processing.
+        A level is marked as finished once the next one is requested, so the caller must have executed it by then.
 
         Returns
         -------
-        Iterator[Set[Node]]
+        Iterator[FrozenSet[Node]]
             An iterator yielding sets of nodes that can be processed in parallel.
         """
-        in_degree = {node: self.flow_graph.in_degree(node) for node in self.flow_graph}
+        for level in self.plan.levels:
+            yield level
+            for node in level:
+                self.finish_node(node)
 
-        while in_degree:
-            ready_nodes = {node for node, degree in in_degree.items() if degree == 0}
+    def predecessor_counts(self) -> List[int]:
+        """
+        Counts the distinct predecessors of every node in the flow graph.
 
-            yield ready_nodes
+        Returns
+        -------
+        List[int]
+            The number of predecessors every node waits on, indexed by plan position.
+        """
+        return list(self.plan.predecessor_counts)
 
-            for node in ready_nodes:
-                del in_degree[node]
-                for successor in self.flow_graph.successors(node):
-                    in_degree[successor] -= 1
+    def release_successors(self, node: Node, counts: List[int]) -> Set[Node]:
+        """
+        Marks a node as finished and returns the successors which became ready.
+
+        Parameters
+        ----------
+        node : Node
+            The node which finished executing.
+        counts : List[int]
+            The remaining predecessor counts, updated in place.
+
+        Returns
+        -------
+        Set[Node]
+            The successors whose predecessors have all finished.
+        """
+        self.finish_node(node)
+        ready = set()
+        for successor in self.plan.successor_indices[self.plan.index[node]]:
+            counts[successor] -= 1
+            if counts[successor] == 0:
+                ready.add(self.plan.nodes[successor])
+        return ready
+
+    def finish_node(self, node: Node) -> None:
+        """
+        Marks a node as finished, evicting the results of its predecessors which have no other consumers left.
+
+        Parameters
+        ----------
+        node : Node
+            The node which finished executing.
+        """
+        if not self.evict_results:
+            return
+        for pred in self.plan.predecessors[node]:
+            self.consumers[pred] -= 1
+            if self.consumers[pred] == 0 and pred not in self.keep:
+                self.evict(pred)
+
+    def evict(self, node: Node) -> None:
+        """
+        Drops the results of a node from the scope tree. The child scopes it created are kept for its successors.
+        The node is left out of the fingerprints, so an incremental execution recomputes it.
+
+        Parameters
+        ----------
+        node : Node
+            The node whose results are dropped.
+        """
+        index = self.root.results
+        for scopes in (index.kept, index.ignored):
+            for scope in scopes.get(node, ()):
+                dict.pop(scope, node, None)
+            scopes[node] = []
+        self.scope_map[node] = set()
+        self.fingerprints.pop(node, None)
+
+    def get_bucket(self, node: Node) -> Optional[TokenBucket]:
+        """
+        Returns the token bucket enforcing the rate limit of a node.
+
+        Parameters
+        ----------
+        node : Node
+            The node to get the bucket for.
+
+        Returns
+        -------
+        Optional[TokenBucket]
+            The token bucket, or None if the node has no rate limit.
+        """
+        if node.rate_limit is None:
+            return None
+        bucket = self.buckets.get(node)
+        if bucket is None:
+            bucket = self.buckets[node] = TokenBucket(node.rate_limit)
+        return bucket
+
+    def store_result(self, result: Any) -> Any:
+        """
+        Passes a result through the result store as soon as it is returned,
+        so results collected before they are saved are not all held in memory.
+
+        Parameters
+        ----------
+        result : Any
+            The result of a call.
+
+        Returns
+        -------
+        Any
+            The value to save, either the result itself or a `StoredResult`.
+        """
+        if self.result_store is None or isinstance(result, IgnoreResult):
+            return result
+        return self.result_store.put(result)
 
     @staticmethod
-    def save_results(node: Node, results: List[Any], scope: Scope) -> Set[Scope]:
+    def save_result(
+        node: Node,
+        result: Any,
+        scope: Scope,
+        index: Optional[ResultIndex] = None,
+        store: Optional[ResultStore] = None,
+    ) -> bool:
+        """
+        Saves a single result of a node into a scope.
+
+        Parameters
+        ----------
+        node : Node
+            The node whose result is being saved.
+        result : Any
+            The result to save.
+        scope : Scope
+            The scope where the result should be saved.
+        index : Optional[ResultIndex], optional
+            The result index to register the scope in (default is None).
+        store : Optional[ResultStore], optional
+            The result store to pass the result through (default is None).
+
+        Returns
+        -------
+        bool
+            Whether the result is not ignored.
+        """
+        ignored = isinstance(result, IgnoreResult)
+        scope[node] = result if ignored or store is None else store.put(result)
+        if index is not None:
+            index.add(node, scope, ignored)
+        return not ignored
+
+    @staticmethod
+    def save_results(
+        node: Node,
+        results: List[Any],
+        scope: Scope,
+        index: Optional[ResultIndex] = None,
+        store: Optional[ResultStore] = None,
+    ) -> Set[Scope]:
         """
         Saves the results of a node execution into the corresponding scopes.
         Also generating new scopes for looped nodes.
@@ -71,6 +345,10 @@ class Executor:
             The results to save.
         scope : Scope
             The scope where results should be saved.
+        index : Optional[ResultIndex], optional
+            The result index to register the scopes in (default is None).
+        store : Optional[ResultStore], optional
+            The result store to pass the results through (default is None).
 
         Returns
         -------
@@ -79,19 +357,30 @@ class Executor:
         """
         scopes = set()
         if not node.loop_vars:
-            scope[node] = results[0]
-            if not isinstance(results[0], IgnoreResult):
+            if Executor.save_result(node, results[0], scope, index, store):
                 scopes.add(scope)
             return scopes
         else:
             sub = scope.birth()
             for result in results:
                 child = sub.birth()
-                child[node] = result
-                if not isinstance(result, IgnoreResult):
+                if Executor.save_result(node, result, child, index, store):
                     scopes.add(child)
         return scopes
 
+    def scope_depths(self) -> Dict[Node, int]:
+        """
+        Returns the depth of the scopes in which every node stores its results.
+        A node is called in the scopes of its deepest predecessor, looped nodes
+        store their results two levels below the scope they are called in.
+
+        Returns
+        -------
+        Dict[Node, int]
+            A mapping of each node to the depth of its result scopes.
+        """
+        return dict(self.plan.depths)
+
     def create_flow_graph(self, *target_nodes: Sequence[Node]) -> MultiDiGraph:
         """
         Creates a subgraph containing only the relevant nodes for the target nodes.
@@ -106,34 +395,175 @@ class Executor:
         MultiDiGraph
             The subgraph containing only relevant nodes.
         """
-        flow_graph = self.deppy.graph.copy()
-        if len(target_nodes) == 0:
-            return flow_graph
-
-        relevant_nodes = set()
-        new_nodes = set(target_nodes)
-        while new_nodes:
-            relevant_nodes.update(new_nodes)
-            newer = set()
-            for node in new_nodes:
-                newer.update(flow_graph.predecessors(node))
-            new_nodes = newer
-        irrelevant_nodes = set(flow_graph) - relevant_nodes
-        flow_graph.remove_nodes_from(irrelevant_nodes)
-        return flow_graph
+        return ExecutionPlan.create_flow_graph(self.deppy.graph, target_nodes)
 
     def setup(self, *target_nodes: Sequence[Node]) -> None:
         """
-        Sets up the flow graph and root scope for execution.
+        Sets up the execution plan and root scope for execution.
+        The plan is compiled by the deppy instance and reused until its graph changes,
+        a deppy instance without plans only needs a `graph` and gets a new plan every time.
+        The root scope gets a result index in which every node of the plan is registered,
+        reporting every saved result to the result listener if one is set.
+        When a previous execution is given, its results are reused and only the changed nodes are scheduled.
 
         Parameters
         ----------
         target_nodes : Sequence[Node]
             The target nodes for the execution setup.
         """
-        self.flow_graph = self.create_flow_graph(*target_nodes)
+        compile_plan = getattr(self.deppy, "plan", None)
+        if compile_plan is None:
+            self.plan = ExecutionPlan(self.deppy.graph, target_nodes)
+        else:
+            self.plan = compile_plan(*target_nodes)
+        self.fingerprints = {node: self.fingerprint(node) for node in self.plan.nodes}
         self.root = Scope()
+        self.root.results = ResultIndex()
+        for node in self.plan.nodes:
+            self.root.results.register(node)
+        self.root.results.listener = self.result_listener
         self.scope_map = {}
+        if self.result_store is not None:
+            self.result_store.reset()
+        if self.tracer is not None:
+            self.tracer.begin(self.plan)
+        if self.evict_results:
+            graph_builder = getattr(self.deppy, "graph_builder", None)
+            outputs = () if graph_builder is None else graph_builder.outputs
+            self.keep = (
+                frozenset(target_nodes)
+                or frozenset(
+                    node
+                    for node in self.plan.nodes
+                    if not self.plan.successor_indices[self.plan.index[node]]
+                )
+            ) | frozenset(node for node in outputs if node in self.plan.index)
+
+        previous, self.previous = self.previous, None
+        if previous is not None:
+            self.reuse_results(*previous)
+        if self.evict_results:
+            self.consumers = {}
+            for node in self.plan.nodes:
+                for pred in self.plan.predecessors[node]:
+                    self.consumers[pred] = self.consumers.get(pred, 0) + 1
+
+    def fingerprint(self, node: Node) -> Tuple:
+        """
+        Describes what the results of a node depend on, besides the results of its predecessors.
+
+        Parameters
+        ----------
+        node : Node
+            The node to describe.
+
+        Returns
+        -------
+        Tuple
+            The function, loop strategy and inputs of the node.
+        """
+        return (
+            node.func,
+            node.loop_strategy,
+            self.plan.arguments[node],
+            self.plan.loop_keys[node],
+        )
+
+    def reuse_results(
+        self,
+        previous_root: Scope,
+        previous_fingerprints: Dict[Node, Tuple],
+        changed: Iterable[Node] = (),
+    ) -> None:
+        """
+        Copies the results of the unchanged nodes from a previous execution, and restricts the plan to the others.
+        A node is recomputed if it is changed, its fingerprint differs, or one of its predecessors is recomputed.
+        Reused nodes only depend on reused nodes, so their part of the scope tree is laid out as before.
+
+        Parameters
+        ----------
+        previous_root : Scope
+            The root scope of the previous execution.
+        previous_fingerprints : Dict[Node, Tuple]
+            The fingerprints of the nodes of the previous execution.
+        changed : Iterable[Node], optional
+            Nodes to recompute even though their fingerprint is unchanged (default is none).
+        """
+        recompute = set(changed)
+        for node in self.plan.nodes:
+            if (
+                node in recompute
+                or previous_fingerprints.get(node) != self.fingerprints[node]
+                or any(pred in recompute for pred in self.plan.predecessors[node])
+            ):
+                recompute.add(node)
+
+        reused = frozenset(self.plan.nodes) - recompute
+        if not reused:
+            return
+        self.scope_map = {node: set() for node in reused}
+        self.copy_results(previous_root, self.root, reused)
+        self.plan = self.plan.restrict(frozenset(recompute))
+
+    def copy_results(
+        self, source: Scope, target: Scope, nodes: FrozenSet[Node]
+    ) -> None:
+        """
+        Copies the results of some nodes from a scope and its descendants into another scope.
+        Child scopes created by nodes which are not copied are left out.
+
+        Parameters
+        ----------
+        source : Scope
+            The scope to copy from.
+        target : Scope
+            The empty scope to copy into.
+        nodes : FrozenSet[Node]
+            The nodes whose results are copied.
+        """
+        index = self.root.results
+        stack = [(source, target)]
+        while stack:
+            source, target = stack.pop()
+            for key, value in dict.items(source):
+                if key in nodes:
+                    target[key] = value
+                    ignored = isinstance(value, IgnoreResult)
+                    index.add(key, target, ignored)
+                    if not ignored:
+                        self.scope_map[key].add(target)
+            for sub in source.children:
+                if self.scope_owner(sub) not in nodes:
+                    continue
+                target_sub = target.birth()
+                for child in sub.children:
+                    stack.append((child, target_sub.birth()))
+
+    def scope_owner(self, sub: Scope) -> Optional[Node]:
+        """
+        Finds the looped node whose results are stored in the children of a scope.
+
+        Parameters
+        ----------
+        sub : Scope
+            A scope created for the calls of a looped node.
+
+        Returns
+        -------
+        Optional[Node]
+            The looped node, or None if it made no calls or is not part of the plan.
+        """
+        if not sub.children:
+            return None
+        child = sub.children[0]
+        for key in dict.keys(child):
+            if (
+                isinstance(key, Node)
+                and key.loop_vars
+                and self.plan.depths.get(key) == child.depth
+            ):
+                return key
+        return None
 
     def get_call_scopes(self, node: Node) -> Set[Scope]:
         """
@@ -149,19 +579,69 @@ class Executor:
         Set[Scope]
             The set of scopes to use for the node's execution.
         """
-        preds = list(self.flow_graph.predecessors(node))
+        preds = self.plan.predecessors[node]
         if not preds:
             return {self.root}
-        all_scopes = [self.scope_map[pred] for pred in preds]
-        if any(len(scope) == 0 for scope in all_scopes):
+        if any(len(self.scope_map[pred]) == 0 for pred in preds):
             return set()
-        scopes = all_scopes.pop()
-        for iter_scopes in all_scopes:
-            cur_scope = next(iter(scopes))
-            qualifier_scope = next(iter(iter_scopes))
-            if len(cur_scope.path) < len(qualifier_scope.path):  # pragma: no cover
-                scopes = iter_scopes
-        return scopes
+        return self.scope_map[self.plan.drivers[node]]
+
+    def lookup_args(self, node: Node, scope: Scope) -> Dict[str, Any]:
+        """
+        Looks up the results of the predecessors of a node, as seen from the scope.
+        Every predecessor stores its results at a known depth, so the ancestors holding them
+        are found in a single walk up the tree instead of one recursive lookup per argument.
+
+        Parameters
+        ----------
+        node : Node
+            The node whose arguments are being looked up.
+        scope : Scope
+            The scope to look up arguments from.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The predecessor results per input name.
+        """
+        args = {}
+        holder = scope
+        for pred, key, depth in self.plan.lookups[node]:
+            while holder.depth > depth:
+                holder = holder.parent
+            value = dict.get(holder, pred, Scope.not_found)
+            args[key] = scope[pred] if value is Scope.not_found else resolve(value)
+        return args
+
+    def iter_args(self, node: Node, scope: Scope) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yields the arguments for every call of a node within the scope.
+        Loop combinations are produced one at a time, so they are never all held in memory.
+
+        Parameters
+        ----------
+        node : Node
+            The node whose arguments are being resolved.
+        scope : Scope
+            The scope to resolve arguments against.
+
+        Returns
+        -------
+        Iterator[Dict[str, Any]]
+            An iterator of resolved argument dictionaries.
+        """
+        resolved_args = self.lookup_args(node, scope)
+
+        loop_keys = self.plan.loop_keys[node]
+        if not loop_keys:
+            yield resolved_args
+            return
+
+        loop_values = (resolved_args[key] for key in loop_keys)
+        for combination in node.loop_strategy(*loop_values):
+            args = resolved_args.copy()
+            args.update(zip(loop_keys, combination))
+            yield args
 
     def resolve_args(self, node: Node, scope: Scope) -> List[Dict[str, Any]]:
         """
@@ -179,17 +659,4 @@ class Executor:
         List[Dict[str, Any]]
             A list of resolved argument dictionaries.
         """
-        resolved_args = {
-            key: scope[pred]
-            for pred, _, key in self.flow_graph.in_edges(node, keys=True)
-        }
-
-        if node.loop_vars:
-            loop_keys = [key for key, _ in node.loop_vars]
-            loop_values = (resolved_args[key] for key in loop_keys)
-            return [
-                {**resolved_args, **dict(zip(loop_keys, combination))}
-                for combination in node.loop_strategy(*loop_values)
-            ]
-
-        return [resolved_args]
+        return list(self.iter_args(node, scope))
@@ -1,10 +1,15 @@
-from typing import Sequence, Optional
+from typing import Sequence, Optional, Callable, Awaitable, Any
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from functools import partial
 from deppy.node import Node
 from deppy.scope import Scope
+from deppy.store import ResultStore
 import asyncio
 
 from .sync_executor import SyncExecutor
 from .async_executor import AsyncExecutor
+from .process import submit_to_process
+from .tracer import Tracer, current_span
 
 
 class HybridExecutor(AsyncExecutor, SyncExecutor):
@@ -21,6 +26,17 @@ class HybridExecutor(AsyncExecutor, SyncExecutor):
         deppy,
         max_thread_workers: Optional[int] = None,
         max_concurrent_tasks: Optional[int] = None,
+        dataflow: Optional[bool] = False,
+        streaming: Optional[bool] = False,
+        max_in_flight: Optional[int] = 1024,
+        sync_to_thread: Optional[bool] = None,
+        max_process_workers: Optional[int] = None,
+        thread_pool: Optional[ThreadPoolExecutor] = None,
+        process_pool: Optional[ProcessPoolExecutor] = None,
+        evict_results: Optional[bool] = False,
+        result_store: Optional[ResultStore] = None,
+        shared_memory_threshold: Optional[int] = None,
+        tracer: Optional[Tracer] = None,
     ) -> None:
         """
         Constructs a HybridExecutor instance.
@@ -30,19 +46,168 @@ class HybridExecutor(AsyncExecutor, SyncExecutor):
         deppy : Any
             The main dependency manager instance.
         max_thread_workers : Optional[int], optional
-            Maximum number of threads for synchronous execution (default is None, meaning unlimited).
+            Maximum number of threads of a thread pool owned by the executor
+            (default is None, which uses the shared default thread pool).
         max_concurrent_tasks : Optional[int], optional
             Maximum number of concurrent asynchronous tasks (default is None, meaning unlimited).
+        dataflow : Optional[bool], optional
+            Flag to schedule every node as soon as its own predecessors have finished (default is False).
+        streaming : Optional[bool], optional
+            Flag to execute successors per scope as soon as the scope is produced (default is False).
+        max_in_flight : Optional[int], optional
+            Maximum number of calls dispatched at once (default is 1024, None means unlimited).
+        sync_to_thread : Optional[bool], optional
+            Flag to run every sync node on the thread pool, concurrently with the async nodes
+            (default is None, which enables it when the GIL is disabled).
+        max_process_workers : Optional[int], optional
+            Maximum number of worker processes (default is None, which uses the number of processors).
+        thread_pool : Optional[ThreadPoolExecutor], optional
+            Thread pool to run the nodes on, which is left running on shutdown (default is None).
+        process_pool : Optional[ProcessPoolExecutor], optional
+            Process pool to run the nodes on, which is left running on shutdown (default is None).
+        evict_results : Optional[bool], optional
+            Flag to drop the results of intermediate nodes once all their successors have finished (default is False).
+        result_store : Optional[ResultStore], optional
+            Store keeping the results, e.g. a `SpillStore` writing large results to disk (default is None).
+        shared_memory_threshold : Optional[int], optional
+            Size in bytes from which buffers, like bytes or numpy arrays, are passed to and from
+            worker processes through shared memory (default is None, meaning they are pickled).
+        tracer : Optional[Tracer], optional
+            Tracer recording the timing of every call (default is None).
         """
         super().__init__(
             deppy,
             max_thread_workers=max_thread_workers,
             max_concurrent_tasks=max_concurrent_tasks,
+            dataflow=dataflow,
+            streaming=streaming,
+            max_in_flight=max_in_flight,
+            max_process_workers=max_process_workers,
+            sync_to_thread=sync_to_thread,
+            thread_pool=thread_pool,
+            process_pool=process_pool,
+            evict_results=evict_results,
+            result_store=result_store,
+            shared_memory_threshold=shared_memory_threshold,
+            tracer=tracer,
         )
 
+    def get_node_call(self, node: Node) -> Callable[..., Awaitable[Any]]:
+        """
+        Returns the coroutine function used to call a node with resolved arguments, whatever the kind of the node.
+        Threaded and process nodes are run on their pool without blocking the event loop, other sync nodes are called inline.
+
+        Parameters
+        ----------
+        node : Node
+            The node to call.
+
+        Returns
+        -------
+        Callable[..., Awaitable[Any]]
+            The coroutine function calling the node, respecting its limits and coalescing equal calls.
+        """
+        if node.is_async:
+            return super().get_node_call(node)
+
+        if node.to_process:
+
+            def call(**kwargs):
+                future = submit_to_process(
+                    self.get_process_pool(), node, 0.0, kwargs, self.shared_buffers
+                )
+                if self.tracer is not None:
+                    self.tracer.run_in_process(None, future)
+                return asyncio.wrap_future(future)
+
+        elif node.to_thread or self.sync_to_thread:
+            loop = asyncio.get_running_loop()
+
+            def call(**kwargs):
+                if self.tracer is None:
+                    return loop.run_in_executor(
+                        self.thread_pool, partial(node.call_sync, **kwargs)
+                    )
+                return loop.run_in_executor(
+                    self.thread_pool,
+                    partial(self.tracer.run, current_span(), node.call_sync, **kwargs),
+                )
+
+        else:
+
+            async def call(**kwargs):
+                if self.tracer is None:
+                    return node.call_sync(**kwargs)
+                return self.tracer.run(None, node.call_sync, **kwargs)
+
+        return self.coalesce_call(node, self.limit_call(node, call))
+
+    def runs_on_loop(self, node: Node) -> bool:
+        """
+        Determines whether a node is executed through the event loop, rather than inline by the sync executor.
+        Threaded and process nodes are, so they run at the same time as the async nodes,
+        and so are limited nodes, so waiting for their limits does not block the loop.
+
+        Parameters
+        ----------
+        node : Node
+            The node to check.
+
+        Returns
+        -------
+        bool
+            True if the node is asynchronous, threaded, runs in a process or is limited, False otherwise.
+        """
+        return (
+            node.is_async
+            or node.to_thread
+            or node.to_process
+            or self.sync_to_thread
+            or node.is_limited
+        )
+
+    async def stream_node_with_scope_hybrid(
+        self, node: Node, scope: Scope, emit: Callable[[Scope], None]
+    ) -> None:
+        """
+        Executes a single node within a given scope in streaming mode, whatever the kind of the node.
+        Threaded nodes are run on the thread pool without blocking the event loop.
+
+        Parameters
+        ----------
+        node : Node
+            The node to execute.
+        scope : Scope
+            The scope in which the node is executed.
+        emit : Callable[[Scope], None]
+            Callback receiving every scope which holds a (not ignored) result of the node.
+        """
+        if self.runs_on_loop(node):
+            await self.stream_node_with_scope(
+                node, scope, self.get_node_call(node), emit
+            )
+        else:
+            for new_scope in self.execute_node_with_scope_sync(node, scope):
+                emit(new_scope)
+
+    async def execute_node_hybrid(self, node: Node) -> None:
+        """
+        Executes a single node, awaiting it if it runs on the event loop and running it inline otherwise.
+
+        Parameters
+        ----------
+        node : Node
+            The node to execute.
+        """
+        if self.runs_on_loop(node):
+            await self.execute_node_async(node)
+        else:
+            self.execute_nodes_sync({node})
+
     async def execute_hybrid(self, *target_nodes: Sequence[Node]) -> Scope:
         """
         Executes the dependency graph, handling synchronous and asynchronous nodes appropriately.
+        Async and threaded nodes of a level run at the same time, other sync nodes run inline afterwards.
 
         Parameters
         ----------
@@ -56,13 +221,20 @@ class HybridExecutor(AsyncExecutor, SyncExecutor):
         """
         self.setup(*target_nodes)
 
+        if self.streaming:
+            await self.execute_streaming_async(self.stream_node_with_scope_hybrid)
+            return self.root
+        if self.dataflow:
+            await self.execute_dataflow_async(self.execute_node_hybrid)
+            return self.root
+
         for tasks in self.batched_topological_order():
-            async_nodes = {node for node in tasks if node.is_async}
-            sync_nodes = {node for node in tasks if not node.is_async}
+            loop_nodes = {node for node in tasks if self.runs_on_loop(node)}
+            sync_nodes = tasks - loop_nodes
 
-            if async_nodes:
+            if loop_nodes:
                 await asyncio.gather(
-                    *[self.execute_node_async(node) for node in async_nodes]
+                    *[self.execute_node_async(node) for node in loop_nodes]
                 )
 
             self.execute_nodes_sync(sync_nodes)
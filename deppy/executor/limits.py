@@ -0,0 +1,117 @@
+import asyncio
+import time
+from typing import Optional
+
+from deppy.node import RateLimit
+
+
+class TokenBucket:
+    """
+    Token bucket enforcing a rate limit, where every call takes one token.
+    Calls are never refused: a call arriving at an empty bucket reserves a future token and is told how long to wait for it.
+
+    Attributes
+    ----------
+    rate : float
+        The number of tokens added per second.
+    capacity : int
+        The maximum number of tokens in the bucket.
+    tokens : float
+        The current number of tokens, negative when future tokens are reserved.
+    updated : float
+        The monotonic time the tokens were last updated.
+    """
+
+    def __init__(self, rate_limit: RateLimit) -> None:
+        """
+        Constructs a full TokenBucket.
+
+        Parameters
+        ----------
+        rate_limit : RateLimit
+            The rate limit to enforce.
+        """
+        self.rate = rate_limit.rate
+        self.capacity = rate_limit.burst
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+
+    def reserve(self) -> float:
+        """
+        Takes a token from the bucket.
+
+        Returns
+        -------
+        float
+            The number of seconds to wait before the token may be used.
+        """
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def delay(self) -> float:
+        """
+        Returns how long a call would have to wait for a token, without taking it.
+
+        Returns
+        -------
+        float
+            The number of seconds until a token is available.
+        """
+        elapsed = time.monotonic() - self.updated
+        tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        return 0.0 if tokens >= 1 else (1 - tokens) / self.rate
+
+
+class NodeLimiter:
+    """
+    Asynchronous context manager enforcing the concurrency cap and rate limit of a node.
+
+    Attributes
+    ----------
+    semaphore : Optional[asyncio.Semaphore]
+        Semaphore capping the concurrent calls, or None if no cap is set.
+    bucket : Optional[TokenBucket]
+        Token bucket limiting the rate of calls, or None if no limit is set.
+    """
+
+    def __init__(
+        self, max_concurrency: Optional[int], bucket: Optional[TokenBucket]
+    ) -> None:
+        """
+        Constructs a NodeLimiter.
+
+        Parameters
+        ----------
+        max_concurrency : Optional[int]
+            Maximum number of concurrent calls, or None if no cap is set.
+        bucket : Optional[TokenBucket]
+            Token bucket limiting the rate of calls, or None if no limit is set.
+        """
+        self.semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        self.bucket = bucket
+
+    async def __aenter__(self) -> None:
+        """
+        Waits for a free call slot and, once holding it, for a token.
+        """
+        if self.semaphore is not None:
+            await self.semaphore.acquire()
+        if self.bucket is not None:
+            delay = self.bucket.reserve()
+            if delay:
+                try:
+                    await asyncio.sleep(delay)
+                except BaseException:
+                    if self.semaphore is not None:
+                        self.semaphore.release()
+                    raise
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        """
+        Releases the call slot.
+        """
+        if self.semaphore is not None:
+            self.semaphore.release()
@@ -0,0 +1,187 @@
+import copy
+from typing import AbstractSet, Dict, FrozenSet, List, Sequence, Tuple
+from networkx import MultiDiGraph
+
+from deppy.node import Node
+
+
+class ExecutionPlan:
+    """
+    A compiled, reusable description of how to execute (part of) a dependency graph.
+
+    Everything the executors need which only depends on the graph structure is
+    computed once, so executing the same graph again only pays for the node calls.
+
+    Attributes
+    ----------
+    flow_graph : MultiDiGraph
+        The subgraph containing only the nodes needed for the target nodes.
+    nodes : List[Node]
+        The nodes of the flow graph in topological order.
+    index : Dict[Node, int]
+        Maps every node to its position in `nodes`.
+    successor_indices : List[Tuple[int, ...]]
+        The distinct successors of every node, by position.
+    predecessor_counts : List[int]
+        The number of distinct predecessors of every node, by position.
+    predecessors : Dict[Node, Tuple[Node, ...]]
+        The distinct predecessors of every node.
+    arguments : Dict[Node, Tuple[Tuple[Node, str], ...]]
+        The (predecessor, input name) pairs to resolve for every node.
+    loop_keys : Dict[Node, Tuple[str, ...]]
+        The input names which are looped over, in the order passed to the loop strategy.
+    levels : List[FrozenSet[Node]]
+        The nodes grouped per topological level.
+    depths : Dict[Node, int]
+        The depth of the scopes in which every node stores its results.
+    drivers : Dict[Node, Node]
+        The predecessor whose scopes a node is called in, being its deepest predecessor.
+    lookups : Dict[Node, Tuple[Tuple[Node, str, int], ...]]
+        The (predecessor, input name, depth) triples to resolve for every node, deepest first,
+        so all arguments are found in a single walk up the scope tree.
+    """
+
+    def __init__(self, graph: MultiDiGraph, target_nodes: Sequence[Node] = ()) -> None:
+        """
+        Compiles an execution plan.
+
+        Parameters
+        ----------
+        graph : MultiDiGraph
+            The dependency graph.
+        target_nodes : Sequence[Node], optional
+            The nodes to execute together with their dependencies (default is all nodes).
+        """
+        self.flow_graph = self.create_flow_graph(graph, target_nodes)
+        self.predecessors: Dict[Node, Tuple[Node, ...]] = {
+            node: tuple(self.flow_graph.pred[node]) for node in self.flow_graph
+        }
+        self.arguments: Dict[Node, Tuple[Tuple[Node, str], ...]] = {
+            node: tuple(
+                (pred, key)
+                for pred, _, key in self.flow_graph.in_edges(node, keys=True)
+            )
+            for node in self.flow_graph
+        }
+        self.loop_keys: Dict[Node, Tuple[str, ...]] = {
+            node: tuple(key for key, _ in node.loop_vars) for node in self.flow_graph
+        }
+
+        self.levels: List[FrozenSet[Node]] = []
+        self.nodes: List[Node] = []
+        remaining = {node: len(preds) for node, preds in self.predecessors.items()}
+        ready = [node for node, count in remaining.items() if count == 0]
+        while ready:
+            self.levels.append(frozenset(ready))
+            self.nodes.extend(ready)
+            next_ready = []
+            for node in ready:
+                for successor in self.flow_graph.successors(node):
+                    remaining[successor] -= 1
+                    if remaining[successor] == 0:
+                        next_ready.append(successor)
+            ready = next_ready
+
+        self.index: Dict[Node, int] = {node: i for i, node in enumerate(self.nodes)}
+        self.successor_indices: List[Tuple[int, ...]] = [
+            tuple(self.index[successor] for successor in self.flow_graph.succ[node])
+            for node in self.nodes
+        ]
+        self.predecessor_counts: List[int] = [
+            len(self.predecessors[node]) for node in self.nodes
+        ]
+
+        self.depths: Dict[Node, int] = {}
+        self.drivers: Dict[Node, Node] = {}
+        # The looped nodes which created the scopes of every node, outermost first.
+        loops: Dict[Node, Tuple[Node, ...]] = {}
+        for node in self.nodes:
+            preds = self.predecessors[node]
+            call_depth = 0
+            call_loops = ()
+            if preds:
+                driver = max(preds, key=self.depths.__getitem__)
+                self.drivers[node] = driver
+                call_depth = self.depths[driver]
+                call_loops = loops[driver]
+                for pred in preds:
+                    if call_loops[: len(loops[pred])] != loops[pred]:
+                        raise ValueError(
+                            f"Node '{node}' depends on '{pred}' and '{driver}', "
+                            "which are looped over separately"
+                        )
+            self.depths[node] = call_depth + 2 if node.loop_vars else call_depth
+            loops[node] = (*call_loops, node) if node.loop_vars else call_loops
+
+        self.lookups: Dict[Node, Tuple[Tuple[Node, str, int], ...]] = {
+            node: tuple(
+                sorted(
+                    ((pred, key, self.depths[pred]) for pred, key in arguments),
+                    key=lambda lookup: -lookup[2],
+                )
+            )
+            for node, arguments in self.arguments.items()
+        }
+
+    def restrict(self, nodes: AbstractSet[Node]) -> "ExecutionPlan":
+        """
+        Returns a plan executing only some of the nodes, the others are expected to have been executed already.
+        The scope layout of the full plan is kept, only the scheduling is restricted.
+
+        Parameters
+        ----------
+        nodes : AbstractSet[Node]
+            The nodes to execute, closed under successors.
+
+        Returns
+        -------
+        ExecutionPlan
+            The restricted plan.
+        """
+        plan = copy.copy(self)
+        plan.nodes = [node for node in self.nodes if node in nodes]
+        plan.levels = [
+            level for level in (level & nodes for level in self.levels) if level
+        ]
+        plan.index = {node: i for i, node in enumerate(plan.nodes)}
+        plan.successor_indices = [
+            tuple(plan.index[successor] for successor in self.flow_graph.succ[node])
+            for node in plan.nodes
+        ]
+        plan.predecessor_counts = [
+            sum(pred in plan.index for pred in self.predecessors[node])
+            for node in plan.nodes
+        ]
+        return plan
+
+    @staticmethod
+    def create_flow_graph(
+        graph: MultiDiGraph, target_nodes: Sequence[Node] = ()
+    ) -> MultiDiGraph:
+        """
+        Creates a subgraph containing only the relevant nodes for the target nodes.
+
+        Parameters
+        ----------
+        graph : MultiDiGraph
+            The dependency graph.
+        target_nodes : Sequence[Node], optional
+            The nodes for which the subgraph should be created (default is all nodes).
+
+        Returns
+        -------
+        MultiDiGraph
+            The subgraph containing only relevant nodes.
+        """
+        if len(target_nodes) == 0:
+            return graph.copy()
+
+        relevant_nodes = set()
+        new_nodes = set(target_nodes)
+        while new_nodes:
+            relevant_nodes.update(new_nodes)
+            newer = set()
+            for node in new_nodes:
+                newer.update(graph.predecessors(node))
+            new_nodes = newer - relevant_nodes
+        return graph.subgraph(relevant_nodes).copy()
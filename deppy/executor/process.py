@@ -0,0 +1,179 @@
+import pickle
+import time
+from concurrent.futures import Executor as PoolExecutor, Future
+from typing import Any, Callable, Dict, List, Optional
+
+from deppy.cache import cache_key
+from deppy.node import Node, NodeFunctionError
+from .shared_buffers import (
+    SharedBuffers,
+    SharedTicket,
+    close_block,
+    open_block,
+    share,
+)
+
+
+def check_picklable(node: Node) -> None:
+    """
+    Checks whether the function of a node can be sent to a worker process.
+
+    Parameters
+    ----------
+    node : Node
+        The node to check.
+
+    Raises
+    ------
+    ValueError
+        If the function cannot be pickled, as is the case for lambdas and nested functions.
+    """
+    try:
+        pickle.dumps(node.func)
+    except Exception as e:
+        raise ValueError(
+            f"Node '{node}' runs in a process, but its function {node.func!r} cannot be pickled. "
+            "Process nodes need a function defined at the top level of a module, "
+            "lambdas and nested functions are not supported."
+        ) from e
+
+
+def call_function_at(
+    func: Callable[..., Any], start: float, kwargs: Dict[str, Any]
+) -> Any:
+    """
+    Calls a function in a worker process, waiting until the given time first.
+
+    Parameters
+    ----------
+    func : Callable[..., Any]
+        The function to call.
+    start : float
+        The monotonic time at which the call may start.
+    kwargs : Dict[str, Any]
+        Keyword arguments for the function.
+
+    Returns
+    -------
+    Any
+        The result of the function.
+    """
+    delay = start - time.monotonic()
+    if delay > 0:
+        time.sleep(delay)
+    return func(**kwargs)
+
+
+def call_function_shared(
+    func: Callable[..., Any],
+    start: float,
+    kwargs: Dict[str, Any],
+    threshold: Optional[int],
+) -> Any:
+    """
+    Calls a function in a worker process, passing buffers through shared memory.
+    Arguments sent as tickets are given as read-only views of their block, and a result
+    of at least `threshold` bytes is copied into a new block owned by the calling process.
+
+    Parameters
+    ----------
+    func : Callable[..., Any]
+        The function to call.
+    start : float
+        The monotonic time at which the call may start.
+    kwargs : Dict[str, Any]
+        Keyword arguments for the function, possibly tickets.
+    threshold : Optional[int]
+        The minimum number of bytes of a result passed through shared memory, or None to pickle the result.
+
+    Returns
+    -------
+    Any
+        The result of the function, or a ticket.
+    """
+    blocks = []
+    for key, value in kwargs.items():
+        if isinstance(value, SharedTicket):
+            block, kwargs[key] = open_block(value)
+            blocks.append(block)
+    try:
+        result = call_function_at(func, start, kwargs)
+        if threshold is not None:
+            result, block = share(result, threshold)
+            if block is not None:
+                block.close()
+        return result
+    finally:
+        kwargs.clear()
+        for block in blocks:
+            close_block(block)
+
+
+def submit_to_process(
+    pool: PoolExecutor,
+    node: Node,
+    start: float,
+    kwargs: Dict[str, Any],
+    buffers: Optional[SharedBuffers] = None,
+) -> Future:
+    """
+    Submits a call of the function of a node to a process pool.
+    Arguments and results are pickled, failures are raised as NodeFunctionError just like `Node.call_sync`.
+    The result cache of the node is consulted before submitting and filled when the call succeeds.
+    With shared buffers, large buffers are passed through shared memory, except for the results of cached nodes.
+
+    Parameters
+    ----------
+    pool : concurrent.futures.Executor
+        The process pool to submit to.
+    node : Node
+        The node to call.
+    start : float
+        The monotonic time at which the call may start.
+    kwargs : Dict[str, Any]
+        Keyword arguments for the function.
+    buffers : Optional[SharedBuffers], optional
+        The shared buffers of the executor (default is None, meaning arguments and results are pickled).
+
+    Returns
+    -------
+    Future
+        A future resolving to the result of the call.
+    """
+    future = Future()
+    future.set_running_or_notify_cancel()
+
+    key = None
+    if node.cache is not None:
+        key = cache_key(node, (), kwargs)
+        found, result = node.cache.get(key)
+        if found:
+            future.set_result(result)
+            return future
+
+    temporary: List[Any] = []
+
+    def resolve(task: Future) -> None:
+        if buffers is not None:
+            buffers.discard(temporary)
+        try:
+            result = task.result()
+            if buffers is not None:
+                result = buffers.adopt(result)
+        except Exception as e:
+            error = NodeFunctionError(node, e)
+            error.__cause__ = e
+            future.set_exception(error)
+            return
+        if key is not None:
+            node.cache.set(key, result)
+        future.set_result(result)
+
+    if buffers is None:
+        task = pool.submit(call_function_at, node.func, start, kwargs)
+    else:
+        sent, temporary = buffers.export(kwargs)
+        threshold = buffers.threshold if node.cache is None else None
+        task = pool.submit(call_function_shared, node.func, start, sent, threshold)
+    task.add_done_callback(resolve)
+    return future
@@ -0,0 +1,295 @@
+import threading
+import weakref
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+
+class SharedTicket(NamedTuple):
+    """
+    Refers to a buffer in a shared memory block, sent to or from a worker process instead of the buffer itself.
+
+    Attributes
+    ----------
+    name : str
+        The name of the shared memory block.
+    size : int
+        The number of bytes of the buffer.
+    array : Optional[Tuple[Tuple[int, ...], str]]
+        The shape and dtype of a numpy array, or None for a bytes-like buffer.
+    """
+
+    name: str
+    size: int
+    array: Optional[Tuple[Tuple[int, ...], str]] = None
+
+
+class SharedBlock(SharedMemory):
+    """
+    A shared memory block which can be dropped while views of its memory are still in use.
+    The memory is then unmapped once the last view is gone.
+    """
+
+    def __del__(self) -> None:
+        try:
+            self.close()
+        except (BufferError, OSError):
+            pass
+
+
+def is_array(value: Any) -> bool:
+    """
+    Checks whether a value is a numpy array, without importing numpy.
+
+    Parameters
+    ----------
+    value : Any
+        The value to check.
+
+    Returns
+    -------
+    bool
+        True if the value is a numpy array.
+    """
+    return type(value).__module__ == "numpy" and hasattr(value, "__array_interface__")
+
+
+def buffer_of(value: Any) -> Optional[memoryview]:
+    """
+    Returns a flat byte view of a contiguous buffer, like bytes, a memoryview or a numpy array.
+
+    Parameters
+    ----------
+    value : Any
+        The value to view.
+
+    Returns
+    -------
+    Optional[memoryview]
+        The view, or None if the value is not a contiguous buffer.
+    """
+    if not isinstance(value, (bytes, bytearray, memoryview)) and not is_array(value):
+        return None
+    try:
+        view = memoryview(value)
+    except (TypeError, ValueError):
+        return None
+    if not view.c_contiguous:
+        return None
+    return view.cast("B") if view.format != "B" or view.ndim != 1 else view
+
+
+def open_block(ticket: SharedTicket) -> Tuple[SharedMemory, Any]:
+    """
+    Attaches to the block of a ticket and returns a read-only view of its buffer.
+    Bytes-like buffers are viewed as a memoryview, numpy arrays as an array.
+
+    Parameters
+    ----------
+    ticket : SharedTicket
+        The ticket of the buffer.
+
+    Returns
+    -------
+    Tuple[SharedMemory, Any]
+        The attached block and the view.
+    """
+    block = SharedBlock(ticket.name)
+    view = block.buf[: ticket.size].toreadonly()
+    if ticket.array is not None:
+        import numpy
+
+        shape, dtype = ticket.array
+        view = numpy.frombuffer(view, dtype=dtype).reshape(shape)
+    return block, view
+
+
+def share(value: Any, threshold: int) -> Tuple[Any, Optional[SharedMemory]]:
+    """
+    Copies a buffer of at least `threshold` bytes into a new shared memory block.
+
+    Parameters
+    ----------
+    value : Any
+        The value to share.
+    threshold : int
+        The minimum number of bytes of a shared buffer.
+
+    Returns
+    -------
+    Tuple[Any, Optional[SharedMemory]]
+        A ticket and the new block, or the value itself and None if it is not shared.
+    """
+    view = buffer_of(value)
+    if view is None or view.nbytes < threshold:
+        return value, None
+    block = SharedBlock(create=True, size=view.nbytes)
+    block.buf[: view.nbytes] = view
+    array = (value.shape, value.dtype.str) if is_array(value) else None
+    return SharedTicket(block.name, view.nbytes, array), block
+
+
+def close_block(block: SharedMemory) -> bool:
+    """
+    Closes a block, unless views of it are still in use.
+
+    Parameters
+    ----------
+    block : SharedMemory
+        The block to close.
+
+    Returns
+    -------
+    bool
+        Whether the block was closed.
+    """
+    try:
+        block.close()
+    except BufferError:
+        return False
+    return True
+
+
+class SharedBuffers:
+    """
+    Passes large buffers to and from worker processes through shared memory instead of pickling them.
+
+    Arguments of at least `threshold` bytes are copied into a shared memory block once, the worker receives
+    a read-only view of it. Results are returned the same way and kept in their block, the scope holding
+    a read-only view. A block is released once no view of it is referenced anymore, and a view passed on
+    to another process node is sent without copying it. Views held by scopes are usually freed by the
+    garbage collector, their blocks are then released by the next call of `release`.
+
+    Attributes
+    ----------
+    threshold : int
+        The minimum number of bytes of a buffer passed through shared memory.
+    blocks : Dict[str, SharedMemory]
+        The blocks of the results, by name.
+    views : Dict[int, Tuple[weakref.ref, SharedTicket]]
+        The tickets of the views handed out for the results, by id of the view.
+    """
+
+    def __init__(self, threshold: int = 1024 * 1024) -> None:
+        """
+        Constructs a SharedBuffers instance.
+        The resource tracker is started right away, so worker processes forked afterwards share it.
+
+        Parameters
+        ----------
+        threshold : int, optional
+            The minimum number of bytes of a buffer passed through shared memory (default is 1 MiB).
+        """
+        self.threshold = threshold
+        self.blocks: Dict[str, SharedMemory] = {}
+        self.views: Dict[int, Tuple[weakref.ref, SharedTicket]] = {}
+        self.lock = threading.RLock()
+        resource_tracker.ensure_running()
+
+    def export(
+        self, kwargs: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], List[SharedMemory]]:
+        """
+        Replaces the large buffers among the arguments of a call by tickets.
+        Views of result blocks are sent as is, other buffers are copied into temporary blocks.
+
+        Parameters
+        ----------
+        kwargs : Dict[str, Any]
+            Keyword arguments of the call.
+
+        Returns
+        -------
+        Tuple[Dict[str, Any], List[SharedMemory]]
+            The arguments to send and the temporary blocks, to discard once the call finished.
+        """
+        sent = dict(kwargs)
+        temporary = []
+        for key, value in kwargs.items():
+            with self.lock:
+                entry = self.views.get(id(value))
+            if entry is not None and entry[0]() is value:
+                sent[key] = entry[1]
+                continue
+            sent[key], block = share(value, self.threshold)
+            if block is not None:
+                temporary.append(block)
+        return sent, temporary
+
+    def discard(self, temporary: List[SharedMemory]) -> None:
+        """
+        Releases the temporary blocks of a finished call.
+
+        Parameters
+        ----------
+        temporary : List[SharedMemory]
+            The blocks returned by `export`.
+        """
+        for block in temporary:
+            block.close()
+            block.unlink()
+
+    def adopt(self, result: Any) -> Any:
+        """
+        Takes over the block of a result returned by a worker process.
+
+        Parameters
+        ----------
+        result : Any
+            The result of a call, possibly a ticket.
+
+        Returns
+        -------
+        Any
+            A read-only view of the result if it was shared, the result itself otherwise.
+        """
+        if not isinstance(result, SharedTicket):
+            return result
+        block, view = open_block(result)
+        with self.lock:
+            self.blocks[result.name] = block
+            self.views[id(view)] = (weakref.ref(view), result)
+        weakref.finalize(view, self.release, id(view)).atexit = False
+        return view
+
+    def release(self, key: Optional[int] = None) -> None:
+        """
+        Forgets a view which is no longer referenced, and releases every block without views.
+        Blocks whose memory is still exported, e.g. through a slice of a view, are retried on the next release.
+
+        Parameters
+        ----------
+        key : Optional[int], optional
+            The id of the view which is no longer referenced (default is None).
+        """
+        with self.lock:
+            self.views.pop(key, None)
+            used = {ticket.name for _, ticket in list(self.views.values())}
+            for name in [name for name in self.blocks if name not in used]:
+                block = self.blocks.get(name)
+                if block is not None and close_block(block):
+                    if self.blocks.pop(name, None) is block:
+                        block.unlink()
+
+    def close(self) -> None:
+        """
+        Releases every block. Blocks still in use keep their memory until their views are gone,
+        but can no longer be sent to a worker process.
+        """
+        with self.lock:
+            blocks, self.blocks = self.blocks, {}
+            self.views.clear()
+            for block in blocks.values():
+                block.unlink()
+                close_block(block)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of result blocks.
+
+        Returns
+        -------
+        int
+            The number of blocks kept for results.
+        """
+        return len(self.blocks)
@@ -1,24 +1,111 @@
-from typing import Sequence, Set, Dict, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed, Future
+import sys
+import threading
+import time
+from functools import partial
+from typing import Sequence, Set, Dict, Tuple, Iterator, List, Any, Callable
+from concurrent.futures import (
+    ThreadPoolExecutor,
+    ProcessPoolExecutor,
+    wait,
+    Future,
+    FIRST_COMPLETED,
+)
 from typing import Optional
 
 from deppy.node import Node
 from deppy.scope import Scope
 from .executor import Executor
+from .process import check_picklable, submit_to_process
+from .shared_buffers import SharedBuffers
+
+
+def gil_disabled() -> bool:
+    """
+    Determines whether the interpreter runs without a GIL, as free-threaded builds of Python 3.13+ can.
+
+    Returns
+    -------
+    bool
+        True if threads run Python code in parallel, False otherwise.
+    """
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+_default_thread_pool: Optional[ThreadPoolExecutor] = None
+_default_thread_pool_lock = threading.Lock()
+
+
+def default_thread_pool() -> ThreadPoolExecutor:
+    """
+    Returns the process-wide thread pool shared by all executors without a pool of their own.
+    The pool is created on first use and its idle threads are reused by every execution.
+
+    Returns
+    -------
+    ThreadPoolExecutor
+        The shared thread pool.
+    """
+    global _default_thread_pool
+    with _default_thread_pool_lock:
+        if _default_thread_pool is None:
+            _default_thread_pool = ThreadPoolExecutor(thread_name_prefix="deppy")
+        return _default_thread_pool
+
+
+def set_default_thread_pool(pool: Optional[ThreadPoolExecutor]) -> None:
+    """
+    Replaces the process-wide thread pool used by executors without a pool of their own.
+    The previous pool is not shut down.
+
+    Parameters
+    ----------
+    pool : Optional[ThreadPoolExecutor]
+        The thread pool to share, or None to create a new one on first use.
+    """
+    global _default_thread_pool
+    with _default_thread_pool_lock:
+        _default_thread_pool = pool
 
 
 class SyncExecutor(Executor):
     """
     A synchronous executor for executing nodes in dependency graphs.
 
+    Worker threads and processes only call node functions, scopes and the scope map are
+    only written by the thread driving the execution, so they need no locking, also without a GIL.
+
     Attributes
     ----------
-    thread_pool : ThreadPoolExecutor
-        Thread pool used for parallel execution of nodes.
+    max_thread_workers : Optional[int]
+        Maximum number of threads of a thread pool owned by the executor.
+    owns_thread_pool : bool
+        Whether the thread pool was created by the executor, and is shut down with it.
+    sync_to_thread : bool
+        Whether every sync node is run on the thread pool, as if `to_thread` was set.
+    max_process_workers : Optional[int]
+        Maximum number of worker processes of the process pool.
+    process_pool : Optional[ProcessPoolExecutor]
+        Process pool used for nodes running in a process, created on first use and reused across executions.
+    owns_process_pool : bool
+        Whether the process pool was created by the executor, and is shut down with it.
+    shared_buffers : Optional[SharedBuffers]
+        Passes large buffers to and from worker processes through shared memory, or None to pickle them.
+    throttled_calls : Dict[Node, Tuple[Scope, Dict[str, Any]]]
+        The next call of every pooled node waiting for its rate limit, held by the thread driving the execution.
     """
 
     def __init__(
-        self, deppy, max_thread_workers: Optional[int] = None, *args, **kwargs
+        self,
+        deppy,
+        max_thread_workers: Optional[int] = None,
+        *args,
+        max_process_workers: Optional[int] = None,
+        sync_to_thread: Optional[bool] = None,
+        thread_pool: Optional[ThreadPoolExecutor] = None,
+        process_pool: Optional[ProcessPoolExecutor] = None,
+        shared_memory_threshold: Optional[int] = None,
+        **kwargs,
     ) -> None:
         """
         Constructs a SyncExecutor instance.
@@ -28,16 +115,205 @@ class SyncExecutor(Executor):
         deppy : Any
             The main dependency manager instance.
         max_thread_workers : Optional[int], optional
-            Maximum number of threads in the thread pool (default is None, which allows unlimited threads).
+            Maximum number of threads of a thread pool owned by the executor
+            (default is None, which uses the shared default thread pool).
+        max_process_workers : Optional[int], optional
+            Maximum number of worker processes (default is None, which uses the number of processors).
+        sync_to_thread : Optional[bool], optional
+            Flag to run every sync node on the thread pool (default is None, which enables it when the GIL is disabled).
+        thread_pool : Optional[ThreadPoolExecutor], optional
+            Thread pool to run the nodes on, which is left running on shutdown (default is None).
+        process_pool : Optional[ProcessPoolExecutor], optional
+            Process pool to run the nodes on, which is left running on shutdown (default is None).
+        shared_memory_threshold : Optional[int], optional
+            Size in bytes from which buffers, like bytes or numpy arrays, are passed to and from
+            worker processes through shared memory (default is None, meaning they are pickled).
+        """
+        super().__init__(deppy, *args, **kwargs)
+        self.max_thread_workers = max_thread_workers
+        self._thread_pool = thread_pool
+        self.owns_thread_pool = False
+        self.sync_to_thread = (
+            gil_disabled() if sync_to_thread is None else sync_to_thread
+        )
+        self.max_process_workers = max_process_workers
+        self.process_pool = process_pool
+        self.owns_process_pool = False
+        self.shared_buffers = (
+            None
+            if shared_memory_threshold is None
+            else SharedBuffers(shared_memory_threshold)
+        )
+        self.throttled_calls: Dict[Node, Tuple[Scope, Dict[str, Any]]] = {}
+
+    @property
+    def thread_pool(self) -> ThreadPoolExecutor:
+        """
+        Returns the thread pool, resolving it on first use.
+        Without an injected pool or `max_thread_workers`, the shared default thread pool is used.
+
+        Returns
+        -------
+        ThreadPoolExecutor
+            The thread pool.
         """
-        super().__init__(deppy)
-        self.thread_pool = ThreadPoolExecutor(max_workers=max_thread_workers)
+        if self._thread_pool is None:
+            if self.max_thread_workers is None:
+                self._thread_pool = default_thread_pool()
+            else:
+                self._thread_pool = ThreadPoolExecutor(
+                    max_workers=self.max_thread_workers
+                )
+                self.owns_thread_pool = True
+        return self._thread_pool
 
     def shutdown(self):
         """
-        Shuts down the thread pool executor, releasing resources.
+        Shuts down the thread and process pools created by the executor, releasing resources.
+        Injected and shared pools are left running, shared memory blocks are released.
+        The executor can still be used afterwards, it then creates new pools on first use.
+        """
+        if self.owns_thread_pool:
+            self._thread_pool.shutdown()
+            self._thread_pool = None
+            self.owns_thread_pool = False
+        if self.owns_process_pool:
+            self.process_pool.shutdown()
+            self.process_pool = None
+            self.owns_process_pool = False
+        if self.shared_buffers is not None:
+            self.shared_buffers.close()
+
+    def get_process_pool(self) -> ProcessPoolExecutor:
+        """
+        Returns the process pool, starting it on first use.
+
+        Returns
+        -------
+        ProcessPoolExecutor
+            The process pool.
+        """
+        if self.process_pool is None:
+            self.process_pool = ProcessPoolExecutor(
+                max_workers=self.max_process_workers
+            )
+            self.owns_process_pool = True
+        return self.process_pool
+
+    def setup(self, *target_nodes: Sequence[Node]) -> None:
         """
-        self.thread_pool.shutdown()
+        Sets up the execution, checking upfront that the nodes running in a process can be sent to it.
+        Shared memory blocks of results which are no longer referenced are released.
+
+        Parameters
+        ----------
+        target_nodes : Sequence[Node]
+            The target nodes for the execution setup.
+
+        Raises
+        ------
+        ValueError
+            If the function of a node running in a process cannot be pickled.
+        """
+        super().setup(*target_nodes)
+        self.throttled_calls = {}
+        for node in self.plan.nodes:
+            if node.to_process and not node.is_async:
+                check_picklable(node)
+        if self.shared_buffers is not None:
+            self.shared_buffers.release()
+
+    def runs_in_pool(self, node: Node) -> bool:
+        """
+        Determines whether the calls of a node are submitted to the thread or process pool.
+
+        Parameters
+        ----------
+        node : Node
+            The node to check.
+
+        Returns
+        -------
+        bool
+            True if the node is threaded, runs in a process or every sync node runs on the thread pool.
+        """
+        return node.to_thread or node.to_process or self.sync_to_thread
+
+    def submit_call(self, node: Node, args: Dict[str, Any], scope: Scope) -> Future:
+        """
+        Submits a call of a node to the thread or process pool, its rate limit is enforced by the caller.
+
+        Parameters
+        ----------
+        node : Node
+            The node to call.
+        args : Dict[str, Any]
+            The arguments to call the node with.
+        scope : Scope
+            The scope the arguments were resolved in.
+
+        Returns
+        -------
+        Future
+            A future resolving to the result of the call.
+        """
+        span = None if self.tracer is None else self.tracer.dispatch(node, scope, args)
+        if node.to_process:
+            future = submit_to_process(
+                self.get_process_pool(), node, 0.0, args, self.shared_buffers
+            )
+            if span is not None:
+                self.tracer.run_in_process(span, future)
+            return future
+        call = (
+            node.call_sync
+            if span is None
+            else partial(self.tracer.run, span, node.call_sync)
+        )
+        return self.thread_pool.submit(call, **args)
+
+    @staticmethod
+    def call_node_at(call: Callable[..., Any], start: float, /, **kwargs) -> Any:
+        """
+        Calls a node synchronously, waiting until the given time first.
+
+        Parameters
+        ----------
+        call : Callable[..., Any]
+            The function calling the node, like `node.call_sync`.
+        start : float
+            The monotonic time at which the call may start.
+        **kwargs : Any
+            Keyword arguments for the node call.
+
+        Returns
+        -------
+        Any
+            The result of the node call.
+        """
+        delay = start - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        return call(**kwargs)
+
+    def reserve_start(self, node: Node) -> float:
+        """
+        Reserves a call of a node under its rate limit.
+
+        Parameters
+        ----------
+        node : Node
+            The node to call.
+
+        Returns
+        -------
+        float
+            The monotonic time at which the call may start.
+        """
+        bucket = self.get_bucket(node)
+        if bucket is None:
+            return 0.0
+        return time.monotonic() + bucket.reserve()
 
     def execute_node_with_scope_sync(self, node: Node, scope: Scope) -> Set[Scope]:
         """
@@ -55,9 +331,23 @@ class SyncExecutor(Executor):
         Set[Scope]
             A set of scopes resulting from the node's execution.
         """
-        call_args = self.resolve_args(node, scope)
-        results = [node.call_sync(**args) for args in call_args]
-        return self.save_results(node, list(results), scope)
+        if node.rate_limit is None and self.tracer is None:
+            results = [
+                self.store_result(node.call_sync(**args))
+                for args in self.iter_args(node, scope)
+            ]
+            return self.save_results(node, results, scope, self.root.results)
+
+        results = []
+        for args in self.iter_args(node, scope):
+            call = node.call_sync
+            if self.tracer is not None:
+                span = self.tracer.dispatch(node, scope, args)
+                call = partial(self.tracer.run, span, call)
+            if node.rate_limit is not None:
+                call = partial(self.call_node_at, call, self.reserve_start(node))
+            results.append(self.store_result(call(**args)))
+        return self.save_results(node, results, scope, self.root.results)
 
     def execute_node_sync(self, node: Node) -> None:
         """
@@ -70,54 +360,169 @@ class SyncExecutor(Executor):
         """
         scopes = self.get_call_scopes(node)
         if len(scopes) == 0:
+            self.scope_map[node] = set()
             return
         new_scopes = [
             self.execute_node_with_scope_sync(node, scope) for scope in scopes
         ]
         self.scope_map[node] = set.union(*new_scopes)
 
-    def gather_thread_tasks(self, node: Node) -> Dict[Future, Tuple[Node, Scope]]:
+    def iter_thread_calls(self, node: Node) -> Iterator[Tuple[Scope, Dict[str, Any]]]:
         """
-        Gathers thread pool tasks for a threaded node's execution.
+        Lazily yields the calls of a threaded node's execution.
 
         Parameters
         ----------
         node : Node
-            The node for which to gather tasks.
+            The node for which to yield the calls.
 
         Returns
         -------
-        Dict[Future, Tuple[Node, Scope]]
-            A mapping of Future objects to their corresponding node and scope.
+        Iterator[Tuple[Scope, Dict[str, Any]]]
+            An iterator of call scopes and the arguments to call the node with.
         """
-        task_map = {}
         for scope in self.get_call_scopes(node):
-            call_args = self.resolve_args(node, scope)
-            for args in call_args:
-                task = self.thread_pool.submit(node.call_sync, **args)
-                task_map[task] = (node, scope)
-        return task_map
+            for args in self.iter_args(node, scope):
+                yield scope, args
+
+    def submit_thread_calls(
+        self,
+        calls: Dict[Node, Iterator[Tuple[Scope, Dict[str, Any]]]],
+        task_map: Dict[Future, Tuple[Node, Scope]],
+        outstanding: Dict[Node, int],
+    ) -> List[Node]:
+        """
+        Submits pending calls to the thread or process pool until `max_in_flight` calls are running.
+        Nodes running `max_concurrency` calls are skipped, the next call of a rate limited node is held
+        in `throttled_calls` until its turn, so waiting calls never occupy a worker thread.
+
+        Parameters
+        ----------
+        calls : Dict[Node, Iterator[Tuple[Scope, Dict[str, Any]]]]
+            The pending calls per node, nodes are removed once all their calls are submitted.
+        task_map : Dict[Future, Tuple[Node, Scope]]
+            The running calls, mapped to their node and scope.
+        outstanding : Dict[Node, int]
+            The number of running calls per node.
+
+        Returns
+        -------
+        List[Node]
+            The nodes whose calls have all been submitted and completed.
+        """
+        finished = []
+        throttled = set()
+        while calls and (
+            self.max_in_flight is None or len(task_map) < self.max_in_flight
+        ):
+            node = next(
+                (
+                    node
+                    for node in calls
+                    if node not in throttled
+                    and (
+                        node.max_concurrency is None
+                        or outstanding[node] < node.max_concurrency
+                    )
+                ),
+                None,
+            )
+            if node is None:
+                break
+            call = self.throttled_calls.pop(node, None) or next(calls[node], None)
+            if call is None:
+                del calls[node]
+                if outstanding[node] == 0:
+                    finished.append(node)
+                continue
+            bucket = self.get_bucket(node)
+            if bucket is not None:
+                if bucket.delay() > 0:
+                    self.throttled_calls[node] = call
+                    throttled.add(node)
+                    continue
+                bucket.reserve()
+            scope, args = call
+            task_map[self.submit_call(node, args, scope)] = (node, scope)
+            outstanding[node] += 1
+        return finished
+
+    def complete_thread_calls(
+        self,
+        calls: Dict[Node, Iterator[Tuple[Scope, Dict[str, Any]]]],
+        task_map: Dict[Future, Tuple[Node, Scope]],
+        outstanding: Dict[Node, int],
+    ) -> List[Node]:
+        """
+        Waits for running calls to complete and saves their results on the calling thread.
+        Stops waiting early when a throttled call may be submitted.
+
+        Parameters
+        ----------
+        calls : Dict[Node, Iterator[Tuple[Scope, Dict[str, Any]]]]
+            The pending calls per node.
+        task_map : Dict[Future, Tuple[Node, Scope]]
+            The running calls, mapped to their node and scope.
+        outstanding : Dict[Node, int]
+            The number of running calls per node.
+
+        Returns
+        -------
+        List[Node]
+            The nodes whose calls have all been submitted and completed.
+        """
+        finished = []
+        timeout = self.throttle_delay()
+        if not task_map:
+            time.sleep(timeout or 0)
+            return finished
+        done, _ = wait(task_map, timeout=timeout, return_when=FIRST_COMPLETED)
+        for future in done:
+            result = future.result()
+            node, scope = task_map.pop(future)
+            new_scopes = self.save_results(
+                node, [result], scope, self.root.results, self.result_store
+            )
+            self.scope_map[node].update(new_scopes)
+            outstanding[node] -= 1
+            if outstanding[node] == 0 and node not in calls:
+                finished.append(node)
+        return finished
+
+    def throttle_delay(self) -> Optional[float]:
+        """
+        Returns how long until the first throttled call may be submitted.
+
+        Returns
+        -------
+        Optional[float]
+            The number of seconds to wait, or None if no call is throttled.
+        """
+        if not self.throttled_calls:
+            return None
+        return min(self.get_bucket(node).delay() for node in self.throttled_calls)
 
     def execute_threaded_nodes(self, nodes: Set[Node]):
         """
-        Executes threaded nodes using the thread pool.
+        Executes threaded nodes using the thread pool, and nodes running in a process using the process pool.
 
         Parameters
         ----------
         nodes : Set[Node]
             The set of nodes to execute using threads.
         """
+        calls = {}
+        outstanding = {}
         task_map = {}
         for node in nodes:
-            task_map.update(self.gather_thread_tasks(node))
+            self.scope_map[node] = set()
+            calls[node] = self.iter_thread_calls(node)
+            outstanding[node] = 0
 
-        for future in as_completed(task_map):
-            result = future.result()
-            node, scope = task_map[future]
-            if node not in self.scope_map:
-                self.scope_map[node] = set()
-            new_scopes = self.save_results(node, [result], scope)
-            self.scope_map[node].update(new_scopes)
+        self.submit_thread_calls(calls, task_map, outstanding)
+        while task_map or calls:
+            self.complete_thread_calls(calls, task_map, outstanding)
+            self.submit_thread_calls(calls, task_map, outstanding)
 
     def execute_nodes_sync(self, nodes: Set[Node]) -> None:
         """
@@ -128,13 +533,44 @@ class SyncExecutor(Executor):
         nodes : Set[Node]
             The set of nodes to execute.
         """
-        threaded_nodes = {node for node in nodes if node.to_thread}
+        threaded_nodes = {node for node in nodes if self.runs_in_pool(node)}
         sync_nodes = nodes - threaded_nodes
 
         self.execute_threaded_nodes(threaded_nodes)
         for node in sync_nodes:
             self.execute_node_sync(node)
 
+    def execute_dataflow_sync(self) -> None:
+        """
+        Executes the flow graph, starting every node as soon as its own predecessors have finished.
+
+        Threaded nodes are submitted to the thread pool and their results are saved
+        on the calling thread once they complete, other nodes run inline in between.
+        """
+        counts = self.predecessor_counts()
+        ready = [node for node, count in zip(self.plan.nodes, counts) if count == 0]
+        calls: Dict[Node, Iterator[Tuple[Scope, Dict[str, Any]]]] = {}
+        task_map: Dict[Future, Tuple[Node, Scope]] = {}
+        outstanding: Dict[Node, int] = {}
+
+        while ready or task_map or calls:
+            while ready:
+                node = ready.pop()
+                if self.runs_in_pool(node):
+                    self.scope_map[node] = set()
+                    calls[node] = self.iter_thread_calls(node)
+                    outstanding[node] = 0
+                else:
+                    self.execute_node_sync(node)
+                    ready.extend(self.release_successors(node, counts))
+
+            for node in self.submit_thread_calls(calls, task_map, outstanding):
+                ready.extend(self.release_successors(node, counts))
+            if ready or not (task_map or calls):
+                continue
+            for node in self.complete_thread_calls(calls, task_map, outstanding):
+                ready.extend(self.release_successors(node, counts))
+
     def execute_sync(self, *target_nodes: Sequence[Node]) -> Scope:
         """
         Executes the dependency graph synchronously.
@@ -151,7 +587,10 @@ class SyncExecutor(Executor):
         """
         self.setup(*target_nodes)
 
-        for tasks in self.batched_topological_order():
-            self.execute_nodes_sync(tasks)
+        if self.dataflow:
+            self.execute_dataflow_sync()
+        else:
+            for tasks in self.batched_topological_order():
+                self.execute_nodes_sync(tasks)
 
         return self.root
@@ -0,0 +1,789 @@
+import json
+import os
+import reprlib
+import threading
+import time
+from concurrent.futures import Future
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from deppy.node import Node
+from deppy.scope import Scope
+from .plan import ExecutionPlan
+
+_current_span: ContextVar[Optional["CallSpan"]] = ContextVar(
+    "deppy_current_span", default=None
+)
+
+
+def current_span() -> Optional["CallSpan"]:
+    """
+    Returns the span of the traced call running in the current context.
+
+    Returns
+    -------
+    Optional[CallSpan]
+        The span, or None if no traced call is running.
+    """
+    return _current_span.get()
+
+
+def percentile(values: List[float], q: float) -> float:
+    """
+    Computes a percentile of sorted values, interpolating between the closest ranks.
+
+    Parameters
+    ----------
+    values : List[float]
+        The sorted values, at least one.
+    q : float
+        The percentile, between 0 and 100.
+
+    Returns
+    -------
+    float
+        The percentile.
+    """
+    position = (len(values) - 1) * q / 100
+    low = int(position)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (position - low)
+
+
+class CallSpan:
+    """
+    The timing of a single call of a node.
+    Times are `time.perf_counter` values.
+
+    Attributes
+    ----------
+    node : Node
+        The node called.
+    path : str
+        The path of the scope the arguments were resolved in.
+    args : int
+        The number of arguments of the call.
+    queued : float
+        The time the call was dispatched.
+    start : Optional[float]
+        The time the function started, after waiting for limits, semaphores and pools.
+    end : Optional[float]
+        The time the call returned.
+    thread : Optional[str]
+        The name of the thread the function ran on, or "process" for calls running in a worker process.
+    on_loop : bool
+        Whether the function ran on the event loop.
+    error : bool
+        Whether the call failed.
+    values : Optional[Dict[str, str]]
+        The representations of the arguments, if the tracer records them.
+    """
+
+    __slots__ = (
+        "node",
+        "path",
+        "args",
+        "queued",
+        "start",
+        "end",
+        "thread",
+        "on_loop",
+        "error",
+        "values",
+    )
+
+    def __init__(self, node: Node, path: str, args: int, queued: float) -> None:
+        self.node = node
+        self.path = path
+        self.args = args
+        self.queued = queued
+        self.start: Optional[float] = None
+        self.end: Optional[float] = None
+        self.thread: Optional[str] = None
+        self.on_loop = False
+        self.error = False
+        self.values: Optional[Dict[str, str]] = None
+
+    @property
+    def wait(self) -> float:
+        """
+        The number of seconds between dispatching the call and starting the function.
+
+        Returns
+        -------
+        float
+            The waiting time.
+        """
+        return (self.start if self.start is not None else self.queued) - self.queued
+
+    @property
+    def duration(self) -> float:
+        """
+        The number of seconds the function ran.
+
+        Returns
+        -------
+        float
+            The running time, 0 if the call did not finish.
+        """
+        if self.start is None or self.end is None:
+            return 0.0
+        return self.end - self.start
+
+    def __repr__(self) -> str:
+        return (
+            f"<CallSpan {self.node.name} {self.path} "
+            f"wait={self.wait:.6f}s duration={self.duration:.6f}s>"
+        )
+
+
+class NodeStats(NamedTuple):
+    """
+    Summary of the calls of a node.
+
+    Attributes
+    ----------
+    calls : int
+        The number of calls.
+    total : float
+        The summed running time of the calls.
+    p50 : float
+        The median running time.
+    p95 : float
+        The 95th percentile of the running times.
+    p99 : float
+        The 99th percentile of the running times.
+    wait : float
+        The summed waiting time of the calls.
+    """
+
+    calls: int
+    total: float
+    p50: float
+    p95: float
+    p99: float
+    wait: float
+
+
+class Tracer:
+    """
+    Records the timing of every node call of the executions of an executor.
+
+    Calls are dispatched when their arguments are resolved, and start once the node's limits,
+    the semaphore and the pool let them. The records of the last execution are summarized per node,
+    and used to find the critical path and the time nodes spent waiting for a level barrier.
+    They can be exported as Chrome trace events or OpenTelemetry spans.
+
+    Attributes
+    ----------
+    spans : List[CallSpan]
+        The calls of the last execution, in dispatch order.
+    plan : Optional[ExecutionPlan]
+        The plan of the last execution.
+    began : float
+        The time the last execution was set up.
+    began_ns : int
+        The wall-clock time the last execution was set up, in nanoseconds since the epoch.
+    record_args : bool
+        Whether the representations of the arguments are recorded.
+    """
+
+    def __init__(self, record_args: Optional[bool] = False) -> None:
+        """
+        Constructs a Tracer without records.
+
+        Parameters
+        ----------
+        record_args : Optional[bool], optional
+            Flag to record a short representation of every argument (default is False).
+            Arguments of secret nodes, or from secret nodes, are masked when exported.
+        """
+        self.spans: List[CallSpan] = []
+        self.plan: Optional[ExecutionPlan] = None
+        self.began = 0.0
+        self.began_ns = 0
+        self.record_args = record_args
+
+    def begin(self, plan: ExecutionPlan) -> None:
+        """
+        Starts recording a new execution, dropping the records of the previous one.
+
+        Parameters
+        ----------
+        plan : ExecutionPlan
+            The plan of the execution.
+        """
+        self.spans = []
+        self.plan = plan
+        self.began_ns = time.time_ns()
+        self.began = time.perf_counter()
+
+    def dispatch(self, node: Node, scope: Scope, args: Dict[str, Any]) -> CallSpan:
+        """
+        Records that a call of a node is dispatched.
+
+        Parameters
+        ----------
+        node : Node
+            The node called.
+        scope : Scope
+            The scope the arguments were resolved in.
+        args : Dict[str, Any]
+            The arguments of the call.
+
+        Returns
+        -------
+        CallSpan
+            The span of the call.
+        """
+        span = CallSpan(node, scope.path, len(args), time.perf_counter())
+        if self.record_args:
+            span.values = {key: reprlib.repr(value) for key, value in args.items()}
+        self.spans.append(span)
+        return span
+
+    @staticmethod
+    def run(span: Optional[CallSpan], call: Callable[..., Any], /, *args, **kwargs):
+        """
+        Calls a function, recording when and on which thread it ran.
+
+        Parameters
+        ----------
+        span : Optional[CallSpan]
+            The span of the call, or None to use the span of the current context.
+        call : Callable[..., Any]
+            The function to call.
+        *args : Any
+            Positional arguments for the call.
+        **kwargs : Any
+            Keyword arguments for the call.
+
+        Returns
+        -------
+        Any
+            The result of the call.
+        """
+        span = span or _current_span.get()
+        if span is None:
+            return call(*args, **kwargs)
+        span.thread = threading.current_thread().name
+        span.start = time.perf_counter()
+        try:
+            return call(*args, **kwargs)
+        except BaseException:
+            span.error = True
+            raise
+        finally:
+            span.end = time.perf_counter()
+
+    @staticmethod
+    async def run_async(
+        span: Optional[CallSpan],
+        call: Callable[..., Awaitable[Any]],
+        /,
+        *args,
+        **kwargs,
+    ) -> Any:
+        """
+        Awaits a coroutine function on the event loop, recording when it ran.
+
+        Parameters
+        ----------
+        span : Optional[CallSpan]
+            The span of the call, or None to use the span of the current context.
+        call : Callable[..., Awaitable[Any]]
+            The coroutine function to call.
+        *args : Any
+            Positional arguments for the call.
+        **kwargs : Any
+            Keyword arguments for the call.
+
+        Returns
+        -------
+        Any
+            The result of the call.
+        """
+        span = span or _current_span.get()
+        if span is None:
+            return await call(*args, **kwargs)
+        span.thread = threading.current_thread().name
+        span.on_loop = True
+        span.start = time.perf_counter()
+        try:
+            return await call(*args, **kwargs)
+        except BaseException:
+            span.error = True
+            raise
+        finally:
+            span.end = time.perf_counter()
+
+    @staticmethod
+    def run_in_process(span: Optional[CallSpan], future: Future) -> None:
+        """
+        Records a call submitted to a worker process, which runs from now until the future is done.
+
+        Parameters
+        ----------
+        span : Optional[CallSpan]
+            The span of the call, or None to use the span of the current context.
+        future : Future
+            The future of the call.
+        """
+        span = span or _current_span.get()
+        if span is None:
+            return
+        span.thread = "process"
+        span.start = time.perf_counter()
+
+        def done(task: Future) -> None:
+            span.error = task.exception() is not None
+            span.end = time.perf_counter()
+
+        future.add_done_callback(done)
+
+    async def trace(
+        self,
+        node: Node,
+        scope: Scope,
+        call: Callable[..., Awaitable[Any]],
+        /,
+        **kwargs,
+    ) -> Any:
+        """
+        Dispatches a traced call of a node on the event loop.
+        The span is passed through the limiters to the innermost call by the context.
+        Calls which never started, like coalesced calls sharing another call, are recorded as waiting throughout.
+
+        Parameters
+        ----------
+        node : Node
+            The node called.
+        scope : Scope
+            The scope the arguments were resolved in.
+        call : Callable[..., Awaitable[Any]]
+            The coroutine function calling the node.
+        **kwargs : Any
+            Keyword arguments for the call.
+
+        Returns
+        -------
+        Any
+            The result of the call.
+        """
+        span = self.dispatch(node, scope, kwargs)
+        token = _current_span.set(span)
+        try:
+            return await call(**kwargs)
+        finally:
+            _current_span.reset(token)
+            if span.end is None:
+                span.end = time.perf_counter()
+            if span.start is None:
+                span.start = span.end
+
+    def windows(self) -> Dict[Node, Tuple[float, float, float]]:
+        """
+        Returns when the calls of every traced node were first dispatched, first started and last returned.
+
+        Returns
+        -------
+        Dict[Node, Tuple[float, float, float]]
+            The (queued, start, end) times per node.
+        """
+        windows = {}
+        for span in self.spans:
+            start = span.start if span.start is not None else span.queued
+            end = span.end if span.end is not None else start
+            window = windows.get(span.node)
+            if window is None:
+                windows[span.node] = (span.queued, start, end)
+            else:
+                windows[span.node] = (
+                    min(window[0], span.queued),
+                    min(window[1], start),
+                    max(window[2], end),
+                )
+        return windows
+
+    def stats(self) -> Dict[Node, NodeStats]:
+        """
+        Summarizes the running times of the calls of every node.
+
+        Returns
+        -------
+        Dict[Node, NodeStats]
+            The summary per node.
+        """
+        durations: Dict[Node, List[float]] = {}
+        waits: Dict[Node, float] = {}
+        for span in self.spans:
+            durations.setdefault(span.node, []).append(span.duration)
+            waits[span.node] = waits.get(span.node, 0.0) + span.wait
+        stats = {}
+        for node, values in durations.items():
+            values.sort()
+            stats[node] = NodeStats(
+                calls=len(values),
+                total=sum(values),
+                p50=percentile(values, 50),
+                p95=percentile(values, 95),
+                p99=percentile(values, 99),
+                wait=waits[node],
+            )
+        return stats
+
+    def critical_path(self) -> List[Tuple[Node, float]]:
+        """
+        Returns the chain of nodes which determined the length of the last execution.
+        Starting at the node which finished last, every node is preceded by its predecessor in
+        the flow graph which finished last, as that is the one the node was waiting for.
+
+        Returns
+        -------
+        List[Tuple[Node, float]]
+            The nodes of the path in execution order, with the seconds between their first dispatch and last return.
+        """
+        windows = self.windows()
+        if not windows or self.plan is None:
+            return []
+        node = max(windows, key=lambda n: windows[n][2])
+        path = []
+        while node is not None:
+            queued, _, end = windows[node]
+            path.append((node, end - queued))
+            node = max(
+                (
+                    pred
+                    for pred in self.plan.predecessors.get(node, ())
+                    if pred in windows
+                ),
+                key=lambda n: windows[n][2],
+                default=None,
+            )
+        path.reverse()
+        return path
+
+    def stalls(self, threshold: float = 0.0) -> List[Tuple[Node, float]]:
+        """
+        Returns the nodes which were dispatched later than their predecessors allowed.
+        A node is ready once all its predecessors have returned. When executing level by level,
+        it is only dispatched once the whole previous level has, so the difference is the time lost at the barrier.
+
+        Parameters
+        ----------
+        threshold : float, optional
+            The minimum stall in seconds to report (default is 0).
+
+        Returns
+        -------
+        List[Tuple[Node, float]]
+            The stalled nodes with their stall in seconds, longest first.
+        """
+        windows = self.windows()
+        if self.plan is None:
+            return []
+        stalls = []
+        for node, (queued, _, _) in windows.items():
+            ready = max(
+                (
+                    windows[pred][2]
+                    for pred in self.plan.predecessors.get(node, ())
+                    if pred in windows
+                ),
+                default=self.began,
+            )
+            if queued - ready > threshold:
+                stalls.append((node, queued - ready))
+        stalls.sort(key=lambda stall: stall[1], reverse=True)
+        return stalls
+
+    def report(self, stall_threshold: float = 0.001) -> str:
+        """
+        Formats the per node summary, the critical path and the barrier stalls of the last execution.
+
+        Parameters
+        ----------
+        stall_threshold : float, optional
+            The minimum stall in seconds to report (default is 1 ms).
+
+        Returns
+        -------
+        str
+            The report.
+        """
+        lines = [
+            f"{'node':<24} {'calls':>6} {'total':>10} {'p50':>10} {'p95':>10} {'p99':>10} {'wait':>10}"
+        ]
+        stats = sorted(
+            self.stats().items(), key=lambda item: item[1].total, reverse=True
+        )
+        for node, stat in stats:
+            lines.append(
+                f"{node.name:<24} {stat.calls:>6} {stat.total:>10.6f} {stat.p50:>10.6f} "
+                f"{stat.p95:>10.6f} {stat.p99:>10.6f} {stat.wait:>10.6f}"
+            )
+        stalls = self.stalls(stall_threshold)
+        stalled = dict(stalls)
+        lines.append("")
+        lines.append(
+            "critical path: "
+            + " -> ".join(
+                f"{node.name} ({seconds:.6f}s"
+                + (f", stalled {stalled[node]:.6f}s)" if node in stalled else ")")
+                for node, seconds in self.critical_path()
+            )
+        )
+        if stalls:
+            lines.append("barrier stalls:")
+            lines.extend(
+                f"  {node.name}: dispatched {seconds:.6f}s after its predecessors finished"
+                for node, seconds in stalls
+            )
+        return "\n".join(lines)
+
+    def attributes(self, span: CallSpan, mask_secrets: bool = True) -> Dict[str, Any]:
+        """
+        Returns the attributes of a span for exporting it.
+        Like `Scope.dump`, the recorded arguments of secret nodes, and the arguments passed from secret nodes, are masked.
+
+        Parameters
+        ----------
+        span : CallSpan
+            The span to describe.
+        mask_secrets : bool, optional
+            Flag to mask secret arguments (default is True).
+
+        Returns
+        -------
+        Dict[str, Any]
+            The attributes, prefixed with "deppy.".
+        """
+        attributes = {
+            "deppy.node": span.node.name,
+            "deppy.scope": span.path,
+            "deppy.args": span.args,
+            "deppy.wait_ms": span.wait * 1e3,
+            "deppy.thread": span.thread or "",
+            "deppy.on_loop": span.on_loop,
+            "deppy.secret": span.node.secret,
+            "deppy.error": span.error,
+        }
+        if span.values is not None:
+            secret = set()
+            if mask_secrets and self.plan is not None:
+                secret = {
+                    key
+                    for pred, key in self.plan.arguments.get(span.node, ())
+                    if pred.secret or span.node.secret
+                }
+            for key, value in span.values.items():
+                attributes[f"deppy.arg.{key}"] = "***" if key in secret else value
+        return attributes
+
+    def to_ns(self, moment: float) -> int:
+        """
+        Converts a `time.perf_counter` value of the last execution to wall-clock time.
+
+        Parameters
+        ----------
+        moment : float
+            The perf counter value.
+
+        Returns
+        -------
+        int
+            Nanoseconds since the epoch.
+        """
+        return self.began_ns + int((moment - self.began) * 1e9)
+
+    def chrome_trace(self, mask_secrets: bool = True) -> Dict[str, Any]:
+        """
+        Exports the last execution in the Chrome Trace Event format, which can be opened in
+        Perfetto or chrome://tracing. Every thread gets a track, calls on the event loop are
+        async events so overlapping calls are shown side by side, and the time a call waited
+        before starting is an async event of the "wait" category.
+
+        Parameters
+        ----------
+        mask_secrets : bool, optional
+            Flag to mask secret arguments (default is True).
+
+        Returns
+        -------
+        Dict[str, Any]
+            The trace, with the events under "traceEvents".
+        """
+        pid = os.getpid()
+        threads: Dict[str, int] = {}
+        events: List[Dict[str, Any]] = []
+
+        def micros(moment: float) -> float:
+            return (moment - self.began) * 1e6
+
+        for index, span in enumerate(self.spans):
+            start = span.start if span.start is not None else span.queued
+            end = span.end if span.end is not None else start
+            tid = threads.setdefault(span.thread or "dispatch", len(threads) + 1)
+            event = {
+                "name": span.node.name,
+                "pid": pid,
+                "tid": tid,
+                "args": self.attributes(span, mask_secrets),
+            }
+            if span.on_loop:
+                events.append(
+                    event
+                    | {"cat": "async", "ph": "b", "id": index, "ts": micros(start)}
+                )
+                events.append(
+                    event | {"cat": "async", "ph": "e", "id": index, "ts": micros(end)}
+                )
+            else:
+                events.append(
+                    event
+                    | {
+                        "cat": "process" if span.thread == "process" else "thread",
+                        "ph": "X",
+                        "ts": micros(start),
+                        "dur": (end - start) * 1e6,
+                    }
+                )
+            if start > span.queued:
+                wait = {"name": f"{span.node.name} (wait)", "pid": pid, "tid": tid}
+                events.append(
+                    wait
+                    | {"cat": "wait", "ph": "b", "id": index, "ts": micros(span.queued)}
+                )
+                events.append(
+                    wait | {"cat": "wait", "ph": "e", "id": index, "ts": micros(start)}
+                )
+
+        events.append(
+            {"name": "process_name", "ph": "M", "pid": pid, "args": {"name": "deppy"}}
+        )
+        for thread, tid in threads.items():
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "tid": tid,
+                    "args": {"name": thread},
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def dump_chrome_trace(self, path: str, mask_secrets: bool = True) -> None:
+        """
+        Writes the last execution to a Chrome Trace Event JSON file.
+
+        Parameters
+        ----------
+        path : str
+            The path of the file.
+        mask_secrets : bool, optional
+            Flag to mask secret arguments (default is True).
+        """
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(mask_secrets), f)
+
+    def otel_spans(self, mask_secrets: bool = True) -> Dict[str, Any]:
+        """
+        Exports the last execution as OpenTelemetry spans, in the OTLP JSON encoding.
+        The calls are children of a "deppy.execute" span covering the whole execution, and the waiting time
+        of a call is its "deppy.wait_ms" attribute.
+
+        Parameters
+        ----------
+        mask_secrets : bool, optional
+            Flag to mask secret arguments (default is True).
+
+        Returns
+        -------
+        Dict[str, Any]
+            The spans, under "resourceSpans".
+        """
+
+        def value(item: Any) -> Dict[str, Any]:
+            if isinstance(item, bool):
+                return {"boolValue": item}
+            if isinstance(item, int):
+                return {"intValue": str(item)}
+            if isinstance(item, float):
+                return {"doubleValue": item}
+            return {"stringValue": str(item)}
+
+        trace_id = os.urandom(16).hex()
+        root_id = os.urandom(8).hex()
+        end = max(
+            (span.end for span in self.spans if span.end is not None),
+            default=self.began,
+        )
+        spans = [
+            {
+                "traceId": trace_id,
+                "spanId": root_id,
+                "name": "deppy.execute",
+                "kind": 1,
+                "startTimeUnixNano": str(self.began_ns),
+                "endTimeUnixNano": str(self.to_ns(end)),
+                "attributes": [{"key": "deppy.calls", "value": value(len(self.spans))}],
+                "status": {},
+            }
+        ]
+        for span in self.spans:
+            start = span.start if span.start is not None else span.queued
+            spans.append(
+                {
+                    "traceId": trace_id,
+                    "spanId": os.urandom(8).hex(),
+                    "parentSpanId": root_id,
+                    "name": span.node.name,
+                    "kind": 1,
+                    "startTimeUnixNano": str(self.to_ns(start)),
+                    "endTimeUnixNano": str(
+                        self.to_ns(span.end if span.end is not None else start)
+                    ),
+                    "attributes": [
+                        {"key": key, "value": value(item)}
+                        for key, item in self.attributes(span, mask_secrets).items()
+                    ],
+                    "status": {"code": 2} if span.error else {},
+                }
+            )
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [{"key": "service.name", "value": value("deppy")}]
+                    },
+                    "scopeSpans": [{"scope": {"name": "deppy"}, "spans": spans}],
+                }
+            ]
+        }
+
+    def dump_otel_spans(self, path: str, mask_secrets: bool = True) -> None:
+        """
+        Appends the last execution to a file of OTLP JSON lines, as written by the file exporter
+        of the OpenTelemetry collector, so it can be replayed to any OpenTelemetry backend.
+
+        Parameters
+        ----------
+        path : str
+            The path of the file.
+        mask_secrets : bool, optional
+            Flag to mask secret arguments (default is True).
+        """
+        with open(path, "a") as f:
+            f.write(json.dumps(self.otel_spans(mask_secrets)) + "\n")
+
+    def __len__(self) -> int:
+        """
+        Returns the number of recorded calls.
+
+        Returns
+        -------
+        int
+            The number of spans.
+        """
+        return len(self.spans)
@@ -1,8 +1,10 @@
-from typing import Any, Callable, Optional
-from networkx import is_directed_acyclic_graph, MultiDiGraph
+from typing import Any, Callable, List, Optional, Iterable, Iterator, Set, Tuple, Union
+from contextlib import contextmanager
+from networkx import is_directed_acyclic_graph, has_path, MultiDiGraph
 import inspect
 
-from .node import Node, LoopStrategy, product
+from .node import Node, LoopStrategy, RateLimit, product
+from .cache import ResultCache
 
 
 class GraphBuilder:
@@ -17,6 +19,14 @@ class GraphBuilder:
         Counter for the number of constant nodes added.
     secrets_count : int
         Counter for the number of secret nodes added.
+    version : int
+        Counter incremented on every change to the graph, used to invalidate compiled plans.
+    deferred : int
+        Depth of nested `deferred_check` contexts, edges are only validated once it is zero.
+    outputs : Set[Node]
+        The nodes added with `add_output`, whose results are kept when evicting results.
+    deferred_edges : List[Tuple[Node, Node, str, bool]]
+        The edges added inside the outermost `deferred_check` context, removed again if they create a cycle.
     """
 
     def __init__(self, graph: Optional[MultiDiGraph] = None) -> None:
@@ -31,6 +41,10 @@ class GraphBuilder:
         self.graph = graph or MultiDiGraph()
         self.consts_count = 0
         self.secrets_count = 0
+        self.version = 0
+        self.deferred = 0
+        self.outputs: Set[Node] = set()
+        self.deferred_edges: List[Tuple[Node, Node, str, bool]] = []
 
     def add_node(
         self,
@@ -39,6 +53,12 @@ class GraphBuilder:
         to_thread: Optional[bool] = False,
         name: Optional[str] = None,
         secret: Optional[bool] = False,
+        max_concurrency: Optional[int] = None,
+        rate_limit: Optional[Union[RateLimit, float]] = None,
+        to_process: Optional[bool] = False,
+        cache: Optional[ResultCache] = None,
+        coalesce: Optional[bool] = False,
+        cache_namespace: Optional[str] = None,
     ) -> Node:
         """
         Constructs a new Node object and adds it to the graph and returns it.
@@ -55,6 +75,18 @@ class GraphBuilder:
             The name of the node (default is the function's name).
         secret : Optional[bool], optional
             Indicates whether the node is sensitive and should be masked in outputs (default is False).
+        max_concurrency : Optional[int], optional
+            Maximum number of concurrent calls of the node (default is None, meaning unlimited).
+        rate_limit : Optional[Union[RateLimit, float]], optional
+            Rate limit for the calls of the node, a number is read as calls per second (default is None, meaning unlimited).
+        to_process : Optional[bool], optional
+            Flag to execute the function in a worker process (default is False). No effect if the function is asynchronous.
+        cache : Optional[ResultCache], optional
+            Cache memoizing the results of the node per arguments (default is None, meaning no caching).
+        coalesce : Optional[bool], optional
+            Flag to share a single call between concurrent calls with equal arguments (default is False).
+        cache_namespace : Optional[str], optional
+            Name identifying the node in the cache keys instead of its function (default is None).
         """
         node = Node(
             func=func,
@@ -62,8 +94,15 @@ class GraphBuilder:
             to_thread=to_thread,
             name=name,
             secret=secret,
+            max_concurrency=max_concurrency,
+            rate_limit=rate_limit,
+            to_process=to_process,
+            cache=cache,
+            coalesce=coalesce,
+            cache_namespace=cache_namespace,
         )
         self.graph.add_node(node)
+        self.version += 1
         return node
 
     def check(self) -> None:
@@ -118,7 +157,7 @@ class GraphBuilder:
             raise ValueError("Extractor function must have exactly one parameter")
         input_name = list(parameters.keys())[0]
         self.add_edge(node, node2, input_name, loop=loop)
-        self.check()
+        self.outputs.add(node2)
         return node2
 
     def add_edge(
@@ -137,11 +176,110 @@ class GraphBuilder:
             The input name for the edge.
         loop : Optional[bool], optional
             Whether the edge represents a loop variable (default is False).
+
+        Raises
+        ------
+        ValueError
+            If the edge would introduce a circular dependency, the graph is left unchanged.
         """
+        if self.deferred:
+            self.deferred_edges.append((node1, node2, input_name, loop))
+        elif self.creates_cycle(node1, node2):
+            raise ValueError("Circular dependency detected in the graph!")
         if loop:
             node2.loop_vars.append((input_name, node1))
         self.graph.add_edge(node1, node2, key=input_name, loop=loop)
-        self.check()
+        self.version += 1
+
+    def creates_cycle(self, node1: Node, node2: Node) -> bool:
+        """
+        Checks whether an edge from node1 to node2 would introduce a circular dependency.
+        Only the part of the graph reachable from node2 is searched.
+
+        Parameters
+        ----------
+        node1 : Node
+            The source node of the edge.
+        node2 : Node
+            The target node of the edge.
+
+        Returns
+        -------
+        bool
+            True if node1 is reachable from node2, False otherwise.
+        """
+        if node1 is node2:
+            return True
+        if node1 not in self.graph or node2 not in self.graph:
+            return False
+        return has_path(self.graph, node2, node1)
+
+    def add_edges(
+        self,
+        edges: Iterable[
+            Union[Tuple[Node, Node, str], Tuple[Node, Node, str, Optional[bool]]]
+        ],
+    ) -> None:
+        """
+        Adds multiple edges, validating the graph only once after all of them are added.
+
+        Parameters
+        ----------
+        edges : Iterable[Union[Tuple[Node, Node, str], Tuple[Node, Node, str, Optional[bool]]]]
+            Tuples of (node1, node2, input_name) or (node1, node2, input_name, loop).
+
+        Raises
+        ------
+        ValueError
+            If a circular dependency is detected in the graph.
+        """
+        with self.deferred_check():
+            for edge in edges:
+                self.add_edge(*edge)
+
+    @contextmanager
+    def deferred_check(self) -> Iterator["GraphBuilder"]:
+        """
+        Context in which edges are added without validation.
+        The whole graph is validated once when the outermost context exits.
+
+        Yields
+        ------
+        GraphBuilder
+            This graph builder.
+
+        Raises
+        ------
+        ValueError
+            If a circular dependency is detected in the graph, the edges added inside the context are removed.
+        """
+        self.deferred += 1
+        try:
+            yield self
+        finally:
+            self.deferred -= 1
+            if not self.deferred:
+                edges, self.deferred_edges = self.deferred_edges, []
+                if not is_directed_acyclic_graph(self.graph):
+                    self.remove_edges(edges)
+                    raise ValueError("Circular dependency detected in the graph!")
+
+    def remove_edges(self, edges: Iterable[Tuple[Node, Node, str, bool]]) -> None:
+        """
+        Removes edges from the graph, together with the loop variables they added.
+
+        Parameters
+        ----------
+        edges : Iterable[Tuple[Node, Node, str, bool]]
+            Tuples of (node1, node2, input_name, loop), edges no longer in the graph are skipped.
+        """
+        for node1, node2, input_name, loop in edges:
+            if not self.graph.has_edge(node1, node2, key=input_name):
+                continue
+            self.graph.remove_edge(node1, node2, key=input_name)
+            if loop:
+                node2.loop_vars.remove((input_name, node1))
+            self.version += 1
 
     def add_const(
         self, value: Optional[str] = None, name: Optional[Any] = None
@@ -166,6 +304,26 @@ class GraphBuilder:
         self.consts_count += 1
         return node
 
+    def set_value(self, node: Node, value: Any) -> None:
+        """
+        Replaces the value of a constant or secret node.
+
+        Parameters
+        ----------
+        node : Node
+            The constant or secret node.
+        value : Any
+            The new value.
+
+        Raises
+        ------
+        ValueError
+            If the node is not in the graph or has inputs, so it is not a constant or secret.
+        """
+        if node not in self.graph or self.graph.in_degree(node):
+            raise ValueError(f"Node '{node}' is not a constant or secret of the graph")
+        node.func = lambda: value
+
     def add_secret(
         self, value: Optional[str] = None, name: Optional[Any] = None
     ) -> Node:
@@ -1,4 +1,5 @@
 from typing import Optional, Iterable, TypeVar, Any, Dict, Type
+import asyncio
 import inspect
 import copy
 
@@ -141,11 +142,111 @@ def _create_extract_func(deppy: Blueprint, target_nodes: Iterable[Node]) -> Any:
     return extract_async if (async_func or async_context) else extract_sync
 
 
+class _NodeBatch:
+    """A batch of results of a single node, passed from the streaming extract resource to the node resources."""
+
+    __slots__ = ("node", "values")
+
+    def __init__(self, node: DeppyNode, values: list) -> None:
+        self.node = node
+        self.values = values
+
+
+def _create_stream_func(
+    deppy: Blueprint,
+    target_nodes: Iterable[Node],
+    stored_nodes: Iterable[Node],
+    batch_size: int,
+) -> Any:
+    """
+    Creates an extract function streaming the results of the stored nodes in batches, while the blueprint executes.
+
+    Parameters
+    ----------
+    deppy : Blueprint
+        The blueprint to execute.
+    target_nodes : Iterable[Node]
+        Nodes to execute together with their dependencies.
+    stored_nodes : Iterable[Node]
+        Nodes whose results are streamed.
+    batch_size : int
+        The number of results of a node collected before they are yielded.
+
+    Returns
+    -------
+    Any
+        An asynchronous or synchronous extraction function, yielding batches of results per node.
+    """
+    async_func = inspect.iscoroutinefunction(deppy.execute)
+    async_context = hasattr(deppy, "__aenter__") and hasattr(deppy, "__aexit__")
+    stored_nodes = frozenset(stored_nodes)
+
+    def collect(batches, node, value):
+        batch = batches.setdefault(node, [])
+        batch.append(value)
+        if len(batch) >= batch_size:
+            del batches[node]
+            return _NodeBatch(node, batch)
+        return None
+
+    async def stream_async(deppy_=deppy, target_nodes_=target_nodes):
+        batches = {}
+        if async_func:
+            async for node, _, value in deppy_.stream(*target_nodes_):
+                if node in stored_nodes:
+                    full = collect(batches, node, value)
+                    if full is not None:
+                        yield full
+        else:
+            # The sync stream blocks until the next result, so it is advanced off the event loop.
+            results = deppy_.stream(*target_nodes_)
+            end = object()
+            try:
+                while True:
+                    item = await asyncio.to_thread(next, results, end)
+                    if item is end:
+                        break
+                    node, _, value = item
+                    if node in stored_nodes:
+                        full = collect(batches, node, value)
+                        if full is not None:
+                            yield full
+            finally:
+                await asyncio.to_thread(results.close)
+        for node, batch in batches.items():
+            yield _NodeBatch(node, batch)
+
+    async def extract_async(deppy_=deppy):
+        if async_context:
+            async with deppy_:
+                async for batch in stream_async():
+                    yield batch
+        else:
+            with deppy_:
+                async for batch in stream_async():
+                    yield batch
+
+    def extract_sync(deppy_=deppy, target_nodes_=target_nodes):
+        batches = {}
+        with deppy_:
+            for node, _, value in deppy_.stream(*target_nodes_):
+                if node in stored_nodes:
+                    full = collect(batches, node, value)
+                    if full is not None:
+                        yield full
+        for node, batch in batches.items():
+            yield _NodeBatch(node, batch)
+
+    return extract_async if (async_func or async_context) else extract_sync
+
+
 def blueprint_to_source(
     blueprint: Type[BlueprintSubclass],
     target_nodes: Optional[Iterable[Node]] = None,
     exclude_for_storing: Optional[Iterable[Node]] = None,
     resource_kwargs: Optional[Dict[Node, Dict[str, Any]]] = None,
+    streaming: Optional[bool] = False,
+    batch_size: Optional[int] = 1000,
 ) -> SourceFactory:
     """
     Converts a Deppy blueprint into a DLT source factory.
@@ -160,6 +261,12 @@ def blueprint_to_source(
         Nodes to exclude from storage (default is None).
     resource_kwargs : Optional[Dict[Node, Dict[str, Any]]], optional
         Additional resource configurations for specific nodes (default is None).
+    streaming : Optional[bool], optional
+        Flag to yield the results of every node to its resource in batches while the blueprint executes,
+        instead of extracting all results at once when it finished (default is False).
+        Results are then loaded in the order they are produced.
+    batch_size : Optional[int], optional
+        The number of results of a node yielded at once when streaming (default is 1000).
 
     Returns
     -------
@@ -203,30 +310,43 @@ def blueprint_to_source(
             deppy.resolve_node(n): kwargs for n, kwargs in resource_kwargs.items()
         }
 
-        extract_func = _create_extract_func(deppy, actual_target_nodes)
-        extract = dlt.resource(selected=False, name=f"{name}_extract")(extract_func)
-
-        resources = [extract]
         nodes: list[DeppyNode] = (
             deppy.graph.nodes if len(actual_target_nodes) == 0 else actual_target_nodes
         )
-        nodes = [node for node in nodes if node not in actual_exclude_for_storing]
+        nodes = [
+            n
+            for n in nodes
+            if n not in actual_exclude_for_storing
+            and (n in actual_target_nodes or not (n.secret or n.name in deppy._consts))
+        ]
 
-        for n in nodes:
-            if n not in actual_target_nodes:
-                if n.secret:
-                    continue
-                if n.name in deppy._consts:
-                    continue
+        if streaming:
+            extract_func = _create_stream_func(
+                deppy, actual_target_nodes, nodes, batch_size
+            )
+        else:
+            extract_func = _create_extract_func(deppy, actual_target_nodes)
+        extract = dlt.resource(selected=False, name=f"{name}_extract")(extract_func)
 
+        resources = [extract]
+        for n in nodes:
             kwargs = actual_resource_kwargs.get(n, {})
             kwargs["data_from"] = extract
             if "name" not in kwargs:
                 kwargs["name"] = n.name
 
-            @dlt.transformer(**kwargs)
-            def get_node_data(result, node: Node = n) -> DltResource:
-                yield from result.query(node, ignored_results=False)
+            if streaming:
+
+                @dlt.transformer(**kwargs)
+                def get_node_data(batch, node: Node = n) -> DltResource:
+                    if batch.node is node:
+                        yield batch.values
+
+            else:
+
+                @dlt.transformer(**kwargs)
+                def get_node_data(result, node: Node = n) -> DltResource:
+                    yield from result.query(node, ignored_results=False)
 
             resources.append(get_node_data)
 
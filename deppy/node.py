@@ -2,9 +2,60 @@ import asyncio
 from itertools import product
 from typing import Any, Tuple, Callable, Iterable, Sequence, Union, Type, Optional
 
+from .cache import ResultCache, cache_key
+
 LoopStrategy = Union[Callable[[Sequence[Any]], Iterable[Tuple[Any]]], Type[zip]]
 
 
+class RateLimit:
+    """
+    A token bucket rate limit for the calls of a node.
+
+    Attributes
+    ----------
+    rate : float
+        The number of calls allowed per second.
+    burst : int
+        The number of calls which can be made at once after being idle.
+    """
+
+    def __init__(
+        self, calls: float, period: float = 1.0, burst: Optional[int] = None
+    ) -> None:
+        """
+        Constructs a RateLimit allowing `calls` calls per `period` seconds.
+
+        Parameters
+        ----------
+        calls : float
+            The number of calls allowed per period.
+        period : float, optional
+            The length of the period in seconds (default is 1.0).
+        burst : Optional[int], optional
+            The number of calls which can be made at once (default is `calls`, at least 1).
+
+        Raises
+        ------
+        ValueError
+            If calls, period or burst is not positive.
+        """
+        if calls <= 0 or period <= 0 or (burst is not None and burst < 1):
+            raise ValueError("Rate limit calls, period and burst must be positive")
+        self.rate = calls / period
+        self.burst = burst or max(1, int(calls))
+
+    def __repr__(self):
+        """
+        Returns a string representation of the rate limit.
+
+        Returns
+        -------
+        str
+            A string in the format <RateLimit rate/s burst>.
+        """
+        return f"<RateLimit {self.rate:g}/s burst={self.burst}>"
+
+
 class NodeFunctionError(Exception):
     """
     Exception raised when a Node's function execution fails.
@@ -55,10 +106,25 @@ class Node:
         The strategy used for joining looped variables (default is cartesian product).
     to_thread : Optional[bool]
         Flag to execute the function in a separate thread (default is False). No effect if the function is asynchronous.
+    to_process : Optional[bool]
+        Flag to execute the function in a worker process (default is False). No effect if the function is asynchronous.
     name : Optional[str]
         The name of the node (default is the function's name).
     secret : Optional[bool]
         Indicates whether the node is sensitive and should be masked in outputs (default is False).
+    max_concurrency : Optional[int]
+        Maximum number of concurrent calls of the node, or None if no limit is set.
+    rate_limit : Optional[RateLimit]
+        Rate limit for the calls of the node, or None if no limit is set.
+    cache : Optional[ResultCache]
+        Cache memoizing the results of the node per arguments, or None if results are not cached.
+    coalesce : Optional[bool]
+        Flag to share a single call between concurrent calls with equal arguments (default is False).
+    cache_namespace : Optional[str]
+        Identifies the node in the cache keys instead of its function, or None to use the identity of the function.
+    func_identity : Optional[Tuple[Callable[..., Any], str]]
+        The function of the node with its identity in the cache keys, computed on the first cached call.
+        Only kept for functions which are not bound to an instance, as its attributes may change between calls.
     """
 
     def __init__(
@@ -68,6 +134,12 @@ class Node:
         to_thread: Optional[bool] = False,
         name: Optional[str] = None,
         secret: Optional[bool] = False,
+        max_concurrency: Optional[int] = None,
+        rate_limit: Optional[Union[RateLimit, float]] = None,
+        to_process: Optional[bool] = False,
+        cache: Optional[ResultCache] = None,
+        coalesce: Optional[bool] = False,
+        cache_namespace: Optional[str] = None,
     ):
         """
         Constructs a new Node object.
@@ -84,13 +156,57 @@ class Node:
             The name of the node (default is the function's name).
         secret : Optional[bool], optional
             Indicates whether the node is sensitive and should be masked in outputs (default is False).
+        max_concurrency : Optional[int], optional
+            Maximum number of concurrent calls of the node (default is None, meaning unlimited).
+        rate_limit : Optional[Union[RateLimit, float]], optional
+            Rate limit for the calls of the node, a number is read as calls per second (default is None, meaning unlimited).
+        to_process : Optional[bool], optional
+            Flag to execute the function in a worker process (default is False). No effect if the function is asynchronous.
+            The function, its arguments and its result must be picklable.
+        cache : Optional[ResultCache], optional
+            Cache memoizing the results of the node per arguments (default is None, meaning no caching).
+            The arguments must be picklable to be hashed.
+        coalesce : Optional[bool], optional
+            Flag to share a single call between concurrent calls with equal arguments (default is False).
+            Calls are coalesced by the AsyncExecutor and HybridExecutor, the arguments must be picklable to be hashed.
+        cache_namespace : Optional[str], optional
+            Name identifying the node in the cache keys instead of its function (default is None).
+            Nodes sharing a cache and a namespace share their results.
+
+        Raises
+        ------
+        ValueError
+            If max_concurrency is not positive.
         """
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be positive")
+        if rate_limit is not None and not isinstance(rate_limit, RateLimit):
+            rate_limit = RateLimit(rate_limit)
         self.func = func
         self.loop_vars = []
         self.loop_strategy = loop_strategy
         self.to_thread = to_thread
+        self.to_process = to_process
         self.name = name or func.__name__
         self.secret = secret
+        self.max_concurrency = max_concurrency
+        self.rate_limit = rate_limit
+        self.cache = cache
+        self.coalesce = coalesce
+        self.cache_namespace = cache_namespace
+        self.func_identity: Optional[Tuple[Callable[..., Any], str]] = None
+
+    @property
+    def is_limited(self) -> bool:
+        """
+        Determines whether the calls of the node are limited.
+
+        Returns
+        -------
+        bool
+            True if a concurrency cap or rate limit is set, False otherwise.
+        """
+        return self.max_concurrency is not None or self.rate_limit is not None
 
     @property
     def is_async(self) -> bool:
@@ -125,10 +241,18 @@ class Node:
         NodeFunctionError
             If the function execution fails.
         """
+        if self.cache is not None:
+            key = cache_key(self, args, kwargs)
+            found, result = self.cache.get(key)
+            if found:
+                return result
         try:
-            return self.func(*args, **kwargs)
+            result = self.func(*args, **kwargs)
         except Exception as e:
             raise NodeFunctionError(self, e) from e
+        if self.cache is not None:
+            self.cache.set(key, result)
+        return result
 
     async def call_async(self, *args, **kwargs):
         """
@@ -151,10 +275,18 @@ class Node:
         NodeFunctionError
             If the function execution fails.
         """
+        if self.cache is not None:
+            key = cache_key(self, args, kwargs)
+            found, result = self.cache.get(key)
+            if found:
+                return result
         try:
-            return await self.func(*args, **kwargs)
+            result = await self.func(*args, **kwargs)
         except Exception as e:
             raise NodeFunctionError(self, e) from e
+        if self.cache is not None:
+            self.cache.set(key, result)
+        return result
 
     def __repr__(self):
         """
@@ -1,50 +1,242 @@
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, Set, Callable, Union
+from heapq import merge
 import pydot
 import json
+import warnings
 
 from .ignore_result import IgnoreResult
 from .node import Node
+from .store import resolve
+
+
+class ResultIndex:
+    """
+    Index of the scopes in which results were saved, used by `Scope.query` to avoid walking the scope tree.
+    The scopes are kept per key and partitioned in ignored and not ignored results.
+
+    Attributes
+    ----------
+    kept : Dict[Any, List[Scope]]
+        The scopes holding a result which is not ignored, per key.
+    ignored : Dict[Any, List[Scope]]
+        The scopes holding an IgnoreResult, per key.
+    unsorted : Set[Any]
+        The keys whose scopes were added since they were last put in scope order.
+    listener : Optional[Callable[[Any, Scope, bool], None]]
+        Called with the key, the scope and whether the result is ignored for every added result.
+    """
+
+    __slots__ = ("kept", "ignored", "unsorted", "listener")
+
+    def __init__(self) -> None:
+        """
+        Constructs an empty ResultIndex.
+        """
+        self.kept: Dict[Any, List["Scope"]] = {}
+        self.ignored: Dict[Any, List["Scope"]] = {}
+        self.unsorted: Set[Any] = set()
+        self.listener: Optional[Callable[[Any, "Scope", bool], None]] = None
+
+    def register(self, key) -> None:
+        """
+        Marks a key as indexed, so querying it never falls back to walking the tree.
+
+        Parameters
+        ----------
+        key : any
+            The key to index.
+        """
+        if key not in self.kept:
+            self.kept[key] = []
+            self.ignored[key] = []
+
+    def add(self, key, scope: "Scope", ignored: bool) -> None:
+        """
+        Adds a scope holding a result for a key.
+
+        Parameters
+        ----------
+        key : any
+            The key of the result.
+        scope : Scope
+            The scope holding the result.
+        ignored : bool
+            Whether the result is an IgnoreResult.
+        """
+        self.register(key)
+        (self.ignored if ignored else self.kept)[key].append(scope)
+        self.unsorted.add(key)
+        if self.listener is not None:
+            self.listener(key, scope, ignored)
+
+    def scopes(
+        self, key, ignored_results: Optional[bool] = None
+    ) -> Optional[List["Scope"]]:
+        """
+        Returns the scopes holding a result for a key, in the order of a depth-first walk of the tree.
+
+        Parameters
+        ----------
+        key : any
+            The key to look up.
+        ignored_results : Optional[bool], optional
+            Flag to filter results based on their type (default is None).
+
+        Returns
+        -------
+        Optional[List[Scope]]
+            The matching scopes, or None if the key is not indexed.
+        """
+        kept = self.kept.get(key)
+        if kept is None:
+            return None
+        ignored = self.ignored[key]
+        if key in self.unsorted:
+            kept.sort(key=_scope_order)
+            ignored.sort(key=_scope_order)
+            self.unsorted.discard(key)
+        if ignored_results is None:
+            return list(merge(kept, ignored, key=_scope_order))
+        return ignored if ignored_results else kept
+
+
+def _scope_order(scope: "Scope") -> Tuple[int, ...]:
+    return scope.indices
 
 
 class Scope(dict):
     """
     A class representing a hierarchical scope structure.
+    Scopes are not thread-safe, executors only write them from the thread driving the execution.
 
     Attributes
     ----------
     not_found : object
         Sentinel object used to represent a missing key.
-    parent : Optional[dict]
+    parent : Optional[Scope]
         Optional parent scope to inherit from.
-    children : list[Scope]
+    index : int
+        Position of the scope among the children of its parent.
+    depth : int
+        Number of ancestors of the scope.
+    results : Optional[ResultIndex]
+        Index of the saved results, set on the root scope by the executor.
+    children : List[Scope]
         List of child scopes.
     path : str
         Path identifying the current scope.
     """
 
+    __slots__ = ("parent", "index", "depth", "_children", "_path", "results")
+
     not_found = object()
 
     def __init__(
-        self, parent: Optional[dict] = None, path: Optional[str] = "$"
+        self,
+        parent: Optional["Scope"] = None,
+        index: Union[int, str] = 0,
+        path: Optional[str] = None,
     ) -> None:
         """
         Constructs a new Scope object.
 
+        Scopes used to be constructed with a path instead of an index, `Scope(parent, "$/0/1")`.
+        A path is still accepted, positionally or as `path`, but deprecated: the index is taken
+        from its last part, and the path is kept as the path of the scope.
+
         Parameters
         ----------
-        parent : Optional[dict], optional
+        parent : Optional[Scope], optional
             The parent scope to inherit from (default is None).
+        index : Union[int, str], optional
+            Position of the scope among the children of its parent (default is 0).
         path : Optional[str], optional
-            Path identifying the current scope (default is "$" for root).
+            Deprecated, path identifying the scope (default is None, deriving it from the indices).
         """
-        self.parent = parent
-        self.path = path
-        self.children: list["Scope"] = []
         super().__init__()
+        if isinstance(index, str):
+            index, path = 0, index
+        if path is not None:
+            warnings.warn(
+                "Constructing a Scope with a path is deprecated, pass its index instead.",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+            last = path.rsplit("/", 1)[-1]
+            index = int(last) if last.isdigit() else 0
+        self.parent = parent
+        self.index = index
+        self.depth = 0 if parent is None else parent.depth + 1
+        self._children: Optional[List["Scope"]] = None
+        self._path = path
+        self.results: Optional[ResultIndex] = None
+
+    @property
+    def children(self) -> List["Scope"]:
+        """
+        The child scopes. The list is only allocated once it is accessed or the first child is born,
+        the scope itself iterates `_children` to leave it unallocated for leaves.
+
+        Returns
+        -------
+        List[Scope]
+            The child scopes.
+        """
+        if self._children is None:
+            self._children = []
+        return self._children
+
+    @property
+    def indices(self) -> Tuple[int, ...]:
+        """
+        The positions of the scope and its ancestors below the root.
+
+        Returns
+        -------
+        Tuple[int, ...]
+            The child index at every level, starting below the root.
+        """
+        indices = []
+        scope = self
+        while scope.parent is not None:
+            indices.append(scope.index)
+            scope = scope.parent
+        return tuple(reversed(indices))
+
+    @property
+    def path(self) -> str:
+        """
+        Path identifying the current scope, for example "$/0/3/1".
+        It is built from the indices, below the path of the closest ancestor given an explicit path.
+
+        Returns
+        -------
+        str
+            The path of the scope.
+        """
+        indices = []
+        scope = self
+        while scope._path is None and scope.parent is not None:
+            indices.append(str(scope.index))
+            scope = scope.parent
+        return "/".join([scope._path or "$", *reversed(indices)])
+
+    @path.setter
+    def path(self, path: str) -> None:
+        """
+        Sets an explicit path for the scope, the paths of its descendants are built below it.
+
+        Parameters
+        ----------
+        path : str
+            The path of the scope.
+        """
+        self._path = path
 
     def query(self, key, ignored_results: Optional[bool] = None) -> List[Any]:
         """
         Queries the scope and its children for a specified key.
+        Keys in the result index of the scope are looked up without walking the tree.
 
         Parameters
         ----------
@@ -58,8 +250,13 @@ class Scope(dict):
         List[Any]
             A list of matching values from the current scope and its children.
         """
+        if self.results is not None:
+            scopes = self.results.scopes(key, ignored_results)
+            if scopes is not None:
+                return [resolve(dict.__getitem__(scope, key)) for scope in scopes]
+
         values = []
-        val = self.get(key, self.not_found)
+        val = resolve(self.get(key, self.not_found))
         if val is not self.not_found and (
             ignored_results is None
             or (ignored_results and isinstance(val, IgnoreResult))
@@ -67,7 +264,7 @@ class Scope(dict):
         ):
             values.append(val)
 
-        for child in self.children:
+        for child in self._children or ():
             values.extend(child.query(key, ignored_results=ignored_results))
         return values
 
@@ -90,11 +287,12 @@ class Scope(dict):
         KeyError
             If the key is not found in the current or parent scopes.
         """
-        val = super().get(item, self.not_found)
-        if val is not self.not_found:
-            return val
-        if self.parent is not None:
-            return self.parent[item]
+        scope = self
+        while scope is not None:
+            val = dict.get(scope, item, self.not_found)
+            if val is not self.not_found:
+                return resolve(val)
+            scope = scope.parent
         raise KeyError(item)
 
     def dump(self, mask_secrets: Optional[bool] = True) -> Dict[str, Any]:
@@ -114,11 +312,11 @@ class Scope(dict):
         return {
             str(key): "***"
             if isinstance(key, Node) and key.secret and mask_secrets
-            else value
+            else resolve(value)
             for key, value in self.items()
         } | (
-            {"children": [child.dump(mask_secrets) for child in self.children]}
-            if self.children
+            {"children": [child.dump(mask_secrets) for child in self._children]}
+            if self._children
             else {}
         )
 
@@ -142,8 +340,10 @@ class Scope(dict):
         Scope
             The newly created child scope.
         """
-        child = Scope(self, f"{self.path}/{len(self.children)}")
-        self.children.append(child)
+        if self._children is None:
+            self._children = []
+        child = Scope(self, len(self._children))
+        self._children.append(child)
         return child
 
     def __hash__(self) -> int:
@@ -188,7 +388,7 @@ class Scope(dict):
             label = json.dumps(truncated, indent=2).replace('"', "").replace("'", "")
             node = pydot.Node(id(scope), label=label)
             graph.add_node(node)
-            for child in scope.children:
+            for child in scope._children or ():
                 graph.add_edge(pydot.Edge(node, add_node(child)))
             return node
 
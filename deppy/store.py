@@ -0,0 +1,349 @@
+import mmap
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from typing import Any, Iterator, List, Optional, Set, Tuple
+
+
+class StoredResult(ABC):
+    """
+    Base class of the handles a result store keeps in a scope instead of a result.
+    Scopes load the result whenever it is read.
+    """
+
+    __slots__ = ()
+
+    @abstractmethod
+    def load(self) -> Any:  # pragma: no cover
+        """
+        Loads the stored result.
+
+        Returns
+        -------
+        Any
+            The result.
+        """
+        ...
+
+
+class ResultStore:
+    """
+    Decides how the results saved by an executor are kept in the scopes.
+    This base store keeps every result as a live object, subclasses may replace results by a `StoredResult`.
+    """
+
+    def put(self, value: Any) -> Any:
+        """
+        Stores a result.
+
+        Parameters
+        ----------
+        value : Any
+            The result to store.
+
+        Returns
+        -------
+        Any
+            The value to keep in the scope, either the result itself or a `StoredResult`.
+        """
+        return value
+
+    def reset(self) -> None:
+        """
+        Called at the start of every execution.
+        """
+
+
+def _remove_spill_file(file, path: str) -> None:
+    file.close()
+    try:
+        os.remove(path)
+    except OSError:  # pragma: no cover
+        pass
+
+
+class SpillFile:
+    """
+    An append-only temporary file holding spilled results, read through a memory map.
+    The file is removed once no result spilled to it is referenced anymore.
+
+    Attributes
+    ----------
+    path : str
+        The path of the file.
+    size : int
+        The number of bytes written.
+    """
+
+    def __init__(self, directory: Optional[str] = None) -> None:
+        """
+        Creates a new spill file.
+
+        Parameters
+        ----------
+        directory : Optional[str], optional
+            The directory to create the file in (default is the temporary directory of the system).
+        """
+        fd, self.path = tempfile.mkstemp(
+            suffix=".spill", prefix="deppy-", dir=directory
+        )
+        self.file = os.fdopen(fd, "w+b")
+        self.size = 0
+        self.map: Optional[mmap.mmap] = None
+        self.lock = threading.Lock()
+        weakref.finalize(self, _remove_spill_file, self.file, self.path)
+
+    def dump(self, value: Any) -> Tuple[int, Tuple[int, ...]]:
+        """
+        Appends a value to the file, pickled with protocol 5 straight into the file and followed by its
+        out-of-band buffers, so the pickle is never held in memory as a whole.
+        When pickling fails, the partly written pickle is overwritten by the next value.
+
+        Parameters
+        ----------
+        value : Any
+            The value to write.
+
+        Returns
+        -------
+        Tuple[int, Tuple[int, ...]]
+            The offset the pickle was written at, and the lengths of the pickle and of its buffers.
+        """
+        with self.lock:
+            offset = self.size
+            self.file.seek(offset)
+            buffers: List[pickle.PickleBuffer] = []
+            pickle.Pickler(self.file, protocol=5, buffer_callback=buffers.append).dump(
+                value
+            )
+            lengths = [self.file.tell() - offset]
+            for buffer in buffers:
+                raw = buffer.raw()
+                self.file.write(raw)
+                lengths.append(raw.nbytes)
+            self.file.flush()
+            self.size = self.file.tell()
+            return offset, tuple(lengths)
+
+    def view(self, offset: int, length: int) -> memoryview:
+        """
+        Returns a read-only view of a part of the file, without copying it.
+
+        Parameters
+        ----------
+        offset : int
+            The position of the part.
+        length : int
+            The length of the part.
+
+        Returns
+        -------
+        memoryview
+            The view of the part.
+        """
+        with self.lock:
+            if self.map is None or len(self.map) < offset + length:
+                self.map = mmap.mmap(
+                    self.file.fileno(), self.size, access=mmap.ACCESS_READ
+                )
+            return memoryview(self.map)[offset : offset + length]
+
+
+class SpilledResult(StoredResult):
+    """
+    A result pickled to a spill file, unpickled on every access.
+    Large buffers, like bytes or numpy arrays, are read straight from the memory map.
+
+    Attributes
+    ----------
+    file : SpillFile
+        The file holding the result.
+    offset : int
+        The position of the pickled result in the file.
+    lengths : Tuple[int, ...]
+        The length of the pickle, followed by the lengths of its out-of-band buffers.
+    """
+
+    __slots__ = ("file", "offset", "lengths")
+
+    def __init__(self, file: SpillFile, offset: int, lengths: Tuple[int, ...]) -> None:
+        """
+        Constructs a SpilledResult.
+
+        Parameters
+        ----------
+        file : SpillFile
+            The file holding the result.
+        offset : int
+            The position of the pickled result in the file.
+        lengths : Tuple[int, ...]
+            The length of the pickle, followed by the lengths of its out-of-band buffers.
+        """
+        self.file = file
+        self.offset = offset
+        self.lengths = lengths
+
+    def load(self) -> Any:
+        """
+        Unpickles the result from the spill file.
+
+        Returns
+        -------
+        Any
+            The result.
+        """
+        views = []
+        offset = self.offset
+        for length in self.lengths:
+            views.append(self.file.view(offset, length))
+            offset += length
+        return pickle.loads(views[0], buffers=views[1:])
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the spilled result.
+
+        Returns
+        -------
+        str
+            A string in the format <SpilledResult bytes>.
+        """
+        return f"<SpilledResult {sum(self.lengths)} bytes>"
+
+
+def estimate_size(value: Any, limit: int) -> int:
+    """
+    Estimates the size of a value in memory, without copying it.
+    Buffers count their `nbytes`, containers and plain objects count their items and attributes,
+    other objects count what their `__sizeof__` reports. Counting stops once the limit is exceeded.
+
+    Parameters
+    ----------
+    value : Any
+        The value to measure.
+    limit : int
+        The size in bytes after which counting stops.
+
+    Returns
+    -------
+    int
+        The estimated size in bytes, larger than the limit if it was exceeded.
+    """
+    total = 0
+    seen: Set[int] = set()
+    stack: List[Iterator[Any]] = [iter((value,))]
+    while stack and total <= limit:
+        item = next(stack[-1], stack)
+        if item is stack:
+            stack.pop()
+            continue
+        nbytes = getattr(item, "nbytes", None)
+        if isinstance(nbytes, int):
+            total += nbytes
+            continue
+        if isinstance(item, dict):
+            children = (child for pair in item.items() for child in pair)
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            children = iter(item)
+        elif hasattr(item, "__dict__") and type(item).__sizeof__ is object.__sizeof__:
+            children = iter((vars(item),))
+        else:
+            children = None
+        if children is not None:
+            # Shared and recursive containers are only counted once
+            if id(item) in seen:
+                continue
+            seen.add(id(item))
+            stack.append(children)
+        total += sys.getsizeof(item)
+    return total
+
+
+class SpillStore(ResultStore):
+    """
+    A result store writing results larger than a threshold to disk, to keep them out of memory.
+    Results are pickled with protocol 5, keeping large buffers out-of-band, and appended to a
+    memory-mapped spill file per execution. The file is removed once its results are no longer referenced.
+
+    Attributes
+    ----------
+    threshold : int
+        The estimated size in bytes above which a result is spilled.
+    directory : Optional[str]
+        The directory the spill files are created in, or None for the temporary directory of the system.
+    file : Optional[SpillFile]
+        The spill file of the current execution, created on the first spilled result.
+    """
+
+    def __init__(
+        self, threshold: int = 64 * 1024 * 1024, directory: Optional[str] = None
+    ) -> None:
+        """
+        Constructs a SpillStore.
+
+        Parameters
+        ----------
+        threshold : int, optional
+            The estimated size in bytes above which a result is spilled (default is 64 MiB).
+        directory : Optional[str], optional
+            The directory to create the spill files in (default is the temporary directory of the system).
+        """
+        self.threshold = threshold
+        self.directory = directory
+        self.file: Optional[SpillFile] = None
+
+    def put(self, value: Any) -> Any:
+        """
+        Spills a result to disk if its estimated size in memory exceeds the threshold.
+        The size is estimated without pickling the result, which is only pickled when it is spilled.
+        A result which cannot be pickled is kept in memory.
+
+        Parameters
+        ----------
+        value : Any
+            The result to store.
+
+        Returns
+        -------
+        Any
+            The result itself, or a SpilledResult.
+        """
+        if value is None or isinstance(value, (bool, int, float)):
+            return value
+        if estimate_size(value, self.threshold) <= self.threshold:
+            return value
+
+        if self.file is None:
+            self.file = SpillFile(self.directory)
+        try:
+            offset, lengths = self.file.dump(value)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return value
+        return SpilledResult(self.file, offset, lengths)
+
+    def reset(self) -> None:
+        """
+        Starts a new spill file for the next execution, the previous one lives on while its results are referenced.
+        """
+        self.file = None
+
+
+def resolve(value: Any) -> Any:
+    """
+    Loads a value kept by a result store, other values are returned as is.
+
+    Parameters
+    ----------
+    value : Any
+        A value read from a scope.
+
+    Returns
+    -------
+    Any
+        The result.
+    """
+    return value.load() if isinstance(value, StoredResult) else value
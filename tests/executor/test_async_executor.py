@@ -1,4 +1,8 @@
+import asyncio
+import pytest
+
 from deppy.deppy import Deppy
+from deppy.ignore_result import IgnoreResult
 from deppy.executor import AsyncExecutor
 
 
@@ -60,3 +64,298 @@ async def test_execute_async_with_max_concurrent_tasks():
     root_scope = await executor.execute_async()
 
     assert root_scope[node3] == 11  # (5 * 2) + 1
+
+
+async def test_execute_async_dataflow():
+    deppy = Deppy()
+    executor = AsyncExecutor(deppy, dataflow=True)
+    finished = []
+
+    async def slow():
+        await asyncio.sleep(0.2)
+        finished.append("slow")
+        return 1
+
+    async def fast():
+        finished.append("fast")
+        return 2
+
+    async def after_fast(x):
+        finished.append("after_fast")
+        return x + 1
+
+    async def join(a, b):
+        return a + b
+
+    slow_node = deppy.add_node(func=slow)
+    fast_node = deppy.add_node(func=fast)
+    after_fast_node = deppy.add_node(func=after_fast)
+    join_node = deppy.add_node(func=join)
+
+    deppy.add_edge(fast_node, after_fast_node, input_name="x")
+    deppy.add_edge(slow_node, join_node, input_name="a")
+    deppy.add_edge(after_fast_node, join_node, input_name="b")
+
+    root_scope = await executor.execute_async()
+
+    assert root_scope[join_node] == 4
+    assert finished == ["fast", "after_fast", "slow"]
+
+
+async def test_execute_async_dataflow_error_cancels_running_nodes():
+    deppy = Deppy()
+    executor = AsyncExecutor(deppy, dataflow=True)
+    cancelled = asyncio.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def failing():
+        raise ValueError("boom")
+
+    deppy.add_node(func=slow)
+    deppy.add_node(func=failing)
+
+    with pytest.raises(ValueError, match="boom"):
+        await executor.execute_async()
+    await asyncio.sleep(0)
+    assert cancelled.is_set()
+
+
+async def test_execute_async_streaming():
+    deppy = Deppy()
+    executor = AsyncExecutor(deppy, streaming=True)
+    finished = []
+
+    async def items():
+        return [3, 1, 2]
+
+    async def fetch(item):
+        await asyncio.sleep(item / 10)
+        finished.append(("fetch", item))
+        return item * 10
+
+    async def process(value):
+        finished.append(("process", value))
+        return value + 1
+
+    items_node = deppy.add_node(func=items)
+    fetch_node = deppy.add_node(func=fetch)
+    process_node = deppy.add_node(func=process)
+
+    deppy.add_edge(items_node, fetch_node, input_name="item", loop=True)
+    deppy.add_edge(fetch_node, process_node, input_name="value")
+
+    root_scope = await executor.execute_async()
+
+    assert root_scope.query(process_node) == [31, 11, 21]
+    assert finished.index(("process", 10)) < finished.index(("fetch", 3))
+    assert finished.index(("process", 20)) < finished.index(("fetch", 3))
+
+
+async def test_execute_async_streaming_joins_and_ignored_results():
+    deppy = Deppy()
+    executor = AsyncExecutor(deppy, streaming=True)
+
+    async def items():
+        return [1, 2, 3, 4]
+
+    async def offset():
+        return 100
+
+    async def keep_even(item):
+        return item if item % 2 == 0 else IgnoreResult()
+
+    async def square(item):
+        await asyncio.sleep(0.01)
+        return item * item
+
+    async def combine(item, squared, offset):
+        return item + squared + offset
+
+    items_node = deppy.add_node(func=items)
+    offset_node = deppy.add_node(func=offset)
+    even_node = deppy.add_node(func=keep_even)
+    square_node = deppy.add_node(func=square)
+    combine_node = deppy.add_node(func=combine)
+
+    deppy.add_edge(items_node, even_node, input_name="item", loop=True)
+    deppy.add_edge(even_node, square_node, input_name="item")
+    deppy.add_edge(even_node, combine_node, input_name="item")
+    deppy.add_edge(square_node, combine_node, input_name="squared")
+    deppy.add_edge(offset_node, combine_node, input_name="offset")
+
+    root_scope = await executor.execute_async()
+
+    assert root_scope.query(combine_node) == [106, 120]
+    assert len(executor.scope_map[even_node]) == 2
+
+
+async def test_execute_async_streaming_rejects_separately_looped_predecessors():
+    deppy = Deppy()
+    executor = AsyncExecutor(deppy, streaming=True)
+
+    async def items():
+        return [1, 2]
+
+    async def identity(x):
+        return x
+
+    async def total(x, y):
+        return x + y
+
+    items_node = deppy.add_node(func=items)
+    first_node = deppy.add_node(func=identity, name="first")
+    second_node = deppy.add_node(func=identity, name="second")
+    total_node = deppy.add_node(func=total)
+    deppy.add_edge(items_node, first_node, input_name="x", loop=True)
+    deppy.add_edge(items_node, second_node, input_name="x", loop=True)
+    deppy.add_edge(first_node, total_node, input_name="x")
+    deppy.add_edge(second_node, total_node, input_name="y")
+
+    with pytest.raises(ValueError, match="looped over separately"):
+        await executor.execute_async()
+
+
+async def test_execute_async_bounded_in_flight():
+    deppy = Deppy()
+    executor = AsyncExecutor(deppy, max_in_flight=3)
+    running = 0
+    peak = 0
+
+    async def work(x, y):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.001 * (x + y) % 3)
+        running -= 1
+        return x * y
+
+    async def get_xs():
+        return [1, 2, 3, 4]
+
+    async def get_ys():
+        return [1, 10]
+
+    xs = deppy.add_node(func=get_xs)
+    ys = deppy.add_node(func=get_ys)
+    worker = deppy.add_node(func=work, name="work")
+    deppy.add_edge(xs, worker, input_name="x", loop=True)
+    deppy.add_edge(ys, worker, input_name="y", loop=True)
+
+    root_scope = await executor.execute_async()
+
+    assert root_scope.query(worker) == [1, 10, 2, 20, 3, 30, 4, 40]
+    assert peak == 3
+
+    executor.streaming = True
+    peak = 0
+    root_scope = await executor.execute_async()
+    assert root_scope.query(worker) == [1, 10, 2, 20, 3, 30, 4, 40]
+    assert peak == 3
+
+
+async def test_execute_async_streaming_bounds_calls_across_scopes():
+    deppy = Deppy()
+    executor = AsyncExecutor(deppy, max_in_flight=10, streaming=True)
+    running = 0
+    peak = 0
+
+    async def items():
+        return list(range(500))
+
+    async def item(x):
+        return x
+
+    async def fetch(x):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.001)
+        running -= 1
+        return x
+
+    items_node = deppy.add_node(func=items)
+    item_node = deppy.add_node(func=item)
+    fetch_node = deppy.add_node(func=fetch)
+    deppy.add_edge(items_node, item_node, input_name="x", loop=True)
+    deppy.add_edge(item_node, fetch_node, input_name="x")
+
+    root_scope = await executor.execute_async()
+
+    assert sorted(root_scope.query(fetch_node)) == list(range(500))
+    assert peak == 10
+
+
+async def test_gather_bounded_starts_no_more_workers_than_calls():
+    executor = AsyncExecutor(Deppy())
+    tasks = []
+
+    async def call(x):
+        tasks.append(len(asyncio.all_tasks()))
+        return x
+
+    assert await executor.gather_bounded((call(x) for x in range(2)), 1024) == [0, 1]
+    assert await executor.gather_bounded(iter(()), 1024) == []
+    # The test task and the two workers
+    assert tasks == [3, 3]
+
+
+async def test_execute_async_worker_pool_pulls_calls_lazily():
+    deppy = Deppy()
+    executor = AsyncExecutor(deppy, max_concurrent_tasks=2)
+    pulled = 0
+    finished = 0
+    pending = []
+
+    async def items():
+        return list(range(50))
+
+    def strategy(values):
+        nonlocal pulled
+        for value in values:
+            pulled += 1
+            yield (value,)
+
+    async def work(x):
+        nonlocal finished
+        pending.append(pulled - finished)
+        await asyncio.sleep(0)
+        finished += 1
+        return x
+
+    items_node = deppy.add_node(func=items)
+    work_node = deppy.add_node(func=work, loop_strategy=strategy)
+    deppy.add_edge(items_node, work_node, input_name="x", loop=True)
+
+    root_scope = await executor.execute_async()
+
+    assert root_scope.query(work_node) == list(range(50))
+    assert max(pending) <= 2
+    assert executor.dispatch_width(work_node) == 2
+
+
+async def test_execute_async_coalesces_equal_calls():
+    calls = []
+
+    async def breeds():
+        return ["hound", "pug", "hound"]
+
+    async def images(breed):
+        calls.append(breed)
+        await asyncio.sleep(0.01)
+        return f"{breed}.jpg"
+
+    deppy = Deppy()
+    breeds_node = deppy.add_node(breeds)
+    images_node = deppy.add_node(images, coalesce=True)
+    deppy.add_edge(breeds_node, images_node, "breed", loop=True)
+
+    result = await AsyncExecutor(deppy).execute_async()
+
+    assert result.query(images_node) == ["hound.jpg", "pug.jpg", "hound.jpg"]
+    assert sorted(calls) == ["hound", "pug"]
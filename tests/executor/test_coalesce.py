@@ -0,0 +1,93 @@
+import asyncio
+import threading
+
+import pytest
+
+from deppy import Deppy
+from deppy.executor import AsyncExecutor
+from deppy.executor.coalesce import SingleFlight
+
+
+async def test_single_flight_shares_concurrent_calls():
+    calls = []
+    flights = SingleFlight()
+
+    async def fetch(x):
+        calls.append(x)
+        await asyncio.sleep(0.01)
+        return x * 10
+
+    results = await asyncio.gather(
+        flights.call("a", fetch, x=1),
+        flights.call("a", fetch, x=1),
+        flights.call("b", fetch, x=2),
+    )
+
+    assert results == [10, 10, 20]
+    assert calls == [1, 2]
+    assert len(flights) == 0
+    assert await flights.call("a", fetch, x=1) == 10
+    assert calls == [1, 2, 1]
+
+
+async def test_single_flight_shares_errors():
+    flights = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(
+        flights.call("a", fail), flights.call("a", fail), return_exceptions=True
+    )
+
+    assert [type(result) for result in results] == [ValueError, ValueError]
+
+
+async def test_single_flight_cancels_when_every_caller_is_cancelled():
+    flights = SingleFlight()
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def hang():
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    first = asyncio.create_task(flights.call("a", hang))
+    second = asyncio.create_task(flights.call("a", hang))
+    await started.wait()
+
+    first.cancel()
+    await asyncio.sleep(0)
+    assert not cancelled.is_set()
+
+    second.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await second
+    await asyncio.wait_for(cancelled.wait(), 1)
+
+
+async def test_coalesced_node_calls_unhashable_arguments_on_their_own():
+    calls = []
+
+    async def locks():
+        return [threading.Lock(), threading.Lock()]
+
+    async def check(lock):
+        calls.append(lock)
+        await asyncio.sleep(0.01)
+        return lock.locked()
+
+    deppy = Deppy()
+    locks_node = deppy.add_node(locks)
+    check_node = deppy.add_node(check, coalesce=True)
+    deppy.add_edge(locks_node, check_node, "lock", loop=True)
+
+    root = await AsyncExecutor(deppy).execute_async()
+
+    assert root.query(check_node) == [False, False]
+    assert len(calls) == 2
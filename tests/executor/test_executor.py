@@ -1,7 +1,8 @@
 from networkx import MultiDiGraph
 from deppy.node import Node
-from deppy.scope import Scope
+from deppy.scope import Scope, ResultIndex
 from deppy.executor.executor import Executor
+from deppy.executor import SyncExecutor, AsyncExecutor
 from deppy.ignore_result import IgnoreResult
 from deppy import Deppy
 
@@ -48,6 +49,33 @@ def test_save_results_with_loop():
         assert saved_scope[node] == result
 
 
+def test_save_results_with_index():
+    scope = Scope()
+    index = ResultIndex()
+    node = Node(func=lambda: 1, name="Node1")
+    node.loop_vars = [("var", node)]
+    results = [10, IgnoreResult(), 20]
+
+    saved_scopes = Executor.save_results(node, results, scope, index)
+
+    assert len(saved_scopes) == 2
+    assert set(index.kept[node]) == saved_scopes
+    assert len(index.ignored[node]) == 1
+    scope.results = index
+    assert scope.query(node, ignored_results=False) == [10, 20]
+
+
+def test_setup_indexes_plan_nodes():
+    deppy = Deppy()
+    node1 = deppy.add_node(func=lambda: 1, name="Node1")
+    executor = Executor(deppy)
+
+    executor.setup()
+
+    assert executor.root.query(node1) == []
+    assert node1 in executor.root.results.kept
+
+
 def test_create_flow_graph():
     def mock_deppy():
         pass
@@ -84,6 +112,20 @@ def test_setup():
     assert isinstance(executor.root, Scope)
 
 
+def test_setup_uses_deppy_plan():
+    deppy = Deppy()
+    executor = Executor(deppy=deppy)
+
+    node1 = deppy.add_node(func=lambda: 1, name="Node1")
+    node2 = deppy.add_node(func=lambda x: 2, name="Node2")
+    deppy.add_edge(node1, node2, "x")
+
+    executor.setup(node2)
+
+    assert executor.flow_graph.has_edge(node1, node2)
+    assert executor.plan is deppy.plan(node2)
+
+
 def test_resolve_args_without_loop():
     executor = Executor(deppy=None)
     graph = MultiDiGraph()
@@ -123,6 +165,53 @@ def test_resolve_args_with_loop():
     assert resolved_args[2]["x"] == 3
 
 
+def test_iter_args_is_lazy():
+    executor = Executor(deppy=None)
+    graph = MultiDiGraph()
+    node1 = Node(func=lambda: 1, name="Node1")
+    node2 = Node(func=lambda x: x, name="Node2")
+    graph.add_edge(node1, node2, key="x")
+    consumed = []
+
+    def strategy(values):
+        for value in values:
+            consumed.append(value)
+            yield (value,)
+
+    node2.loop_vars = [("x", node1)]
+    node2.loop_strategy = strategy
+    executor.flow_graph = graph
+
+    scope = Scope()
+    scope[node1] = [1, 2, 3]
+
+    call_args = executor.iter_args(node2, scope)
+    assert consumed == []
+    assert next(call_args) == {"x": 1}
+    assert consumed == [1]
+
+
+def test_lookup_args_from_nested_scope():
+    deppy = Deppy()
+    const = deppy.add_node(func=lambda: 1, name="const")
+    items = deppy.add_node(func=lambda: [1, 2], name="items")
+    item = deppy.add_node(func=lambda x: x, name="item")
+    total = deppy.add_node(func=lambda x, y: x + y, name="total")
+    deppy.add_edge(items, item, "x", loop=True)
+    deppy.add_edge(item, total, "x")
+    deppy.add_edge(const, total, "y")
+    executor = Executor(deppy)
+    executor.setup()
+
+    executor.root[const] = 1
+    executor.root[items] = [1, 2]
+    (child,) = executor.save_results(item, [5], executor.root)
+
+    assert executor.lookup_args(total, child) == {"x": 5, "y": 1}
+    # Scopes built outside the plan are still resolved through their parents
+    assert executor.lookup_args(total, child.birth()) == {"x": 5, "y": 1}
+
+
 def test_save_results_with_ignore_result():
     scope = Scope()
     node = Node(func=lambda: 1, name="Node1")
@@ -142,3 +231,123 @@ def test_save_results_with_ignore_result():
 
     # Ensure the IgnoreResult instance does not create a scope
     assert ignore_result_instance not in saved_scope.values()
+
+
+def test_predecessor_counts_and_release_successors():
+    deppy = Deppy()
+    node1 = deppy.add_node(func=lambda: 1, name="Node1")
+    node2 = deppy.add_node(func=lambda: 2, name="Node2")
+    node3 = deppy.add_node(func=lambda x, y, z: x, name="Node3")
+    deppy.add_edge(node1, node3, "x")
+    deppy.add_edge(node1, node3, "y")
+    deppy.add_edge(node2, node3, "z")
+
+    executor = Executor(deppy=deppy)
+    executor.setup()
+
+    counts = executor.predecessor_counts()
+    assert dict(zip(executor.plan.nodes, counts)) == {node1: 0, node2: 0, node3: 2}
+
+    assert executor.release_successors(node1, counts) == set()
+    assert executor.release_successors(node2, counts) == {node3}
+
+
+def test_scope_depths():
+    deppy = Deppy()
+    items = deppy.add_node(func=lambda: [1, 2], name="items")
+    const = deppy.add_node(func=lambda: 1, name="const")
+    item = deppy.add_node(func=lambda x: x, name="item")
+    total = deppy.add_node(func=lambda x, y: x + y, name="total")
+    deppy.add_edge(items, item, "x", loop=True)
+    deppy.add_edge(item, total, "x")
+    deppy.add_edge(const, total, "y")
+
+    executor = Executor(deppy=deppy)
+    executor.setup()
+
+    assert executor.scope_depths() == {items: 0, const: 0, item: 2, total: 2}
+
+
+def test_evict_results():
+    for dataflow in (False, True):
+        deppy = Deppy()
+        executor = SyncExecutor(deppy, dataflow=dataflow, evict_results=True)
+        items = deppy.add_const([1, 2], name="items")
+        raw = deppy.add_node(lambda x: {"value": x}, name="raw")
+        parsed = deppy.add_node(lambda raw: raw["value"], name="parsed")
+        total = deppy.add_node(lambda parsed, items: parsed + len(items), name="total")
+        deppy.add_edge(items, raw, "x", loop=True)
+        deppy.add_edge(raw, parsed, "raw")
+        deppy.add_edge(parsed, total, "parsed")
+        deppy.add_edge(items, total, "items")
+
+        root = executor.execute_sync()
+        assert sorted(root.query(total)) == [3, 4]
+        assert root.query(raw) == []
+        assert root.query(parsed) == []
+        assert root.query(items) == []
+        assert all(raw not in scope for scope in root.children[0].children)
+
+        root = executor.execute_sync(parsed)
+        assert sorted(root.query(parsed)) == [1, 2]
+        assert root.query(raw) == []
+
+
+def test_evict_results_keeps_outputs():
+    deppy = Deppy()
+    deppy.executor = SyncExecutor(deppy, evict_results=True)
+    items = deppy.add_const([1, 2], name="items")
+    item = deppy.add_output(items, "item", loop=True)
+    double = deppy.add_node(lambda x: x * 2, name="double")
+    deppy.add_edge(item, double, "x")
+
+    root = deppy.execute()
+    assert root.query(double) == [2, 4]
+    assert root.query(item) == [1, 2]
+    assert root.query(items) == []
+
+    root = deppy.execute(double)
+    assert root.query(item) == [1, 2]
+
+
+async def test_evict_results_async():
+    async def fetch():
+        return {"rows": [1, 2, 3]}
+
+    async def count(raw):
+        return len(raw["rows"])
+
+    deppy = Deppy()
+    fetch_node = deppy.add_node(fetch)
+    count_node = deppy.add_node(count)
+    deppy.add_edge(fetch_node, count_node, "raw")
+
+    root = await AsyncExecutor(deppy, evict_results=True).execute_async()
+
+    assert root[count_node] == 3
+    assert root.query(fetch_node) == []
+
+
+def test_evict_results_incremental():
+    calls = []
+
+    def fetch(x):
+        calls.append(x)
+        return x
+
+    deppy = Deppy()
+    deppy.executor = SyncExecutor(deppy, evict_results=True)
+    source = deppy.add_const(1, name="source")
+    offset = deppy.add_const(10, name="offset")
+    fetch_node = deppy.add_node(fetch)
+    total = deppy.add_node(lambda x, y: x + y, name="total")
+    deppy.add_edge(source, fetch_node, "x")
+    deppy.add_edge(fetch_node, total, "x")
+    deppy.add_edge(offset, total, "y")
+
+    deppy.execute_incremental()
+    deppy.set_value(offset, 20)
+    root = deppy.execute_incremental()
+
+    assert root[total] == 21
+    assert calls == [1, 1]
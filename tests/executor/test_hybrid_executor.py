@@ -1,3 +1,6 @@
+import asyncio
+import threading
+
 from deppy.deppy import Deppy
 from deppy.executor import HybridExecutor
 
@@ -25,3 +28,125 @@ async def test_execute_hybrid():
     root_scope = await executor.execute_hybrid()
 
     assert root_scope[node3] == 11  # (5 * 2) + 1
+
+
+async def test_execute_hybrid_dataflow():
+    deppy = Deppy()
+    executor = HybridExecutor(deppy, dataflow=True)
+    finished = []
+
+    async def slow():
+        await asyncio.sleep(0.2)
+        finished.append("slow")
+        return 1
+
+    def fast():
+        finished.append("fast")
+        return 2
+
+    async def after_fast(x):
+        finished.append("after_fast")
+        return x + 1
+
+    slow_node = deppy.add_node(func=slow)
+    fast_node = deppy.add_node(func=fast)
+    after_fast_node = deppy.add_node(func=after_fast)
+    join_node = deppy.add_node(func=lambda a, b: a + b, name="join")
+
+    deppy.add_edge(fast_node, after_fast_node, input_name="x")
+    deppy.add_edge(slow_node, join_node, input_name="a")
+    deppy.add_edge(after_fast_node, join_node, input_name="b")
+
+    root_scope = await executor.execute_hybrid()
+
+    assert root_scope[join_node] == 4
+    assert finished == ["fast", "after_fast", "slow"]
+
+
+def test_hybrid_executor_forwards_thread_workers():
+    deppy = Deppy()
+    executor = HybridExecutor(deppy, max_thread_workers=3)
+
+    assert executor.thread_pool._max_workers == 3
+
+
+async def test_execute_hybrid_streaming():
+    deppy = Deppy()
+    executor = HybridExecutor(deppy, streaming=True)
+    threads = set()
+
+    items_node = deppy.add_const(value=[1, 2, 3], name="items")
+
+    async def fetch(item):
+        await asyncio.sleep(item / 100)
+        return item * 10
+
+    def parse(value):
+        threads.add(threading.get_ident())
+        return value + 1
+
+    fetch_node = deppy.add_node(func=fetch)
+    parse_node = deppy.add_node(func=parse, to_thread=True)
+    label_node = deppy.add_node(func=lambda value: f"item {value}", name="label")
+
+    deppy.add_edge(items_node, fetch_node, input_name="item", loop=True)
+    deppy.add_edge(fetch_node, parse_node, input_name="value")
+    deppy.add_edge(parse_node, label_node, input_name="value")
+
+    root_scope = await executor.execute_hybrid()
+
+    assert root_scope.query(label_node) == ["item 11", "item 21", "item 31"]
+    assert threading.get_ident() not in threads
+
+
+async def test_execute_hybrid_overlaps_threaded_and_async_nodes():
+    import time
+
+    for to_thread, sync_to_thread in ((True, False), (False, True)):
+        deppy = Deppy()
+        executor = HybridExecutor(deppy, sync_to_thread=sync_to_thread)
+        threads = []
+
+        async def fetch():
+            await asyncio.sleep(0.2)
+            return 1
+
+        def parse():
+            threads.append(threading.current_thread())
+            time.sleep(0.2)
+            return 2
+
+        fetch_node = deppy.add_node(func=fetch)
+        parse_node = deppy.add_node(func=parse, to_thread=to_thread)
+        join_node = deppy.add_node(func=lambda a, b: a + b, name="join")
+        deppy.add_edge(fetch_node, join_node, input_name="a")
+        deppy.add_edge(parse_node, join_node, input_name="b")
+
+        start = time.monotonic()
+        root_scope = await executor.execute_hybrid()
+
+        assert time.monotonic() - start < 0.35
+        assert root_scope[join_node] == 3
+        assert threads[0] is not threading.main_thread()
+
+
+async def test_execute_hybrid_runs_plain_sync_nodes_inline():
+    deppy = Deppy()
+    executor = HybridExecutor(deppy)
+    threads = []
+
+    async def fetch():
+        return 1
+
+    def parse(x):
+        threads.append(threading.current_thread())
+        return x + 1
+
+    fetch_node = deppy.add_node(func=fetch)
+    parse_node = deppy.add_node(func=parse)
+    deppy.add_edge(fetch_node, parse_node, input_name="x")
+
+    root_scope = await executor.execute_hybrid()
+
+    assert root_scope[parse_node] == 2
+    assert threads == [threading.main_thread()]
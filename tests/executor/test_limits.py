@@ -0,0 +1,163 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from deppy import Deppy, RateLimit
+from deppy.executor import AsyncExecutor, HybridExecutor, SyncExecutor
+from deppy.executor.limits import TokenBucket
+
+
+def test_token_bucket_reserves_future_tokens(monkeypatch):
+    monkeypatch.setattr(time, "monotonic", lambda: 100.0)
+    bucket = TokenBucket(RateLimit(10, burst=2))
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.1)
+    assert bucket.reserve() == pytest.approx(0.2)
+
+    monkeypatch.setattr(time, "monotonic", lambda: 101.0)
+    assert bucket.reserve() == 0
+
+
+async def test_async_executor_per_node_concurrency():
+    deppy = Deppy()
+    executor = AsyncExecutor(deppy)
+    running = {"api": 0, "transform": 0}
+    peak = {"api": 0, "transform": 0}
+
+    def tracked(kind):
+        async def call(x):
+            running[kind] += 1
+            peak[kind] = max(peak[kind], running[kind])
+            await asyncio.sleep(0.001)
+            running[kind] -= 1
+            return x
+
+        return call
+
+    async def items():
+        return list(range(20))
+
+    items_node = deppy.add_node(func=items)
+    api = deppy.add_node(func=tracked("api"), name="api", max_concurrency=3)
+    transform = deppy.add_node(func=tracked("transform"), name="transform")
+    deppy.add_edge(items_node, api, input_name="x", loop=True)
+    deppy.add_edge(items_node, transform, input_name="x", loop=True)
+
+    root_scope = await executor.execute_async()
+
+    assert root_scope.query(api) == list(range(20))
+    assert peak["api"] == 3
+    assert peak["transform"] == 20
+
+
+async def test_async_executor_rate_limit():
+    deppy = Deppy()
+    executor = AsyncExecutor(deppy, streaming=True)
+
+    async def items():
+        return list(range(5))
+
+    async def api(x):
+        return time.monotonic()
+
+    items_node = deppy.add_node(func=items)
+    api_node = deppy.add_node(func=api, rate_limit=RateLimit(50, burst=1))
+    deppy.add_edge(items_node, api_node, input_name="x", loop=True)
+
+    root_scope = await executor.execute_async()
+
+    times = sorted(root_scope.query(api_node))
+    assert times[-1] - times[0] >= 4 / 50 * 0.9
+
+
+async def test_hybrid_executor_limits_threaded_nodes():
+    lock = threading.Lock()
+    running = [0]
+    peak = [0]
+
+    def fetch(x):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.005)
+        with lock:
+            running[0] -= 1
+        return x * 2
+
+    for dataflow in (False, True):
+        deppy = Deppy()
+        deppy.executor = HybridExecutor(deppy, dataflow=dataflow)
+        items_node = deppy.add_const(list(range(8)))
+        fetch_node = deppy.add_node(func=fetch, to_thread=True, max_concurrency=2)
+        deppy.add_edge(items_node, fetch_node, input_name="x", loop=True)
+
+        root_scope = await deppy.executor.execute_hybrid()
+
+        assert root_scope.query(fetch_node) == [x * 2 for x in range(8)]
+        assert peak[0] == 2
+
+
+def test_sync_executor_limits():
+    lock = threading.Lock()
+    running = [0]
+    peak = [0]
+
+    def fetch(x):
+        started = time.monotonic()
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.002)
+        with lock:
+            running[0] -= 1
+        return started
+
+    deppy = Deppy()
+    items_node = deppy.add_const(list(range(6)))
+    fetch_node = deppy.add_node(
+        func=fetch,
+        to_thread=True,
+        max_concurrency=2,
+        rate_limit=RateLimit(100, burst=1),
+    )
+    inline_node = deppy.add_node(func=lambda x: time.monotonic(), rate_limit=100)
+    deppy.add_edge(items_node, fetch_node, input_name="x", loop=True)
+    deppy.add_edge(items_node, inline_node, input_name="x", loop=True)
+
+    begin = time.monotonic()
+    root_scope = deppy.execute()
+
+    assert peak[0] <= 2
+    for node in (fetch_node, inline_node):
+        times = sorted(root_scope.query(node))
+        assert len(times) == 6
+    times = sorted(root_scope.query(fetch_node))
+    assert times[-1] - begin >= 5 / 100 * 0.9
+
+
+def test_sync_executor_throttled_calls_leave_pool_free():
+    deppy = Deppy()
+    deppy.executor = SyncExecutor(deppy, max_thread_workers=1)
+    items_node = deppy.add_const(list(range(4)))
+    limited_node = deppy.add_node(
+        func=lambda x: time.monotonic(),
+        name="limited",
+        to_thread=True,
+        rate_limit=RateLimit(20, burst=1),
+    )
+    free_node = deppy.add_node(
+        func=lambda x: time.monotonic(), name="free", to_thread=True
+    )
+    deppy.add_edge(items_node, limited_node, input_name="x", loop=True)
+    deppy.add_edge(items_node, free_node, input_name="x", loop=True)
+
+    root_scope = deppy.execute()
+    deppy.executor.shutdown()
+
+    limited = sorted(root_scope.query(limited_node))
+    assert limited[-1] - limited[0] >= 3 / 20 * 0.9
+    assert max(root_scope.query(free_node)) < limited[1]
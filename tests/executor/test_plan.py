@@ -0,0 +1,98 @@
+import pytest
+
+from deppy import Deppy
+from deppy.executor import ExecutionPlan
+
+
+def test_plan_structure():
+    deppy = Deppy()
+    items = deppy.add_node(func=lambda: [1, 2], name="items")
+    const = deppy.add_node(func=lambda: 1, name="const")
+    item = deppy.add_node(func=lambda x: x, name="item")
+    total = deppy.add_node(func=lambda x, y: x + y, name="total")
+    unused = deppy.add_node(func=lambda: 0, name="unused")
+    deppy.add_edge(items, item, "x", loop=True)
+    deppy.add_edge(item, total, "x")
+    deppy.add_edge(const, total, "y")
+
+    plan = ExecutionPlan(deppy.graph, [total])
+
+    assert unused not in plan.flow_graph
+    assert plan.levels == [{items, const}, {item}, {total}]
+    assert plan.nodes.index(items) < plan.nodes.index(item) < plan.nodes.index(total)
+    assert plan.predecessor_counts[plan.index[total]] == 2
+    assert plan.successor_indices[plan.index[item]] == (plan.index[total],)
+    assert set(plan.arguments[total]) == {(item, "x"), (const, "y")}
+    assert plan.loop_keys[item] == ("x",)
+    assert plan.loop_keys[total] == ()
+    assert plan.depths == {items: 0, const: 0, item: 2, total: 2}
+    assert plan.drivers == {item: items, total: item}
+    assert plan.lookups[total] == ((item, "x", 2), (const, "y", 0))
+
+
+def test_plan_levels_with_parallel_edges():
+    deppy = Deppy()
+    node1 = deppy.add_node(func=lambda: 1, name="node1")
+    node2 = deppy.add_node(func=lambda x, y: x + y, name="node2")
+    deppy.add_edge(node1, node2, "x")
+    deppy.add_edge(node1, node2, "y")
+
+    plan = ExecutionPlan(deppy.graph)
+
+    assert plan.levels == [{node1}, {node2}]
+    assert deppy.execute()[node2] == 2
+
+
+def test_deppy_caches_plans_until_graph_changes():
+    deppy = Deppy()
+    node1 = deppy.add_node(func=lambda: 1, name="node1")
+
+    plan = deppy.plan()
+    assert deppy.plan() is plan
+    assert deppy.plan(node1) is not plan
+    assert deppy.plan(node1) is deppy.plan(node1)
+
+    node2 = deppy.add_node(func=lambda x: x + 1, name="node2")
+    assert deppy.plan() is not plan
+    assert node2 in deppy.plan().flow_graph
+
+    plan = deppy.plan()
+    deppy.add_edge(node1, node2, "x")
+    assert deppy.plan() is not plan
+    assert deppy.execute()[node2] == 2
+
+
+def test_plan_restrict():
+    deppy = Deppy()
+    source = deppy.add_const(1, name="source")
+    other = deppy.add_const(2, name="other")
+    middle = deppy.add_node(lambda x: x, name="middle")
+    sink = deppy.add_node(lambda x, y: x + y, name="sink")
+    deppy.add_edge(source, middle, "x")
+    deppy.add_edge(middle, sink, "x")
+    deppy.add_edge(other, sink, "y")
+
+    plan = ExecutionPlan(deppy.graph).restrict(frozenset({middle, sink}))
+
+    assert plan.nodes == [middle, sink]
+    assert plan.levels == [frozenset({middle}), frozenset({sink})]
+    assert plan.predecessor_counts == [0, 1]
+    assert plan.successor_indices == [(1,), ()]
+    assert set(plan.predecessors[sink]) == {middle, other}
+
+
+def test_plan_rejects_separately_looped_predecessors():
+    deppy = Deppy()
+    items = deppy.add_node(func=lambda: [1, 2], name="items")
+    first = deppy.add_node(func=lambda x: x, name="first")
+    second = deppy.add_node(func=lambda x: x, name="second")
+    total = deppy.add_node(func=lambda x, y: x + y, name="total")
+    deppy.add_edge(items, first, "x", loop=True)
+    deppy.add_edge(items, second, "x", loop=True)
+    deppy.add_edge(first, total, "x")
+    deppy.add_edge(second, total, "y")
+
+    with pytest.raises(ValueError, match="looped over separately"):
+        ExecutionPlan(deppy.graph)
+
+    ExecutionPlan(deppy.graph, [first, second])
@@ -0,0 +1,148 @@
+import asyncio
+import gc
+import os
+
+import pytest
+
+from deppy import MemoryCache
+from deppy.deppy import Deppy
+from deppy.node import NodeFunctionError
+from deppy.executor import SyncExecutor, HybridExecutor
+
+
+def square(x):
+    return x * x, os.getpid()
+
+
+def fail(x):
+    raise ValueError(f"bad {x}")
+
+
+def test_execute_sync_in_process():
+    deppy = Deppy()
+    executor = SyncExecutor(deppy, max_process_workers=2)
+    deppy.executor = executor
+
+    items = deppy.add_const(value=[1, 2, 3], name="items")
+    square_node = deppy.add_node(func=square, to_process=True)
+    deppy.add_edge(items, square_node, input_name="x", loop=True)
+
+    try:
+        root_scope = executor.execute_sync()
+        pool = executor.process_pool
+        assert sorted(value for value, _ in root_scope.query(square_node)) == [1, 4, 9]
+        assert all(pid != os.getpid() for _, pid in root_scope.query(square_node))
+
+        executor.dataflow = True
+        root_scope = executor.execute_sync()
+        assert executor.process_pool is pool
+        assert sorted(value for value, _ in root_scope.query(square_node)) == [1, 4, 9]
+    finally:
+        executor.shutdown()
+    assert executor.process_pool is None
+
+
+def test_process_node_errors():
+    deppy = Deppy()
+    executor = SyncExecutor(deppy, max_process_workers=1)
+
+    items = deppy.add_const(value=[1], name="items")
+    lambda_node = deppy.add_node(func=lambda x: x, name="identity", to_process=True)
+    deppy.add_edge(items, lambda_node, input_name="x", loop=True)
+
+    with pytest.raises(ValueError, match="'identity' runs in a process"):
+        executor.execute_sync()
+    assert executor.process_pool is None
+
+    fail_node = deppy.add_node(func=fail, to_process=True)
+    deppy.add_edge(items, fail_node, input_name="x", loop=True)
+    try:
+        with pytest.raises(NodeFunctionError) as error:
+            executor.execute_sync(fail_node)
+        assert error.value.node is fail_node
+        assert str(error.value.__cause__) == "bad 1"
+    finally:
+        executor.shutdown()
+
+
+async def test_execute_hybrid_in_process():
+    deppy = Deppy()
+    executor = HybridExecutor(deppy, max_process_workers=2)
+
+    async def items():
+        await asyncio.sleep(0)
+        return [2, 3]
+
+    items_node = deppy.add_node(func=items)
+    square_node = deppy.add_node(func=square, to_process=True)
+    deppy.add_edge(items_node, square_node, input_name="x", loop=True)
+
+    try:
+        for streaming in (False, True):
+            executor.streaming = streaming
+            root_scope = await executor.execute_hybrid()
+            assert [value for value, _ in root_scope.query(square_node)] == [4, 9]
+    finally:
+        executor.shutdown()
+
+
+def test_process_node_uses_cache():
+    cache = MemoryCache()
+    deppy = Deppy()
+    items = deppy.add_const([2, 3], name="items")
+    square_node = deppy.add_node(square, to_process=True, cache=cache)
+    deppy.add_edge(items, square_node, "x", loop=True)
+    executor = SyncExecutor(deppy, max_process_workers=1)
+    try:
+        executor.execute_sync()
+        result = executor.execute_sync()
+    finally:
+        executor.shutdown()
+
+    assert sorted(value for value, _ in result.query(square_node)) == [4, 9]
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+def download(x):
+    return bytes([x]) * 4096
+
+
+def decode(image):
+    return type(image).__name__, len(image), image[0], os.getpid()
+
+
+def test_process_nodes_share_buffers():
+    deppy = Deppy()
+    executor = SyncExecutor(deppy, max_process_workers=1, shared_memory_threshold=1024)
+    deppy.executor = executor
+    items = deppy.add_const([1, 2], name="items")
+    download_node = deppy.add_node(download, to_process=True)
+    decode_node = deppy.add_node(decode, to_process=True)
+    small_node = deppy.add_node(decode, name="small", to_process=True)
+    deppy.add_edge(items, download_node, "x", loop=True)
+    deppy.add_edge(download_node, decode_node, "image")
+    deppy.add_edge(items, small_node, "image")
+
+    try:
+        root = executor.execute_sync()
+        images = root.query(download_node)
+        assert all(isinstance(image, memoryview) for image in images)
+        assert all(image.readonly for image in images)
+        assert sorted(bytes(image[:1]) for image in images) == [b"\x01", b"\x02"]
+        assert sorted(value[:3] for value in root.query(decode_node)) == [
+            ("memoryview", 4096, 1),
+            ("memoryview", 4096, 2),
+        ]
+        assert root.query(small_node)[0][:2] == ("list", 2)
+        assert len(executor.shared_buffers) == 2
+
+        del root, images
+        executor.execute_sync()
+        gc.collect()
+        executor.shared_buffers.release()
+        assert len(executor.shared_buffers) == 2
+        root = executor.root
+    finally:
+        executor.shutdown()
+    assert len(executor.shared_buffers) == 0
+    assert bytes(root.query(download_node)[0][:1]) in (b"\x01", b"\x02")
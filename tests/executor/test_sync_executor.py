@@ -1,5 +1,11 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
 from deppy.deppy import Deppy
 from deppy.executor import SyncExecutor
+from deppy.executor.sync_executor import default_thread_pool
 
 
 def test_execute_sync():
@@ -40,3 +46,152 @@ def test_execute_sync_threaded():
     assert root_scope[node3] == 11  # (5 * 2) + 1
 
     executor.shutdown()
+
+
+def test_execute_sync_dataflow():
+    deppy = Deppy()
+    executor = SyncExecutor(deppy, dataflow=True)
+    finished = []
+
+    def slow():
+        time.sleep(0.2)
+        finished.append("slow")
+        return 1
+
+    def fast():
+        finished.append("fast")
+        return 2
+
+    def after_fast(x):
+        finished.append("after_fast")
+        return x + 1
+
+    slow_node = deppy.add_node(func=slow, to_thread=True)
+    fast_node = deppy.add_node(func=fast, to_thread=True)
+    after_fast_node = deppy.add_node(func=after_fast)
+    join_node = deppy.add_node(func=lambda a, b: a + b, name="join")
+
+    deppy.add_edge(fast_node, after_fast_node, input_name="x")
+    deppy.add_edge(slow_node, join_node, input_name="a")
+    deppy.add_edge(after_fast_node, join_node, input_name="b")
+
+    root_scope = executor.execute_sync()
+
+    assert root_scope[join_node] == 4
+    assert finished == ["fast", "after_fast", "slow"]
+
+    executor.shutdown()
+
+
+def test_execute_sync_dataflow_loop_threaded():
+    deppy = Deppy()
+    executor = SyncExecutor(deppy, dataflow=True)
+
+    items = deppy.add_const(value=[1, 2, 3], name="items")
+    double = deppy.add_node(func=lambda x: x * 2, name="double", to_thread=True)
+    increment = deppy.add_node(func=lambda x: x + 1, name="increment")
+
+    deppy.add_edge(items, double, input_name="x", loop=True)
+    deppy.add_edge(double, increment, input_name="x")
+
+    root_scope = executor.execute_sync()
+
+    assert sorted(root_scope.query(increment)) == [3, 5, 7]
+
+    executor.shutdown()
+
+
+def test_execute_sync_threaded_bounded_in_flight():
+    import threading
+
+    deppy = Deppy()
+    executor = SyncExecutor(deppy, max_thread_workers=8, max_in_flight=2)
+    lock = threading.Lock()
+    running = [0]
+    peak = [0]
+
+    def work(x):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.01)
+        with lock:
+            running[0] -= 1
+        return x
+
+    items = deppy.add_const(value=list(range(10)), name="items")
+    worker = deppy.add_node(func=work, name="work", to_thread=True)
+    deppy.add_edge(items, worker, input_name="x", loop=True)
+
+    for dataflow in (False, True):
+        executor.dataflow = dataflow
+        root_scope = executor.execute_sync()
+        assert sorted(root_scope.query(worker)) == list(range(10))
+    assert peak[0] == 2
+
+
+def test_execute_sync_every_node_in_pool(monkeypatch):
+    import sys
+    import threading
+
+    from deppy.executor.executor import Executor
+    from deppy.executor.sync_executor import gil_disabled
+
+    monkeypatch.setattr(sys, "_is_gil_enabled", lambda: False, raising=False)
+    assert gil_disabled()
+    assert SyncExecutor(Deppy()).sync_to_thread
+    monkeypatch.undo()
+
+    deppy = Deppy()
+    executor = SyncExecutor(deppy, sync_to_thread=True)
+    call_threads = set()
+    save_threads = set()
+    save_result = Executor.save_result
+
+    def recording_save_result(*args):
+        save_threads.add(threading.current_thread())
+        return save_result(*args)
+
+    monkeypatch.setattr(Executor, "save_result", staticmethod(recording_save_result))
+
+    def double(x):
+        call_threads.add(threading.current_thread())
+        return x * 2
+
+    items = deppy.add_const(value=list(range(20)), name="items")
+    double_node = deppy.add_node(func=double)
+    total_node = deppy.add_node(func=lambda values: sum(values), name="total")
+    deppy.add_edge(items, double_node, input_name="x", loop=True)
+    deppy.add_edge(items, total_node, input_name="values")
+
+    for dataflow in (False, True):
+        executor.dataflow = dataflow
+        root_scope = executor.execute_sync()
+        assert sorted(root_scope.query(double_node)) == [x * 2 for x in range(20)]
+        assert root_scope[total_node] == 190
+
+    assert threading.main_thread() not in call_threads
+    assert save_threads == {threading.main_thread()}
+
+
+def test_thread_pool_lifecycle():
+    shared = SyncExecutor(Deppy())
+    assert shared.thread_pool is default_thread_pool()
+    assert shared.thread_pool is SyncExecutor(Deppy()).thread_pool
+    shared.shutdown()
+    assert default_thread_pool().submit(lambda: 1).result() == 1
+
+    pool = ThreadPoolExecutor(max_workers=2)
+    injected = SyncExecutor(Deppy(), thread_pool=pool)
+    assert injected.thread_pool is pool
+    injected.shutdown()
+    assert pool.submit(lambda: 1).result() == 1
+    pool.shutdown()
+
+    owned = SyncExecutor(Deppy(), max_thread_workers=2)
+    first_pool = owned.thread_pool
+    owned.shutdown()
+    with pytest.raises(RuntimeError):
+        first_pool.submit(lambda: 1)
+    assert owned.thread_pool is not first_pool
+    owned.shutdown()
@@ -0,0 +1,171 @@
+import asyncio
+import json
+import time
+
+from deppy import Deppy
+from deppy.executor import AsyncExecutor, HybridExecutor, SyncExecutor, Tracer
+from deppy.executor.tracer import percentile
+
+
+def build(deppy):
+    items = deppy.add_const([1, 2, 3], name="items")
+    slow = deppy.add_node(
+        lambda x: time.sleep(0.02 * x) or x, name="slow", to_thread=True
+    )
+    fast = deppy.add_node(lambda items: len(items), name="fast", to_thread=True)
+    after = deppy.add_node(lambda count: count + 1, name="after")
+    deppy.add_edge(items, slow, "x", loop=True)
+    deppy.add_edge(items, fast, "items")
+    deppy.add_edge(fast, after, "count")
+    return items, slow, fast, after
+
+
+def test_percentile():
+    assert percentile([1.0], 99) == 1.0
+    assert percentile([1.0, 2.0, 3.0, 4.0, 5.0], 50) == 3.0
+    assert percentile([0.0, 10.0], 95) == 9.5
+
+
+def test_tracer_sync():
+    tracer = Tracer()
+    deppy = Deppy()
+    deppy.executor = SyncExecutor(deppy, tracer=tracer)
+    items, slow, fast, after = build(deppy)
+
+    deppy.execute()
+    assert len(tracer) == 6
+    stats = tracer.stats()
+    assert stats[slow].calls == 3
+    assert stats[slow].p50 >= 0.035
+    assert stats[slow].p99 >= stats[slow].p95 >= stats[slow].p50
+    assert stats[fast].calls == 1
+    assert sorted(span.path for span in tracer.spans if span.node is slow) == ["$"] * 3
+    assert [span.args for span in tracer.spans if span.node is not items] == [1] * 5
+    assert not any(span.on_loop for span in tracer.spans)
+    assert all(
+        span.thread.startswith("deppy") for span in tracer.spans if span.node is slow
+    )
+    assert [node for node, _ in tracer.critical_path()][-1] is after
+    stalls = dict(tracer.stalls())
+    assert stalls[after] >= 0.03
+    assert "barrier stalls:" in tracer.report()
+
+    deppy.executor.dataflow = True
+    deppy.execute()
+    assert len(tracer) == 6
+    assert dict(tracer.stalls()).get(after, 0.0) < 0.03
+
+
+async def test_tracer_async_limits():
+    async def values():
+        return [1, 2]
+
+    async def fetch(x):
+        await asyncio.sleep(0.02)
+        return x
+
+    tracer = Tracer()
+    deppy = Deppy()
+    deppy.executor = AsyncExecutor(deppy, tracer=tracer)
+    values_node = deppy.add_node(values)
+    fetch_node = deppy.add_node(fetch, max_concurrency=1)
+    deppy.add_edge(values_node, fetch_node, "x", loop=True)
+
+    await deppy.execute()
+    spans = [span for span in tracer.spans if span.node is fetch_node]
+    assert len(spans) == 2
+    assert all(span.on_loop and span.duration >= 0.015 for span in spans)
+    assert max(span.wait for span in spans) >= 0.015
+    assert tracer.stats()[fetch_node].wait >= 0.015
+    assert [node for node, _ in tracer.critical_path()] == [values_node, fetch_node]
+
+
+async def test_tracer_hybrid_threads():
+    async def fetch():
+        await asyncio.sleep(0)
+        return [1, 2]
+
+    tracer = Tracer()
+    deppy = Deppy()
+    deppy.executor = HybridExecutor(deppy, tracer=tracer)
+    fetch_node = deppy.add_node(fetch)
+    double = deppy.add_node(lambda x: x * 2, name="double", to_thread=True)
+    deppy.add_edge(fetch_node, double, "x", loop=True)
+
+    for streaming in (False, True):
+        deppy.executor.streaming = streaming
+        await deppy.execute()
+        spans = [span for span in tracer.spans if span.node is double]
+        assert len(spans) == 2
+        assert all(span.thread.startswith("deppy") for span in spans)
+        assert all(span.end >= span.start >= span.queued for span in spans)
+
+
+def test_export_masks_secrets(tmp_path):
+    tracer = Tracer(record_args=True)
+    deppy = Deppy()
+    deppy.executor = SyncExecutor(deppy, tracer=tracer)
+    token = deppy.add_secret("hunter2", name="token")
+    user = deppy.add_const("alice", name="user")
+    login = deppy.add_node(lambda token, user: f"{user}:{token}", name="login")
+    deppy.add_edge(token, login, "token")
+    deppy.add_edge(user, login, "user")
+    deppy.execute()
+
+    trace = tracer.chrome_trace()
+    calls = [event for event in trace["traceEvents"] if event.get("ph") == "X"]
+    login_event = next(event for event in calls if event["name"] == "login")
+    assert login_event["args"]["deppy.arg.token"] == "***"
+    assert login_event["args"]["deppy.arg.user"] == "'alice'"
+    assert login_event["args"]["deppy.scope"] == "$"
+    assert "hunter2" not in json.dumps(trace)
+    assert "hunter2" in json.dumps(tracer.chrome_trace(mask_secrets=False))
+    assert {
+        event["args"]["name"]
+        for event in trace["traceEvents"]
+        if event["name"] == "thread_name"
+    } == {"MainThread"}
+
+    tracer.dump_chrome_trace(str(tmp_path / "trace.json"))
+    assert json.loads((tmp_path / "trace.json").read_text()) == trace
+
+    path = tmp_path / "spans.jsonl"
+    tracer.dump_otel_spans(str(path))
+    tracer.dump_otel_spans(str(path))
+    lines = path.read_text().splitlines()
+    assert len(lines) == 2 and "hunter2" not in lines[0]
+    spans = json.loads(lines[0])["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    root, *calls = spans
+    assert root["name"] == "deppy.execute"
+    assert sorted(span["name"] for span in calls) == ["login", "token", "user"]
+    assert all(span["parentSpanId"] == root["spanId"] for span in calls)
+    assert all(
+        int(span["startTimeUnixNano"]) <= int(span["endTimeUnixNano"]) for span in spans
+    )
+
+
+async def test_chrome_trace_async_overlap():
+    async def values():
+        return [1, 2, 3]
+
+    async def fetch(x):
+        await asyncio.sleep(0.01)
+        return x
+
+    tracer = Tracer()
+    deppy = Deppy()
+    deppy.executor = AsyncExecutor(deppy, tracer=tracer)
+    values_node = deppy.add_node(values)
+    fetch_node = deppy.add_node(fetch)
+    deppy.add_edge(values_node, fetch_node, "x", loop=True)
+    await deppy.execute()
+
+    events = [
+        event
+        for event in tracer.chrome_trace()["traceEvents"]
+        if event["name"] == "fetch" and event.get("cat") == "async"
+    ]
+    begins = sorted(event["ts"] for event in events if event["ph"] == "b")
+    ends = sorted(event["ts"] for event in events if event["ph"] == "e")
+    assert len(begins) == len(ends) == 3
+    assert begins[-1] < ends[0]
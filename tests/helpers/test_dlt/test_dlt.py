@@ -1,6 +1,6 @@
 import dlt
 from deppy.blueprint import Blueprint, Node, Const, Secret, Output, Object
-from deppy.helpers.DLT import blueprint_to_source
+from deppy.helpers.DLT import blueprint_to_source, _create_stream_func
 from duckdb import CatalogException
 import pytest
 
@@ -527,3 +527,107 @@ def test_resource_kwargs():
 
     tables = pipeline.default_schema.data_tables()
     assert "primary_key" not in tables[0]["columns"]["id"]
+
+
+@pytest.mark.parametrize("is_async", [False, True])
+def test_streaming(monkeypatch, is_async):
+    def add(a, b):
+        return a + b
+
+    async def add_async(a, b):
+        return a + b
+
+    class Obj:
+        def __init__(self, amount: int):
+            self.list = list(range(amount))
+
+        def get_list(self):
+            return self.list
+
+    class MyTest(Blueprint):
+        obj = Object(Obj)
+
+        my_const: int = Const()
+        my_secret: int = Secret()
+
+        add_node1 = Node(add)
+        add_node2 = Node(add_async if is_async else add)
+        items = Node(obj.get_list)
+        item = Output(items, loop=True)
+
+        edges = [
+            (my_const, add_node1, "a"),
+            (my_secret, add_node1, "b"),
+            (add_node1, add_node2, "a"),
+            (item, add_node2, "b"),
+        ]
+
+    monkeypatch.setenv("TESTPIPELINE__SOURCES__MYTEST__OBJ__AMOUNT", "5")
+    monkeypatch.setenv("TESTPIPELINE__SOURCES__MYTEST__MY_CONST", "3")
+    monkeypatch.setenv("TESTPIPELINE__SOURCES__MYTEST__MY_SECRET", "4")
+
+    source = blueprint_to_source(MyTest, streaming=True, batch_size=2)
+
+    pipeline = dlt.pipeline(
+        pipeline_name="testpipeline", destination="duckdb", full_refresh=True
+    )
+    pipeline.run(source())
+
+    with pipeline.sql_client() as sql_client:
+        with sql_client.execute("SELECT value FROM add_node2") as cursor:
+            assert sorted(row[0] for row in cursor.fetchall()) == [7, 8, 9, 10, 11]
+    with pipeline.sql_client() as sql_client:
+        with sql_client.execute("SELECT value FROM item") as cursor:
+            assert sorted(row[0] for row in cursor.fetchall()) == [0, 1, 2, 3, 4]
+    with pipeline.sql_client() as sql_client:
+        with pytest.raises(CatalogException):
+            sql_client.execute("SELECT * FROM my_secret")
+
+
+def test_async_context_with_sync_function_leaves_loop_free():
+    import asyncio
+    import time
+
+    def slow(x):
+        time.sleep(0.05)
+        return x
+
+    class Obj:
+        def get_list(self):
+            return list(range(4))
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, exc_type, exc_value, traceback): ...
+
+    class MyTest(Blueprint):
+        obj = Object(Obj)
+
+        items = Node(obj.get_list)
+        item = Output(items, loop=True)
+        slow_node = Node(slow)
+
+        edges = [(item, slow_node, "x")]
+
+    deppy = MyTest()
+    extract = _create_stream_func(deppy, [], [deppy.slow_node], batch_size=10)
+
+    async def run():
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        batches = [batch async for batch in extract()]
+        ticker.cancel()
+        return batches, ticks
+
+    batches, ticks = asyncio.run(run())
+
+    assert [sorted(batch.values) for batch in batches] == [[0, 1, 2, 3]]
+    assert ticks >= 10
@@ -215,3 +215,33 @@ def test_blueprint_invalid_input():
         match="Invalid input 1 for node 'add_node'. Must be Input or BlueprintObject",
     ):
         BP(a=1, b=2)
+
+
+def test_blueprint_node_limits():
+    def add(a, b):
+        return a + b
+
+    class BP(Blueprint):
+        a = Const()
+        b = Const()
+        add_node = Node(add, inputs=[a, b], max_concurrency=1, rate_limit=10)
+
+    bp = BP(a=1, b=2)
+    assert bp.add_node.max_concurrency == 1
+    assert bp.add_node.rate_limit.rate == 10
+    assert bp.execute().query(bp.add_node) == [3]
+
+
+def test_blueprint_sync_to_thread():
+    import threading
+
+    def current_thread():
+        return threading.get_ident()
+
+    class BP(Blueprint):
+        sync_to_thread = True
+        thread_node = Node(current_thread)
+
+    bp = BP()
+    assert bp.executor.sync_to_thread
+    assert bp.execute().query(bp.thread_node) != [threading.get_ident()]
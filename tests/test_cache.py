@@ -0,0 +1,232 @@
+import threading
+
+import pytest
+
+from deppy import Deppy, MemoryCache, SQLiteCache
+from deppy.blueprint import Blueprint, Object, Const, Node as BlueprintNode
+from deppy.cache import cache_key, stable_hash
+from deppy.executor import AsyncExecutor, SyncExecutor
+from deppy.node import Node
+
+shared_cache = MemoryCache()
+
+
+def test_stable_hash():
+    assert stable_hash({"a": 1, "b": {2, 3}}) == stable_hash({"b": {3, 2}, "a": 1})
+    assert stable_hash([1, 2]) != stable_hash((1, 2))
+    assert stable_hash(1) != stable_hash("1")
+
+
+def test_stable_hash_hook():
+    class Tags:
+        def __init__(self, *tags):
+            self.tags = set(tags)
+            self.lock = threading.Lock()
+
+        def __deppy_hash__(self):
+            return self.tags
+
+    assert stable_hash(Tags("a", "b")) == stable_hash(Tags("b", "a"))
+    assert stable_hash(Tags("a")) != stable_hash({"a"})
+    assert stable_hash(Tags("a")) != stable_hash(Tags("b"))
+
+
+def test_cache_key_unhashable_argument():
+    deppy = Deppy()
+    node = deppy.add_node(lambda x: x, name="identity", cache=MemoryCache())
+
+    assert cache_key(node, (), {"x": 1}) != cache_key(node, (), {"x": 2})
+    with pytest.raises(ValueError, match="identity"):
+        cache_key(node, (), {"x": lambda: None})
+
+
+def test_memory_cache_lru_and_ttl(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr("deppy.cache.time.monotonic", lambda: now[0])
+
+    cache = MemoryCache(max_size=2, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == (True, 1)
+    cache.set("c", 3)
+
+    assert cache.get("b") == (False, None)
+    assert cache.get("c") == (True, 3)
+    now[0] = 10
+    assert cache.get("a") == (False, None)
+    assert len(cache) == 1
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+def test_sqlite_cache(tmp_path):
+    path = str(tmp_path / "results.db")
+    cache = SQLiteCache(path, max_size=2)
+    cache.set("a", {"rows": [1, 2]})
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    cache.close()
+
+    reopened = SQLiteCache(path)
+    assert reopened.get("a") == (True, {"rows": [1, 2]})
+    assert reopened.get("b") == (False, None)
+    assert len(reopened) == 2
+    reopened.clear()
+    assert len(reopened) == 0
+    reopened.close()
+
+
+def test_sync_executor_uses_cache():
+    calls = []
+
+    def fetch(x):
+        calls.append(x)
+        return x * 10
+
+    cache = MemoryCache()
+    deppy = Deppy()
+    items = deppy.add_const([1, 2, 1], name="items")
+    fetch_node = deppy.add_node(fetch, cache=cache)
+    deppy.add_edge(items, fetch_node, "x", loop=True)
+    executor = SyncExecutor(deppy)
+
+    executor.execute_sync()
+    result = executor.execute_sync()
+
+    assert result.query(fetch_node) == [10, 20, 10]
+    assert sorted(calls) == [1, 2]
+    assert (cache.hits, cache.misses) == (4, 2)
+
+
+async def test_async_executor_uses_cache():
+    calls = []
+
+    async def items():
+        return [1, 2]
+
+    async def fetch(x):
+        calls.append(x)
+        return x * 10
+
+    cache = MemoryCache()
+    deppy = Deppy()
+    items_node = deppy.add_node(items)
+    fetch_node = deppy.add_node(fetch, cache=cache)
+    deppy.add_edge(items_node, fetch_node, "x", loop=True)
+    executor = AsyncExecutor(deppy)
+
+    await executor.execute_async()
+    result = await executor.execute_async()
+
+    assert result.query(fetch_node) == [10, 20]
+    assert calls == [1, 2]
+    assert cache.hits == 2
+
+
+def make_fetch(offset):
+    def fetch(x):
+        return x + offset
+
+    return fetch
+
+
+class Client:
+    def __init__(self, offset):
+        self.offset = offset
+        self.lock = threading.Lock()
+
+    def fetch(self, x):
+        return x + self.offset
+
+
+class ClientBlueprint(Blueprint):
+    client = Object(Client)
+    value = Const()
+    fetch = BlueprintNode(client.fetch, cache=shared_cache)
+
+    edges = [(value, fetch, "x")]
+
+
+def test_cache_keys_distinguish_bound_state():
+    cache = MemoryCache()
+    deppy = Deppy()
+    value = deppy.add_const(1, name="value")
+    small = deppy.add_node(make_fetch(10), cache=cache)
+    large = deppy.add_node(make_fetch(1000), cache=cache)
+    deppy.add_edge(value, small, "x")
+    deppy.add_edge(value, large, "x")
+
+    result = deppy.execute()
+    assert (result[small], result[large]) == (11, 1001)
+
+    first = ClientBlueprint(client={"offset": 10}, value=1)
+    second = ClientBlueprint(client={"offset": 1000}, value=1)
+    assert first.execute()[first.fetch] == 11
+    assert second.execute()[second.fetch] == 1001
+
+    # Keys of closures over hashable values are stable, explicit namespaces are shared
+    assert cache_key(small, (), {"x": 1}) == cache_key(
+        Node(make_fetch(10), name=small.name), (), {"x": 1}
+    )
+    shared = [Node(make_fetch(n), name="f", cache_namespace="f") for n in (1, 2)]
+    assert cache_key(shared[0], (), {"x": 1}) == cache_key(shared[1], (), {"x": 1})
+
+
+class Scaler:
+    def __init__(self, factor):
+        self.factor = factor
+
+    def scale(self, x):
+        return x * self.factor
+
+
+def test_cache_keys_follow_bound_state_changes():
+    scaler = Scaler(2)
+    deppy = Deppy()
+    value = deppy.add_const(3, name="value")
+    scaled = deppy.add_node(scaler.scale, cache=MemoryCache())
+    deppy.add_edge(value, scaled, "x")
+
+    assert deppy.execute()[scaled] == 6
+    scaler.factor = 10
+    assert deppy.execute()[scaled] == 30
+    assert scaled.func_identity is None
+
+
+def test_sqlite_cache_evicts_only_when_full(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "results.db"), max_size=2)
+    statements = []
+    cache.connection.set_trace_callback(statements.append)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("a", 3)
+    assert not any(statement.startswith("DELETE") for statement in statements)
+
+    cache.set("c", 4)
+    assert sum(statement.startswith("DELETE") for statement in statements) == 1
+    assert len(cache) == 2
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 3)
+    cache.close()
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+def test_cache_evicts_beyond_max_bytes(tmp_path, backend):
+    if backend == "memory":
+        cache = MemoryCache(max_bytes=1000)
+    else:
+        cache = SQLiteCache(str(tmp_path / "results.db"), max_bytes=1000)
+
+    cache.set("a", b"a" * 400)
+    cache.set("b", b"b" * 400)
+    assert cache.get("a")[0]
+    cache.set("c", b"c" * 400)
+    assert len(cache) == 2
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, b"a" * 400)
+
+    cache.set("d", b"d" * 2000)
+    assert cache.get("d") == (False, None)
+    assert len(cache) == 2
+    assert 800 <= cache.nbytes <= 1000
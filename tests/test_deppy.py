@@ -1,5 +1,9 @@
 from deppy import Deppy
+from deppy.node import NodeFunctionError
 import asyncio
+import time
+
+import pytest
 
 
 def test_get_node_by_name():
@@ -13,6 +17,19 @@ def test_get_node_by_name():
     assert deppy.get_node_by_name("func_2") is None
 
 
+def test_sync_to_thread():
+    import threading
+
+    def current_thread():
+        return threading.get_ident()
+
+    deppy = Deppy(sync_to_thread=True)
+    thread_node = deppy.add_node(func=current_thread)
+
+    assert deppy.execute().query(thread_node) != [threading.get_ident()]
+    assert not Deppy(sync_to_thread=False).executor.sync_to_thread
+
+
 def test_execute_is_async():
     deppy = Deppy()
 
@@ -51,3 +68,180 @@ def test_execute():
     exec_func = deppy.execute
     assert asyncio.iscoroutinefunction(exec_func)
     assert exec_func.__name__ == "execute_hybrid"
+
+
+def test_close():
+    from deppy.executor import HybridExecutor
+
+    deppy = Deppy()
+    deppy.executor = HybridExecutor(deppy, max_thread_workers=2)
+    node = deppy.add_node(lambda: 1, name="one", to_thread=True)
+
+    with deppy as entered:
+        assert entered is deppy
+        assert deppy.execute()[node] == 1
+        pool = deppy.executor.thread_pool
+
+    assert not deppy.executor.owns_thread_pool
+    assert pool._shutdown
+    assert deppy.execute()[node] == 1
+    deppy.close()
+
+
+def test_execute_incremental():
+    calls = []
+
+    def square(x):
+        calls.append("square")
+        return x * x
+
+    def add(x, y):
+        calls.append("add")
+        return x + y
+
+    deppy = Deppy()
+    items = deppy.add_const([1, 2, 3], name="items")
+    offset = deppy.add_const(10, name="offset")
+    square_node = deppy.add_node(square)
+    add_node = deppy.add_node(add)
+    deppy.add_edge(items, square_node, "x", loop=True)
+    deppy.add_edge(square_node, add_node, "x")
+    deppy.add_edge(offset, add_node, "y")
+
+    assert sorted(deppy.execute_incremental().query(add_node)) == [11, 14, 19]
+    assert calls.count("square") == 3
+
+    calls.clear()
+    deppy.set_value(offset, 20)
+    result = deppy.execute_incremental()
+    assert sorted(result.query(add_node)) == [21, 24, 29]
+    assert sorted(result.query(square_node)) == [1, 4, 9]
+    assert calls == ["add"] * 3
+
+    calls.clear()
+    result = deppy.execute_incremental(changed=[square_node])
+    assert sorted(result.query(add_node)) == [21, 24, 29]
+    assert calls.count("square") == 3
+
+    calls.clear()
+    deppy.execute_incremental(add_node)
+    assert calls.count("square") == 3
+
+
+def test_execute_incremental_interleaved_targets():
+    calls = []
+
+    def fetch(x):
+        calls.append("fetch")
+        return x
+
+    def report(x):
+        calls.append("report")
+        return x
+
+    deppy = Deppy()
+    source = deppy.add_const(1, name="source")
+    fetch_node = deppy.add_node(fetch)
+    report_node = deppy.add_node(report)
+    deppy.add_edge(source, fetch_node, "x")
+    deppy.add_edge(source, report_node, "x")
+
+    deppy.execute_incremental(fetch_node)
+    deppy.execute_incremental(report_node)
+    deppy.execute(report_node)
+    calls.clear()
+
+    assert deppy.execute_incremental(fetch_node)[fetch_node] == 1
+    assert deppy.execute_incremental(report_node)[report_node] == 1
+    assert calls == []
+
+
+async def test_execute_incremental_streaming():
+    from deppy.executor import HybridExecutor
+
+    calls = []
+
+    async def fetch(x):
+        calls.append("fetch")
+        return [x, x + 1]
+
+    def scale(value, factor):
+        calls.append("scale")
+        return value * factor
+
+    deppy = Deppy()
+    deppy.executor = HybridExecutor(deppy, streaming=True)
+    start = deppy.add_const(1, name="start")
+    factor = deppy.add_const(2, name="factor")
+    fetch_node = deppy.add_node(fetch)
+    scale_node = deppy.add_node(scale)
+    deppy.add_edge(start, fetch_node, "x")
+    deppy.add_edge(fetch_node, scale_node, "value", loop=True)
+    deppy.add_edge(factor, scale_node, "factor")
+
+    await deppy.execute_incremental()
+    calls.clear()
+    deppy.set_value(factor, 3)
+    result = await deppy.execute_incremental()
+
+    assert sorted(result.query(scale_node)) == [3, 6]
+    assert calls == ["scale", "scale"]
+
+
+def test_stream():
+    deppy = Deppy()
+    items = deppy.add_const([1, 2, 3], name="items")
+    double = deppy.add_node(lambda x: x * 2, name="double")
+    deppy.add_edge(items, double, "x", loop=True)
+
+    results = list(deppy.stream(double))
+
+    assert sorted(value for _, _, value in results) == [2, 4, 6]
+    assert all(
+        node is double and scope[double] == value for node, scope, value in results
+    )
+    assert len(list(deppy.stream())) == 4
+
+
+def test_stream_close_stops_execution():
+    calls = []
+
+    def slow(x):
+        calls.append(x)
+        time.sleep(0.01)
+        return x
+
+    deppy = Deppy()
+    items = deppy.add_const(list(range(100)), name="items")
+    slow_node = deppy.add_node(slow, to_thread=True)
+    deppy.add_edge(items, slow_node, "x", loop=True)
+    deppy.executor.max_in_flight = 2
+
+    stream = deppy.stream(slow_node)
+    next(stream)
+    stream.close()
+
+    assert len(calls) < 100
+    assert deppy.executor.result_listener is None
+
+
+async def test_stream_async():
+    async def fetch(x):
+        await asyncio.sleep(0.2 if x == "slow" else 0)
+        return x
+
+    def fail():
+        raise ValueError("boom")
+
+    deppy = Deppy()
+    items = deppy.add_const(["slow", "fast"], name="items")
+    fetch_node = deppy.add_node(fetch)
+    deppy.add_edge(items, fetch_node, "x", loop=True)
+
+    values = [value async for _, _, value in deppy.stream(fetch_node)]
+    assert values == ["fast", "slow"]
+
+    deppy.add_node(fail)
+    with pytest.raises(NodeFunctionError):
+        async for _ in deppy.stream():
+            pass
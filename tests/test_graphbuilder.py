@@ -35,6 +35,22 @@ def test_add_secret():
     assert builder.secrets_count == 2
 
 
+def test_set_value():
+    builder = GraphBuilder()
+    const_node = builder.add_const(value=1, name="const")
+    double_node = builder.add_node(func=lambda x: x * 2, name="double")
+    builder.add_edge(const_node, double_node, input_name="x")
+
+    builder.set_value(const_node, 2)
+    assert const_node.func() == 2
+
+    with pytest.raises(ValueError, match="double"):
+        builder.set_value(double_node, 3)
+    assert double_node.func(2) == 4
+    with pytest.raises(ValueError):
+        builder.set_value(GraphBuilder().add_const(1), 3)
+
+
 def test_add_edge():
     builder = GraphBuilder()
 
@@ -96,3 +112,70 @@ def test_check_circular_dependency():
     # Adding an edge back to create a cycle
     with pytest.raises(ValueError, match="Circular dependency detected in the graph!"):
         builder.add_edge(node2, node1, input_name="reverse")
+
+
+def test_circular_dependency_leaves_graph_unchanged():
+    builder = GraphBuilder()
+    node1 = builder.add_node(func=lambda: 1, name="node1")
+    node2 = builder.add_node(func=lambda x: x, name="node2")
+    node3 = builder.add_node(func=lambda x: x, name="node3")
+    builder.add_edge(node1, node2, input_name="x")
+    builder.add_edge(node2, node3, input_name="x")
+
+    with pytest.raises(ValueError, match="Circular dependency detected in the graph!"):
+        builder.add_edge(node3, node1, input_name="x", loop=True)
+    with pytest.raises(ValueError, match="Circular dependency detected in the graph!"):
+        builder.add_edge(node2, node2, input_name="y")
+
+    assert not builder.graph.has_edge(node3, node1)
+    assert not builder.graph.has_edge(node2, node2)
+    assert node1.loop_vars == []
+
+
+def test_add_edges():
+    builder = GraphBuilder()
+    node1 = builder.add_node(func=lambda: 1, name="node1")
+    node2 = builder.add_node(func=lambda: [1, 2], name="node2")
+    node3 = builder.add_node(func=lambda x, y: x + y, name="node3")
+
+    builder.add_edges([(node1, node3, "x"), (node2, node3, "y", True)])
+
+    assert builder.graph.has_edge(node1, node3, key="x")
+    assert builder.graph.has_edge(node2, node3, key="y")
+    assert node3.loop_vars == [("y", node2)]
+
+    with pytest.raises(ValueError, match="Circular dependency detected in the graph!"):
+        builder.add_edges([(node3, node1, "x")])
+
+
+def test_deferred_check():
+    builder = GraphBuilder()
+    node1 = builder.add_node(func=lambda: 1, name="node1")
+    node2 = builder.add_node(func=lambda x: x, name="node2")
+
+    with builder.deferred_check():
+        with builder.deferred_check():
+            builder.add_edge(node1, node2, input_name="x")
+            builder.add_edge(node2, node1, input_name="x")
+        # validation only happens when the outermost context exits
+        builder.graph.remove_edge(node2, node1, key="x")
+
+    with pytest.raises(ValueError, match="Circular dependency detected in the graph!"):
+        with builder.deferred_check():
+            builder.add_edge(node2, node1, input_name="x")
+
+
+def test_deferred_check_removes_edges_on_cycle():
+    builder = GraphBuilder()
+    node1 = builder.add_node(func=lambda: [1], name="node1")
+    node2 = builder.add_node(func=lambda x: x, name="node2")
+    node3 = builder.add_node(func=lambda x: x, name="node3")
+    builder.add_edge(node1, node2, input_name="x")
+
+    with pytest.raises(ValueError, match="Circular dependency detected in the graph!"):
+        builder.add_edges([(node2, node3, "x", True), (node3, node1, "x")])
+
+    assert list(builder.graph.edges) == [(node1, node2, "x")]
+    assert node3.loop_vars == []
+    builder.add_edge(node2, node3, input_name="x", loop=True)
+    assert node3.loop_vars == [("x", node2)]
@@ -1,5 +1,5 @@
 import pytest
-from deppy.node import Node, NodeFunctionError
+from deppy.node import Node, NodeFunctionError, RateLimit
 
 
 def test_is_async():
@@ -66,3 +66,21 @@ def test_str():
 
     node = Node(func=sample_func, name="TestNode")
     assert str(node) == "TestNode"
+
+
+def test_limits():
+    node = Node(func=lambda: 1, max_concurrency=2, rate_limit=5)
+    assert node.is_limited
+    assert node.max_concurrency == 2
+    assert node.rate_limit.rate == 5
+    assert node.rate_limit.burst == 5
+    assert not Node(func=lambda: 1).is_limited
+
+    rate_limit = RateLimit(30, period=60, burst=2)
+    assert rate_limit.rate == 0.5
+    assert rate_limit.burst == 2
+
+    with pytest.raises(ValueError):
+        Node(func=lambda: 1, max_concurrency=0)
+    with pytest.raises(ValueError):
+        RateLimit(0)
@@ -1,5 +1,5 @@
 import pytest
-from deppy.scope import Scope
+from deppy.scope import Scope, ResultIndex
 from deppy.ignore_result import IgnoreResult
 from deppy.node import Node
 
@@ -26,6 +26,35 @@ def test_query():
     assert any(isinstance(result, IgnoreResult) for result in results)
 
 
+def test_query_indexed():
+    scope = Scope()
+    scope.results = ResultIndex()
+    first = scope.birth()
+    second = scope.birth()
+    nested = first.birth()
+
+    # Added out of tree order
+    for target, value in [(second, 3), (nested, 2), (scope, 1)]:
+        target["key"] = value
+        scope.results.add("key", target, ignored=False)
+    first["key"] = IgnoreResult("ignored")
+    scope.results.add("key", first, ignored=True)
+    scope.results.register("empty")
+    scope.birth()["empty"] = "not indexed"
+
+    assert scope.query("key", ignored_results=False) == [1, 2, 3]
+    ignored = scope.query("key", ignored_results=True)
+    assert len(ignored) == 1 and isinstance(ignored[0], IgnoreResult)
+    assert scope.query("key")[0] == 1
+    assert isinstance(scope.query("key")[1], IgnoreResult)
+    assert scope.query("key")[2:] == [2, 3]
+    assert scope.query("empty") == []
+
+    # Keys which are not indexed are still found by walking the tree
+    second["other"] = "value"
+    assert scope.query("other") == ["value"]
+
+
 def test_getitem():
     scope = Scope()
     scope["key"] = "value"
@@ -72,3 +101,39 @@ def test_birth():
     assert child in scope.children
     assert child.parent is scope
     assert child.path == "$" + "/0"
+
+
+def test_compact_representation():
+    scope = Scope()
+    assert scope._children is None
+    assert scope.depth == 0
+    assert scope.path == "$"
+
+    sub = scope.birth()
+    sub.birth()
+    grandchild = sub.birth()
+
+    assert grandchild.index == 1
+    assert grandchild.depth == 2
+    assert grandchild.indices == (0, 1)
+    assert grandchild.path == "$/0/1"
+    assert len(sub.children) == 2
+    assert scope.children == [sub]
+    assert grandchild.children == []
+
+    with pytest.raises(AttributeError):
+        scope.some_attribute = 1
+
+
+def test_construct_with_path():
+    parent = Scope()
+    with pytest.deprecated_call():
+        child = Scope(parent, "$/2")
+    with pytest.deprecated_call():
+        root = Scope(path="run")
+
+    assert child.index == 2
+    assert child.path == "$/2"
+    assert root.birth().birth().path == "run/0/0"
+    child.children.append(Scope(child, 0))
+    assert child.birth().path == "$/2/1"
@@ -0,0 +1,107 @@
+import gc
+import os
+import threading
+import tracemalloc
+
+from deppy import Deppy, SpillStore
+from deppy.executor import HybridExecutor, SyncExecutor
+from deppy.store import SpilledResult, estimate_size
+
+
+def test_spill_store_threshold(tmp_path):
+    store = SpillStore(threshold=1024, directory=str(tmp_path))
+    small = {"rows": [1, 2, 3]}
+    large = {"rows": list(range(1000)), "blob": b"x" * 4096}
+
+    assert store.put(small) is small
+    assert store.put(7) == 7
+    assert store.file is None
+
+    spilled = store.put(large)
+    assert isinstance(spilled, SpilledResult)
+    assert spilled.load() == large
+    assert spilled.load() is not large
+    assert store.put(large).offset > spilled.offset
+    assert os.listdir(tmp_path) == [os.path.basename(store.file.path)]
+
+
+def test_spill_store_pickles_straight_to_disk(tmp_path):
+    store = SpillStore(threshold=1024, directory=str(tmp_path))
+    blob = b"x" * 8 * 1024 * 1024
+
+    tracemalloc.start()
+    try:
+        spilled = store.put({"blob": blob})
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert peak < len(blob) // 8
+    assert spilled.load() == {"blob": blob}
+
+    locks = [threading.Lock()] * 100
+    assert store.put(locks) is locks
+    assert store.put("y" * 2048).load() == "y" * 2048
+    assert spilled.load() == {"blob": blob}
+
+
+def test_estimate_size():
+    shared = list(range(100))
+    assert estimate_size([shared, shared], 10**9) < 2 * estimate_size(shared, 10**9)
+    assert estimate_size(memoryview(bytearray(4096)), 10**9) == 4096
+    assert estimate_size([b"x" * 4096] * 1000, 8192) <= 2 * 8192
+
+
+def test_spill_file_removed_when_unreferenced(tmp_path):
+    store = SpillStore(threshold=16, directory=str(tmp_path))
+    spilled = store.put("y" * 1024)
+    store.reset()
+    assert store.file is None
+    assert len(os.listdir(tmp_path)) == 1
+    assert spilled.load() == "y" * 1024
+
+    del spilled
+    gc.collect()
+    assert os.listdir(tmp_path) == []
+
+
+def test_execute_with_spill_store(tmp_path):
+    store = SpillStore(threshold=256, directory=str(tmp_path))
+    deppy = Deppy()
+    deppy.executor = SyncExecutor(deppy, result_store=store)
+    items = deppy.add_const([1, 2], name="items")
+    export = deppy.add_node(lambda x: {"id": x, "payload": "z" * 1000}, name="export")
+    size = deppy.add_node(lambda data: len(data["payload"]) + data["id"], name="size")
+    deppy.add_edge(items, export, "x", loop=True)
+    deppy.add_edge(export, size, "data")
+
+    root = deppy.execute()
+    assert sorted(root.query(size)) == [1001, 1002]
+    assert sorted(value["id"] for value in root.query(export)) == [1, 2]
+    scope = root.children[0].children[0]
+    assert isinstance(dict.__getitem__(scope, export), SpilledResult)
+    assert scope[export]["payload"] == "z" * 1000
+    assert scope.dump()["export"]["id"] == 1
+
+
+async def test_execute_async_with_spill_store(tmp_path):
+    async def export(x):
+        return bytearray(x * 1024)
+
+    async def size(data):
+        return len(data)
+
+    deppy = Deppy()
+    deppy.executor = HybridExecutor(
+        deppy, result_store=SpillStore(threshold=512, directory=str(tmp_path))
+    )
+    items = deppy.add_const([1, 2], name="items")
+    export_node = deppy.add_node(export)
+    size_node = deppy.add_node(size)
+    deppy.add_edge(items, export_node, "x", loop=True)
+    deppy.add_edge(export_node, size_node, "data")
+
+    root = await deppy.execute()
+    assert sorted(root.query(size_node)) == [1024, 2048]
+    streamed = [value async for _, _, value in deppy.stream(export_node)]
+    assert sorted(map(len, streamed)) == [1024, 2048]